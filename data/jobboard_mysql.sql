@@ -96,6 +96,39 @@ CREATE TABLE applications (
     REFERENCES users (id) ON DELETE SET NULL ON UPDATE CASCADE
 ) ENGINE=InnoDB;
 
+-- Index de recherche des offres : document pré-analysé côté API
+-- (minuscules, sans accents, racinisé en français) -> voir index_jobs() dans main.py.
+-- Conseillé dans mysqld.cnf pour garder les termes courts (js, ux, go...) :
+--   innodb_ft_min_token_size = 2
+CREATE TABLE job_search (
+  job_id INT PRIMARY KEY,
+  document MEDIUMTEXT NOT NULL,
+  FULLTEXT KEY ft_job_search_document (document),
+  CONSTRAINT fk_job_search_job_id FOREIGN KEY (job_id)
+    REFERENCES jobs (id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- Facettes des profils pour /api/candidate_filters (compteur par valeur),
+-- tenues à jour par l'API à chaque écriture sur profiles.
+CREATE TABLE profile_facets (
+  facet VARCHAR(20) NOT NULL,
+  value VARCHAR(191) NOT NULL,
+  n INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (facet, value)
+) ENGINE=InnoDB;
+
+-- Index inversé compétences / langues des profils (termes normalisés :
+-- minuscules, sans accents), pour les recherches multi-compétences exactes.
+CREATE TABLE profile_terms (
+  kind VARCHAR(10) NOT NULL,
+  term VARCHAR(100) NOT NULL,
+  profile_id INT NOT NULL,
+  PRIMARY KEY (kind, term, profile_id),
+  KEY idx_profile_terms_profile (profile_id),
+  CONSTRAINT fk_profile_terms_profile_id FOREIGN KEY (profile_id)
+    REFERENCES profiles (id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
 -- =========================================================
 -- DONNEES DE TEST ETENDUES (images aléatoires)
 -- =========================================================
@@ -309,6 +342,11 @@ VALUES
 -- UPDATE profiles  SET avatar_url = 'https://via.placeholder.com/300.png?text=Avatar' WHERE user_id IN (1,2,3);
 
 
+-- Ensuite : python scripts/migrate.py (index des requêtes chaudes, colonne profiles.sort_at)
+-- L'index job_search se remplit via l'API : POST /api/admin/search/reindex (admin)
+-- Les facettes profile_facets via : POST /api/admin/facets/rebuild (admin)
+-- L'index profile_terms via : POST /api/admin/profiles/terms/rebuild (admin)
+
 -- Vérifs rapides
 SELECT COUNT(*) AS nb_users FROM users;
 SELECT COUNT(*) AS nb_profiles FROM profiles;
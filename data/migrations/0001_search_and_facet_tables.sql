@@ -0,0 +1,27 @@
+-- Tables d'index maintenues par l'API (déjà présentes dans jobboard_mysql.sql
+-- pour les bases créées récemment, d'où les IF NOT EXISTS).
+
+CREATE TABLE IF NOT EXISTS job_search (
+  job_id INT PRIMARY KEY,
+  document MEDIUMTEXT NOT NULL,
+  FULLTEXT KEY ft_job_search_document (document),
+  CONSTRAINT fk_job_search_job_id FOREIGN KEY (job_id)
+    REFERENCES jobs (id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS profile_facets (
+  facet VARCHAR(20) NOT NULL,
+  value VARCHAR(191) NOT NULL,
+  n INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (facet, value)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS profile_terms (
+  kind VARCHAR(10) NOT NULL,
+  term VARCHAR(100) NOT NULL,
+  profile_id INT NOT NULL,
+  PRIMARY KEY (kind, term, profile_id),
+  KEY idx_profile_terms_profile (profile_id),
+  CONSTRAINT fk_profile_terms_profile_id FOREIGN KEY (profile_id)
+    REFERENCES profiles (id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
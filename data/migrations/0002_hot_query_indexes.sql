@@ -0,0 +1,25 @@
+-- Index des requêtes chaudes de main.py. Tous en ALGORITHM=INPLACE, LOCK=NONE :
+-- MySQL refuse la migration plutôt que de bloquer les écritures s'il ne peut pas
+-- construire l'index en ligne.
+
+-- list_jobs / _list_jobs : ORDER BY j.created_at DESC, j.id DESC (+ curseur keyset)
+ALTER TABLE jobs
+  ADD INDEX idx_jobs_created (created_at, id),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- list_applications : WHERE a.job_id = ? ORDER BY a.created_at DESC, a.id DESC
+ALTER TABLE applications
+  ADD INDEX idx_applications_job_created (job_id, created_at, id),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- list_profiles : tri sur COALESCE(updated_at, created_at), exposé en colonne virtuelle
+-- (ajout de colonne VIRTUAL = changement de métadonnées seulement)
+ALTER TABLE profiles
+  ADD COLUMN sort_at DATETIME AS (COALESCE(updated_at, created_at)) VIRTUAL,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- list_profiles : tri seul, et filtre p.city = ? / IN (...) + tri
+ALTER TABLE profiles
+  ADD INDEX idx_profiles_sort (sort_at, id),
+  ADD INDEX idx_profiles_city_sort (city, sort_at, id),
+  ALGORITHM=INPLACE, LOCK=NONE;
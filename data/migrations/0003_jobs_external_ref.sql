@@ -0,0 +1,10 @@
+-- Référence externe (id de l'offre dans l'ATS) pour l'upsert de POST /api/jobs/bulk.
+
+ALTER TABLE jobs
+  ADD COLUMN external_ref VARCHAR(191) NULL,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE jobs
+  ADD UNIQUE INDEX uq_jobs_company_external_ref (company_id, external_ref),
+  ADD INDEX idx_jobs_external_ref (external_ref),
+  ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,28 @@
+-- Horodatage de dernière modification pour les exports incrémentaux (updated_since).
+-- changed_at = COALESCE(updated_at, created_at), comme profiles.sort_at.
+-- La colonne VIRTUAL est ajoutée seule : combinée à une autre action, MySQL
+-- ne l'accepte pas en INPLACE.
+
+ALTER TABLE jobs
+  ADD COLUMN updated_at DATETIME NULL ON UPDATE CURRENT_TIMESTAMP,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE jobs
+  ADD COLUMN changed_at DATETIME AS (COALESCE(updated_at, created_at)) VIRTUAL,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE applications
+  ADD COLUMN updated_at DATETIME NULL ON UPDATE CURRENT_TIMESTAMP,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE applications
+  ADD COLUMN changed_at DATETIME AS (COALESCE(updated_at, created_at)) VIRTUAL,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE jobs
+  ADD INDEX idx_jobs_changed (changed_at, id),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE applications
+  ADD INDEX idx_applications_changed (changed_at, id),
+  ALGORITHM=INPLACE, LOCK=NONE;
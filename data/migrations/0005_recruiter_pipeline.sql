@@ -0,0 +1,23 @@
+-- Propriétaire des offres (tableau de bord recruteur) et compteurs de candidatures par statut.
+
+ALTER TABLE jobs
+  ADD COLUMN created_by INT NULL,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE jobs
+  ADD INDEX idx_jobs_created_by (created_by, created_at, id),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+CREATE TABLE IF NOT EXISTS application_counts (
+  job_id INT NOT NULL,
+  status VARCHAR(30) NOT NULL,
+  n INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (job_id, status),
+  CONSTRAINT fk_application_counts_job_id FOREIGN KEY (job_id)
+    REFERENCES jobs (id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+-- amorçage (à refaire via POST /api/admin/application_counts/rebuild si des
+-- candidatures arrivent pendant la migration)
+INSERT IGNORE INTO application_counts (job_id, status, n)
+SELECT job_id, status, COUNT(*) FROM applications GROUP BY job_id, status;
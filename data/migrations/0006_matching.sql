@@ -0,0 +1,39 @@
+-- Matching candidats / offres : vecteurs de termes pondérés et top-k précalculés
+-- (voir « Matching candidats / offres » dans main.py). À remplir ensuite via
+-- POST /api/admin/matches/rebuild (admin).
+
+CREATE TABLE IF NOT EXISTS match_terms (
+  side VARCHAR(7) NOT NULL,  -- 'job' | 'profile'
+  kind VARCHAR(10) NOT NULL, -- 'skill' | 'role'
+  term VARCHAR(100) NOT NULL,
+  entity_id INT NOT NULL,
+  weight FLOAT NOT NULL,
+  PRIMARY KEY (side, kind, term, entity_id),
+  KEY idx_match_terms_entity (side, entity_id)
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS job_matches (
+  job_id INT NOT NULL,
+  profile_id INT NOT NULL,
+  score FLOAT NOT NULL,
+  PRIMARY KEY (job_id, profile_id),
+  KEY idx_job_matches_score (job_id, score),
+  KEY idx_job_matches_profile (profile_id),
+  CONSTRAINT fk_job_matches_job_id FOREIGN KEY (job_id)
+    REFERENCES jobs (id) ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_job_matches_profile_id FOREIGN KEY (profile_id)
+    REFERENCES profiles (id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TABLE IF NOT EXISTS profile_matches (
+  profile_id INT NOT NULL,
+  job_id INT NOT NULL,
+  score FLOAT NOT NULL,
+  PRIMARY KEY (profile_id, job_id),
+  KEY idx_profile_matches_score (profile_id, score),
+  KEY idx_profile_matches_job (job_id),
+  CONSTRAINT fk_profile_matches_profile_id FOREIGN KEY (profile_id)
+    REFERENCES profiles (id) ON DELETE CASCADE ON UPDATE CASCADE,
+  CONSTRAINT fk_profile_matches_job_id FOREIGN KEY (job_id)
+    REFERENCES jobs (id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB;
@@ -0,0 +1,16 @@
+-- Flux temps réel : journal des événements poussés aux recruteurs en SSE
+-- (voir « Flux temps réel » dans main.py). L'id sert de jeton de reprise (Last-Event-ID) ;
+-- les lignes de plus de FEED_RETENTION_HOURS sont purgées par l'API.
+
+CREATE TABLE IF NOT EXISTS feed_events (
+  id BIGINT NOT NULL AUTO_INCREMENT,
+  kind VARCHAR(32) NOT NULL,
+  job_id INT NULL,      -- pas de clé étrangère : job.deleted doit survivre à l'offre
+  company_id INT NULL,
+  payload JSON NOT NULL,
+  created_at DATETIME NOT NULL,
+  PRIMARY KEY (id),
+  KEY idx_feed_events_job (job_id, id),
+  KEY idx_feed_events_company (company_id, id),
+  KEY idx_feed_events_created (created_at)
+) ENGINE=InnoDB;
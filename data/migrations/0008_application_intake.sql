@@ -0,0 +1,11 @@
+-- Clé d'idempotence des candidatures (en-tête Idempotency-Key ou générée par le journal
+-- d'intake, voir « Réception des candidatures » dans main.py) : un segment rejoué après
+-- un crash n'insère pas deux fois la même candidature.
+
+ALTER TABLE applications
+  ADD COLUMN intake_key VARCHAR(64) NULL,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE applications
+  ADD UNIQUE INDEX uq_applications_intake (user_id, intake_key),
+  ALGORITHM=INPLACE, LOCK=NONE;
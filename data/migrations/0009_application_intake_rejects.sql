@@ -0,0 +1,14 @@
+-- Candidatures du journal d'intake écartées par le flusher (offre inexistante, valeur
+-- refusée par MySQL...) : lues par GET /api/applications/intake/{key} depuis n'importe
+-- quel worker, et gardées avec l'enregistrement complet pour correction ou rejeu manuel.
+
+CREATE TABLE IF NOT EXISTS application_intake_rejects (
+  user_id INT NOT NULL,
+  intake_key VARCHAR(64) NOT NULL,
+  job_id INT NULL,
+  detail VARCHAR(255) NOT NULL,
+  record JSON NOT NULL,
+  created_at DATETIME NOT NULL,
+  PRIMARY KEY (user_id, intake_key),
+  KEY idx_intake_rejects_created (created_at)
+) ENGINE=InnoDB;
@@ -0,0 +1,11 @@
+-- Révocation des claims des tokens déjà émis (changement de rôle, suppression) : écrite
+-- dans la transaction de la modification, relue par chaque worker (voir invalidate_user).
+-- revoked_at est un epoch en secondes, comparé au iat des tokens ; les lignes plus vieilles
+-- que JWT_EXPIRES_MIN ne servent plus et sont purgées par l'API.
+
+CREATE TABLE IF NOT EXISTS token_revocations (
+  user_id INT NOT NULL,  -- pas de clé étrangère : la révocation doit survivre au user supprimé
+  revoked_at DOUBLE NOT NULL,
+  PRIMARY KEY (user_id),
+  KEY idx_token_revocations_revoked (revoked_at)
+) ENGINE=InnoDB;
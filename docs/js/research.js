@@ -18,7 +18,7 @@ async function fetchSuggestions(query) {
   }
 
   try {
-    const res = await fetch(`${API_BASE}/api/jobs?q=${encodeURIComponent(query)}&page_size=5`);
+    const res = await fetch(`${API_BASE}/api/suggest?q=${encodeURIComponent(query)}&limit=5`);
     const data = await res.json();
 
     suggestionBox.innerHTML = "";
@@ -27,12 +27,12 @@ async function fetchSuggestions(query) {
       return;
     }
 
-    data.items.forEach(job => {
+    data.items.forEach(item => {
       const div = document.createElement("div");
       div.classList.add("suggestion-item");
-      div.textContent = job.title;
+      div.textContent = item.label;
       div.addEventListener("click", () => {
-        searchInput.value = job.title;
+        searchInput.value = item.label;
         suggestionBox.style.display = "none";
         filterJobs();
       });
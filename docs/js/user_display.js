@@ -99,7 +99,7 @@ document.addEventListener("click", async (e) => {
     if (!btn) return;
     const id = btn.dataset.id;
     try {
-        const res = await fetch(`${API_BASE}/api/profiles/${id}`);
+        const res = await fetch(`${API_BASE}/api/profiles/${id}?fields=first_name,last_name,city,job_target,skills,motivation`);
         const profile = await res.json();
         alert(`${profile.first_name} ${profile.last_name}\n\n` +
               `📍 ${profile.city || "Ville non renseignée"}\n\n` +
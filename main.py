@@ -1,21 +1,63 @@
 import os
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from http.cookies import SimpleCookie
 from pathlib import Path
-import secrets
+from urllib.parse import urlencode
+import asyncio
+import base64
+import bisect
+import contextlib
+import contextvars
+import csv
+import fcntl
+import gzip
+import hashlib
+import heapq
+import stat
+import tempfile
 import imghdr
+import io
+import json
+import logging
+import math
+import mimetypes
+import re
+import threading
+import time
+import unicodedata
+import uuid
 
-from fastapi import FastAPI, Depends, HTTPException, status, Response, UploadFile, File
+from fastapi import FastAPI, Depends, Header, HTTPException, status, Request, Response, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
+from starlette.staticfiles import NotModifiedResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+import anyio
 
 from dotenv import load_dotenv
 import mysql.connector
+import mysql.connector.aio
 from mysql.connector import Error
 
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 
+try:
+    import brotli  # optionnel : variantes .br des fichiers statiques
+except ImportError:
+    brotli = None
+
+try:
+    import orjson  # optionnel : sérialisation rapide des réponses (sinon json de la stdlib)
+except ImportError:
+    orjson = None
+
 # --------------------------------------------------------------------
 # Boot
 # --------------------------------------------------------------------
@@ -25,9 +67,92 @@ app = FastAPI(title="Jobboard API")
 # --------------------------------------------------------------------
 # Static / Uploads
 # --------------------------------------------------------------------
+CONTENT_HASH_NAME = re.compile(r"^[0-9a-f]{64}(_\d+)?\.\w+$")
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".json", ".svg", ".txt", ".xml", ".map"}
+STATIC_CACHE_DIR = Path(os.getenv("STATIC_CACHE_DIR", ".static_cache"))
+STATIC_COMPRESS_MIN = int(os.getenv("STATIC_COMPRESS_MIN", "512"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles avec en-têtes de cache et variantes pré-compressées.
+
+    - immutable=True : tout le répertoire est servi en cache longue durée ;
+      immutable=regex : seulement les noms empreintes (contenu haché) qui y correspondent ;
+      les autres fichiers sont revalidés (no-cache + ETag/Last-Modified).
+    - precompress=True : les fichiers texte sont compressés une fois (gzip, et brotli si
+      disponible) dans STATIC_CACHE_DIR, puis servis selon Accept-Encoding.
+    """
+
+    ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    def __init__(self, *, directory, immutable=False, precompress=False, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.immutable = immutable
+        self.cache_root = STATIC_CACHE_DIR / Path(directory).name
+        self.precompress = precompress
+        if precompress:
+            self._precompress_all()
+
+    def _precompress_all(self):
+        root = Path(self.directory)
+        for path in root.rglob("*"):
+            if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+                continue
+            if path.stat().st_size < STATIC_COMPRESS_MIN:
+                continue
+            raw = None
+            for encoding, suffix in self.ENCODINGS:
+                if encoding == "br" and brotli is None:
+                    continue
+                target = self.cache_root / (str(path.relative_to(root)) + suffix)
+                if target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+                    continue
+                raw = raw if raw is not None else path.read_bytes()
+                data = brotli.compress(raw, quality=11) if encoding == "br" else gzip.compress(raw, 9, mtime=0)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(data)
+
+    def _cache_control(self, name: str) -> str:
+        if self.immutable is True or (self.immutable and self.immutable.match(name)):
+            return IMMUTABLE
+        return "no-cache"
+
+    async def get_response(self, path: str, scope):
+        if self.precompress and scope["method"] in ("GET", "HEAD"):
+            accept = Headers(scope=scope).get("accept-encoding", "")
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+            if stat_result and stat.S_ISDIR(stat_result.st_mode) and self.html:
+                path = os.path.join(path, "index.html")
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path)
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                rel = os.path.relpath(full_path, self.directory)
+                for encoding, suffix in self.ENCODINGS:
+                    if encoding not in accept:
+                        continue
+                    candidate = self.cache_root / (rel + suffix)
+                    if candidate.exists():
+                        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+                        response = FileResponse(candidate, media_type=media_type, stat_result=os.stat(candidate))
+                        response.headers["Content-Encoding"] = encoding
+                        response.headers["Vary"] = "Accept-Encoding"
+                        response.headers["Cache-Control"] = self._cache_control(Path(full_path).name)
+                        if self.is_not_modified(response.headers, Headers(scope=scope)):
+                            return NotModifiedResponse(response.headers)
+                        return response
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = self._cache_control(Path(path).name)
+            if self.precompress:
+                response.headers["Vary"] = "Accept-Encoding"
+        return response
+
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR), html=False), name="uploads")
+VARIANT_DIR = UPLOAD_DIR / "variants"
+VARIANT_DIR.mkdir(exist_ok=True)
+# monté avant /uploads pour que ce préfixe plus précis soit prioritaire
+app.mount("/uploads/variants", AssetStaticFiles(directory=str(VARIANT_DIR), immutable=True), name="variants")
+app.mount("/uploads", AssetStaticFiles(directory=str(UPLOAD_DIR), immutable=CONTENT_HASH_NAME), name="uploads")
 
 ALLOWED_KINDS = {"jpeg", "png", "webp"}
 MAX_BYTES = 8 * 1024 * 1024  # 8MB
@@ -36,50 +161,696 @@ def _validate_image_bytes(raw: bytes) -> str:
     kind = imghdr.what(None, h=raw)  # returns "jpeg","png","webp", etc.
     return kind or ""
 
-def _safe_image_name(prefix="img", ext="jpg") -> str:
-    return f"{prefix}_{secrets.token_hex(8)}.{ext}"
+def _content_image_name(digest: str, ext: str) -> str:
+    # nom = empreinte du contenu : deux envois identiques partagent le même fichier
+    return f"{digest}.{ext}"
+
+UPLOAD_CHUNK = 64 * 1024
+UPLOAD_SNIFF_BYTES = 32
+UPLOAD_SWEEP_GRACE = float(os.getenv("UPLOAD_SWEEP_GRACE", "86400"))  # fichiers récents épargnés (s)
+UPLOAD_SWEEP_INTERVAL = float(os.getenv("UPLOAD_SWEEP_INTERVAL", "0"))  # 0 = pas de balayage auto
+
+# --------------------------------------------------------------------
+# Variantes d'images (miniatures)
+# --------------------------------------------------------------------
+VARIANT_WIDTHS = (160, 480, 1200)
+VARIANT_FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+_CONTENT_NAME = re.compile(r"^([0-9a-f]{64})\.(jpg|png|webp)$")  # originaux (cf. CONTENT_HASH_NAME)
+_image_executor: ProcessPoolExecutor | None = None
+
+def _render_variants(src: str, digest: str) -> list[str]:
+    """Exécuté dans un process du pool : redimensionne src à chaque largeur, en WebP et JPEG."""
+    from PIL import Image  # import tardif : Pillow n'est requis que par les workers
+
+    written = []
+    with Image.open(src) as img:
+        img = img.convert("RGB")
+        for width in VARIANT_WIDTHS:
+            height = max(1, round(img.height * min(1, width / img.width)))
+            resized = img.resize((min(width, img.width), height), Image.LANCZOS)
+            for ext, fmt in VARIANT_FORMATS.items():
+                dest = VARIANT_DIR / f"{digest}_{width}.{ext}"
+                tmp = dest.with_suffix(f".{ext}.tmp")
+                resized.save(tmp, fmt, quality=82)
+                os.replace(tmp, dest)  # la plus grande variante WebP sert de marqueur « prêt »
+                written.append(dest.name)
+    return written
+
+def schedule_variants(path: Path):
+    """Lance la génération des miniatures hors du chemin de la requête (pool de process)."""
+    global _image_executor
+    match = _CONTENT_NAME.match(path.name)
+    if not match or _variant_path(match.group(1), VARIANT_WIDTHS[-1], "webp").exists():
+        return
+    if _image_executor is None:
+        _image_executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    _image_executor.submit(_render_variants, str(path), match.group(1))
+
+def _variant_path(digest: str, width: int, ext: str) -> Path:
+    return VARIANT_DIR / f"{digest}_{width}.{ext}"
+
+def image_variants(url: str | None) -> dict | None:
+    """URLs des miniatures d'une image uploadée, ou None si elles ne sont pas (encore) prêtes."""
+    if not url:
+        return None
+    match = _CONTENT_NAME.match(url.rsplit("/", 1)[-1])
+    if not match or "/uploads/" not in url:
+        return None
+    digest = match.group(1)
+    if not _variant_path(digest, VARIANT_WIDTHS[-1], "webp").exists():
+        return None
+    return {
+        str(width): {ext: f"/uploads/variants/{digest}_{width}.{ext}" for ext in VARIANT_FORMATS}
+        for width in VARIANT_WIDTHS
+    }
+
+def with_variants(rows, *fields: str):
+    """Ajoute <champ>_variants (ex. avatar_variants) à côté de chaque URL d'image."""
+    for row in rows if isinstance(rows, list) else [rows]:
+        for field in fields:
+            if field in row:
+                row[field.removesuffix("_url") + "_variants"] = image_variants(row[field])
+    return rows
+
+@app.on_event("shutdown")
+def _stop_image_workers():
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=False, cancel_futures=True)
 
 # --------------------------------------------------------------------
 # DB
 # --------------------------------------------------------------------
+def _db_config() -> dict:
+    return dict(
+        host=os.getenv("DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASS"),
+        database=os.getenv("DB_NAME", "jobboard"),
+        charset="utf8mb4",
+        autocommit=False,
+        raise_on_warnings=True,
+        connection_timeout=5,
+    )
+
+class PoolTimeout(Exception):
+    pass
+
+class DBPool:
+    """Pool de connexions MySQL thread-safe.
+
+    - min_size connexions chaudes gardées ouvertes, max_size au total ;
+    - checkout bloquant au plus `timeout` secondes ;
+    - une connexion inutilisée depuis plus de `recycle` secondes est fermée ;
+    - le ping n'est fait que sur les connexions restées au repos plus de `stale_after` secondes.
+    """
+
+    def __init__(self, connect, min_size=2, max_size=10, timeout=5.0, recycle=1800.0, stale_after=30.0):
+        self._connect = connect
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.stale_after = stale_after
+        self._idle: list[tuple] = []  # (conn, last_used) ; LIFO pour garder les connexions chaudes
+        self._size = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            "created": 0, "closed": 0, "checkouts": 0, "reused": 0,
+            "validated": 0, "invalidated": 0, "timeouts": 0, "waits": 0,
+        }
+
+    def _open(self):
+        conn = self._connect()
+        with self._cond:
+            self.stats["created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self.stats["closed"] += 1
+            self._cond.notify()
+
+    def warm_up(self):
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            self.stats["checkouts"] += 1
+        while True:
+            conn = None
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        raise PoolTimeout(f"no connection available after {self.timeout}s")
+                    self.stats["waits"] += 1
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    self._size += 1
+            if conn is None:
+                try:
+                    return self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.recycle:
+                self._discard(conn)
+                continue
+            if idle_for > self.stale_after:
+                with self._cond:
+                    self.stats["validated"] += 1
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    with self._cond:
+                        self.stats["invalidated"] += 1
+                    self._discard(conn)
+                    continue
+            with self._cond:
+                self.stats["reused"] += 1
+            return conn
+
+    def release(self, conn, broken: bool = False):
+        if broken:
+            self._discard(conn)
+            return
+        now = time.monotonic()
+        with self._cond:
+            self._idle.append((conn, now))
+            # Recyclage des connexions excédentaires restées au repos trop longtemps
+            expired = []
+            while len(self._idle) > self.min_size and now - self._idle[0][1] > self.recycle:
+                expired.append(self._idle.pop(0)[0])
+            self._cond.notify()
+        for old in expired:
+            self._discard(old)
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                **self.stats,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+_pool: DBPool | None = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> DBPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = DBPool(
+                    connect_instrumented,
+                    min_size=int(os.getenv("DB_POOL_MIN", "2")),
+                    max_size=int(os.getenv("DB_POOL_MAX", "10")),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+                    recycle=float(os.getenv("DB_POOL_RECYCLE", "1800")),
+                    stale_after=float(os.getenv("DB_POOL_STALE_AFTER", "30")),
+                )
+                try:
+                    pool.warm_up()
+                except Error:
+                    pass  # les connexions seront ouvertes à la demande
+                _pool = pool
+    return _pool
+
+# id(connexion) -> callbacks à lancer une fois la transaction de la requête commitée
+_after_commit_hooks: dict[int, list] = {}
+
+def after_commit(db, callback):
+    """Planifie callback() après le commit de get_db / get_db_async (ignoré en cas de rollback)."""
+    _after_commit_hooks.setdefault(id(db), []).append(callback)
+
+def _run_after_commit(conn):
+    for callback in _after_commit_hooks.pop(id(conn), []):
+        try:
+            callback()
+        except Exception:
+            pass
+
 def get_db():
-    """Connexion MySQL par requête (commit/rollback) + erreurs lisibles."""
-    try:
-        conn = mysql.connector.connect(
-            host=os.getenv("DB_HOST", "127.0.0.1"),
-            port=int(os.getenv("DB_PORT", "3306")),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASS"),
-            database=os.getenv("DB_NAME", "jobboard"),
-            charset="utf8mb4",
-            autocommit=False,
-            raise_on_warnings=True,
-            connection_timeout=5,
-        )
-        conn.ping(reconnect=True, attempts=1, delay=0)
+    """Connexion MySQL empruntée au pool (commit/rollback) + erreurs lisibles."""
+    pool = get_pool()
+    try:
+        conn = pool.acquire()
+    except PoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"DB pool exhausted: {e}") from e
     except Error as e:
-        print("test")
         raise HTTPException(status_code=500, detail=f"DB connection failed: {e}") from e
 
+    broken = False
     try:
         yield conn
         conn.commit()
-    except Exception:
-        conn.rollback()
+        _run_after_commit(conn)
+    except Exception as exc:
+        # une erreur d'interface (socket coupé...) rend la connexion inutilisable
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            conn.rollback()
+        except Error:
+            broken = True
+        raise
+    finally:
+        _after_commit_hooks.pop(id(conn), None)
+        pool.release(conn, broken=broken)
+
+# même cycle que get_db, hors injection de dépendance (connexion empruntée seulement si besoin)
+db_connection = contextlib.contextmanager(get_db)
+
+class AsyncDBPool:
+    """Équivalent asyncio de DBPool, pour mysql.connector.aio.
+
+    Un sémaphore borne le nombre de connexions ouvertes ; les connexions
+    libérées repartent dans une pile LIFO pour rester chaudes.
+    """
+
+    def __init__(self, connect, min_size=2, max_size=50, timeout=5.0, recycle=1800.0, stale_after=30.0):
+        self._connect = connect
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.stale_after = stale_after
+        self._idle: list[tuple] = []
+        self._size = 0
+        self._sem: asyncio.Semaphore | None = None
+        self.stats = {
+            "created": 0, "closed": 0, "checkouts": 0, "reused": 0,
+            "validated": 0, "invalidated": 0, "timeouts": 0,
+        }
+
+    async def _discard(self, conn):
+        self._size -= 1
+        self.stats["closed"] += 1
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    async def warm_up(self):
+        while self._size < self.min_size:
+            self._size += 1
+            try:
+                conn = await self._connect()
+            except Exception:
+                self._size -= 1
+                raise
+            self.stats["created"] += 1
+            self._idle.append((conn, time.monotonic()))
+
+    async def acquire(self):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_size)
+        self.stats["checkouts"] += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise PoolTimeout(f"no connection available after {self.timeout}s") from None
+
+        try:
+            while self._idle:
+                conn, last_used = self._idle.pop()
+                idle_for = time.monotonic() - last_used
+                if idle_for > self.recycle:
+                    await self._discard(conn)
+                    continue
+                if idle_for > self.stale_after:
+                    self.stats["validated"] += 1
+                    try:
+                        await conn.ping(reconnect=False)
+                    except Exception:
+                        self.stats["invalidated"] += 1
+                        await self._discard(conn)
+                        continue
+                self.stats["reused"] += 1
+                return conn
+            self._size += 1
+            try:
+                conn = await self._connect()
+            except Exception:
+                self._size -= 1
+                raise
+            self.stats["created"] += 1
+            return conn
+        except BaseException:
+            self._sem.release()
+            raise
+
+    async def release(self, conn, broken: bool = False):
+        try:
+            if broken:
+                await self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            self._sem.release()
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": self._size - len(self._idle),
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+        }
+
+_aio_pool: AsyncDBPool | None = None
+
+async def get_aio_pool() -> AsyncDBPool:
+    global _aio_pool
+    if _aio_pool is None:
+        pool = AsyncDBPool(
+            connect_instrumented_async,
+            min_size=int(os.getenv("DB_POOL_MIN", "2")),
+            max_size=int(os.getenv("DB_AIO_POOL_MAX", "50")),
+            timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+            recycle=float(os.getenv("DB_POOL_RECYCLE", "1800")),
+            stale_after=float(os.getenv("DB_POOL_STALE_AFTER", "30")),
+        )
+        _aio_pool = pool
+        try:
+            await pool.warm_up()
+        except Error:
+            pass
+    return _aio_pool
+
+async def get_db_async():
+    """Version asyncio de get_db : la route ne bloque pas de thread pendant les requêtes SQL."""
+    pool = await get_aio_pool()
+    try:
+        conn = await pool.acquire()
+    except PoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"DB pool exhausted: {e}") from e
+    except Error as e:
+        raise HTTPException(status_code=500, detail=f"DB connection failed: {e}") from e
+
+    broken = False
+    try:
+        yield conn
+        await conn.commit()
+        _run_after_commit(conn)
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            await conn.rollback()
+        except Error:
+            broken = True
+        raise
+    finally:
+        _after_commit_hooks.pop(id(conn), None)
+        await pool.release(conn, broken=broken)
+
+@contextlib.asynccontextmanager
+async def aio_connection():
+    """Connexion asynchrone empruntée hors injection de dépendance (commit en sortie)."""
+    pool = await get_aio_pool()
+    try:
+        conn = await pool.acquire()
+    except PoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"DB pool exhausted: {e}") from e
+    except Error as e:
+        raise HTTPException(status_code=500, detail=f"DB connection failed: {e}") from e
+    broken = False
+    try:
+        yield conn
+        await conn.commit()
+        _run_after_commit(conn)
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            await conn.rollback()
+        except Error:
+            broken = True
         raise
     finally:
-        conn.close()
+        _after_commit_hooks.pop(id(conn), None)
+        await pool.release(conn, broken=broken)
+
+# --------------------------------------------------------------------
+# Cache mémoire
+# --------------------------------------------------------------------
+class TTLCache:
+    """Cache LRU borné avec expiration par entrée, utilisable depuis les threads et la boucle asyncio."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def pop_where(self, predicate) -> int:
+        with self._lock:
+            keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for k in keys:
+                del self._data[k]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+# --------------------------------------------------------------------
+# Sérialisation JSON des lignes SQL
+# --------------------------------------------------------------------
+# Les routes de listing renvoient des lignes brutes (dict de types mysql.connector) : elles sont
+# sérialisées directement en bytes, sans le parcours générique de jsonable_encoder.
+ROW_FORMATS = ("rows", "columns")
+
+def _json_default(value):
+    """Types renvoyés par mysql.connector hors JSON natif (mêmes conversions que jsonable_encoder)."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_json(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+class FastJSONResponse(Response):
+    """Réponse JSON rendue par dumps_json ; à renvoyer telle quelle pour que FastAPI ne ré-encode rien."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
+def check_row_format(format: str | None) -> bool:
+    """format=columns demandé ? (400 sur une valeur inconnue, avant toute requête SQL)"""
+    if format is None or format == "rows":
+        return False
+    if format not in ROW_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(ROW_FORMATS)}")
+    return True
+
+def to_columns(rows: list[dict]) -> dict:
+    """[{"id": 1, "city": "Lyon"}, ...] -> {"columns": ["id", "city"], "rows": [[1, "Lyon"], ...]}"""
+    if not rows:
+        return {"columns": [], "rows": []}
+    columns = list(rows[0])
+    return {"columns": columns, "rows": [list(map(row.get, columns)) for row in rows]}
+
+def shape_rows(payload, columnar: bool):
+    """Réponse de listing ({"items": [...], ...} ou liste) au format colonnes si demandé."""
+    if not columnar:
+        return payload
+    if isinstance(payload, list):
+        return to_columns(payload)
+    shaped = {k: v for k, v in payload.items() if k != "items"}
+    shaped.update(to_columns(payload["items"]))
+    return shaped
+
+# --------------------------------------------------------------------
+# Cache HTTP des lectures publiques
+# --------------------------------------------------------------------
+class ResponseCache:
+    """Cache de réponses JSON : LRU/TTL, ETag fort, coalescence des miss, invalidation par tags.
+
+    Chaque entrée porte des tags (« jobs », « job:12 », « company:3 »...) ; les routes
+    d'écriture invalident exactement les tags qu'elles touchent, après commit.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 30.0):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tags: dict[str, set] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._invalidated_at = TTLCache(maxsize=maxsize, ttl=60.0)  # tag -> instant de la dernière invalidation
+        # génération : compteur global incrémenté à chaque invalidation, et dernière génération par tag.
+        # Un résultat calculé avant une invalidation de l'un de ses tags n'est pas mis en cache.
+        self._generation = 0
+        self._invalidated_gen = TTLCache(maxsize=65536, ttl=600.0)
+
+    async def get_or_compute(self, key: str, tags: set[str], producer) -> tuple[str, bytes]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        started = self._generation
+        try:
+            data, extra_tags = await producer()
+            body = dumps_json(data)
+            entry = ('"' + hashlib.sha256(body).hexdigest()[:32] + '"', body)
+            self._store(key, tags | extra_tags, entry, started)
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # évite « exception never retrieved » si personne n'attendait
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(self, key: str, tags: set[str], entry, started: int):
+        with self._lock:
+            # une écriture commitée pendant le calcul : le résultat est peut-être antérieur, on ne le garde pas
+            if any(self._invalidated_gen.get(tag, 0) > started for tag in tags):
+                return
+            self._entries.set(key, entry)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def recently_invalidated(self, tags, within: float) -> bool:
+        now = time.monotonic()
+        return any(now - self._invalidated_at.get(tag, float("-inf")) < within for tag in tags)
+
+    def invalidate(self, *tags: str):
+        now = time.monotonic()
+        for tag in tags:
+            self._invalidated_at.set(tag, now)
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._invalidated_gen.set(tag, self._generation)
+            keys = set().union(*(self._tags.pop(tag, set()) for tag in tags))
+        for key in keys:
+            self._entries.pop(key)
+
+HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", "30"))
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "30"))
+response_cache = ResponseCache(maxsize=int(os.getenv("HTTP_CACHE_SIZE", "2048")), ttl=HTTP_CACHE_TTL)
+
+async def cached_response(request: Request, key: str, tags: set[str], producer) -> Response:
+    """Sert une lecture publique depuis response_cache, avec ETag et 304 sur If-None-Match.
+
+    producer() -> (données, tags supplémentaires connus seulement après la requête SQL).
+    """
+    etag, body = await response_cache.get_or_compute(key, tags, lambda: _read_after_invalidation(tags, producer))
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (t.strip() for t in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def invalidate_responses(db, *tags: str):
+    after_commit(db, lambda: response_cache.invalidate(*tags))
 
 # --------------------------------------------------------------------
 # Sécurité / JWT
 # --------------------------------------------------------------------
+# coût des hash : relever PBKDF2_ROUNDS fait ré-hacher les anciens mots de passe à la connexion suivante
+PBKDF2_ROUNDS = int(os.getenv("PBKDF2_ROUNDS", "29000"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 pwd_context = CryptContext(
     schemes=["pbkdf2_sha256", "bcrypt"],
-    deprecated="auto",
+    deprecated="auto",  # seul le premier schéma (pbkdf2_sha256) est conservé : les hash bcrypt sont migrés
+    pbkdf2_sha256__default_rounds=PBKDF2_ROUNDS,
+    pbkdf2_sha256__min_rounds=PBKDF2_ROUNDS,
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
 )
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret")
 JWT_ALGO = os.getenv("JWT_ALGO", "HS256")
 JWT_EXPIRES_MIN = int(os.getenv("JWT_EXPIRES_MIN", "60"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "300"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_REVOCATION_POLL = float(os.getenv("AUTH_REVOCATION_POLL", "2"))
+auth_log = logging.getLogger("jobboard.auth")
+
+# token vérifié -> {"id", "email", "role"}
+_token_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+# user_id -> instant (epoch) avant lequel les claims du token ne font plus foi.
+# Copie locale de token_revocations, relue par chaque worker toutes les AUTH_REVOCATION_POLL s ;
+# au-delà de la durée de vie d'un token, une révocation ne sert plus et est oubliée.
+_claims_revoked_before: dict[int, float] = {}
 
 def hash_password(plain: str) -> str:
     try:
@@ -94,19 +865,109 @@ def verify_password(plain: str, hashed: str) -> bool:
     except Exception:
         return False
 
+def verify_and_rehash(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """(valide, nouveau hash si l'ancien est obsolète ou trop faible)."""
+    try:
+        return pwd_context.verify_and_update(plain, hashed)
+    except Exception:
+        return False, None
+
+# Le hachage (plusieurs dizaines de ms de CPU) tourne dans un pool de process dédié :
+# les threads de requête ne tiennent plus le GIL, et au-delà de HASH_QUEUE_LIMIT
+# demandes en attente on répond 503 tout de suite plutôt que d'allonger la file.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 2)))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", str(4 * HASH_WORKERS)))
+_hash_executor: ProcessPoolExecutor | None = None
+_hash_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_LIMIT)
+hash_stats = {"in_flight": 0, "rejected": 0}
+
+async def run_hashing(fn, *args):
+    global _hash_executor
+    if not _hash_slots.acquire(blocking=False):
+        hash_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Authentication is overloaded, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    hash_stats["in_flight"] += 1
+    try:
+        if _hash_executor is None:
+            _hash_executor = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+        return await asyncio.wrap_future(_hash_executor.submit(fn, *args))
+    finally:
+        hash_stats["in_flight"] -= 1
+        _hash_slots.release()
+
+@app.on_event("shutdown")
+def _stop_hash_workers():
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+
 def create_access_token(data: dict, expires_minutes: int = JWT_EXPIRES_MIN) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
-    to_encode.update({"exp": expire})
+    now = datetime.utcnow()
+    to_encode.update({"iat": now, "exp": now + timedelta(minutes=expires_minutes)})
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGO)
 
 security = HTTPBearer(auto_error=True)
 
-def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(security),
-    db=Depends(get_db),
-):
+def invalidate_user(db, cur, user_id: int):
+    """À appeler, dans la transaction, quand le rôle d'un user change ou qu'il est supprimé.
+
+    La révocation est écrite en base pour tous les workers ; après le commit, ce worker vide
+    tout de suite ses tokens du cache, les autres au prochain relevé de token_revocations.
+    """
+    revoked_at = time.time()
+    cur.execute(
+        "INSERT INTO token_revocations (user_id, revoked_at) VALUES (%s, %s) AS new "
+        "ON DUPLICATE KEY UPDATE revoked_at = new.revoked_at",
+        (user_id, revoked_at),
+    )
+    after_commit(db, lambda: _apply_revocations({user_id: revoked_at}))
+
+def _apply_revocations(revocations: dict[int, float]):
+    global _claims_revoked_before
+    horizon = time.time() - JWT_EXPIRES_MIN * 60
+    merged = {user_id: at for user_id, at in _claims_revoked_before.items() if at > horizon}
+    changed = set()
+    for user_id, at in revocations.items():
+        if at > max(merged.get(user_id, 0), horizon):
+            merged[user_id] = at
+            changed.add(user_id)
+    _claims_revoked_before = merged
+    if changed:
+        _token_cache.pop_where(lambda _, user: user["id"] in changed)
+
+async def _poll_token_revocations():
+    purged_at = 0.0
+    while True:
+        try:
+            horizon = time.time() - JWT_EXPIRES_MIN * 60
+            async with aio_connection() as db:
+                async with await db.cursor() as cur:
+                    await cur.execute(
+                        "SELECT user_id, revoked_at FROM token_revocations WHERE revoked_at > %s", (horizon,)
+                    )
+                    rows = await cur.fetchall()
+                    if time.monotonic() - purged_at > 3600:
+                        await cur.execute("DELETE FROM token_revocations WHERE revoked_at <= %s LIMIT 10000", (horizon,))
+                        purged_at = time.monotonic()
+            _apply_revocations(dict(rows))
+        except Exception:
+            auth_log.exception("token revocation poll failed")
+        await asyncio.sleep(AUTH_REVOCATION_POLL)
+
+@app.on_event("startup")
+async def _start_token_revocations():
+    asyncio.get_running_loop().create_task(_poll_token_revocations())
+
+async def get_current_user(creds: HTTPAuthorizationCredentials = Depends(security)):
     token = creds.credentials
+    cached = _token_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGO])
         email = payload.get("sub")
@@ -115,13 +976,24 @@ def get_current_user(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    with db.cursor(dictionary=True) as cur:
-        cur.execute("SELECT id, email, role FROM users WHERE email=%s", (email,))
-        user = cur.fetchone()
+    user_id = payload.get("id")
+    role = payload.get("role")
+    issued_at = payload.get("iat", 0)
+    if user_id is not None and role and issued_at >= _claims_revoked_before.get(user_id, 0):
+        user = {"id": user_id, "email": email, "role": role}
+    else:
+        # anciens tokens (sans id) ou user modifié depuis l'émission du token
+        async with aio_connection() as db:
+            async with await db.cursor(dictionary=True) as cur:
+                await cur.execute("SELECT id, email, role FROM users WHERE email=%s", (email,))
+                user = await cur.fetchone()
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
 
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
+    ttl = min(AUTH_CACHE_TTL, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        _token_cache.set(token, user, ttl=ttl)
+    return dict(user)
 
 def require_user(user=Depends(get_current_user)):
     return user
@@ -136,6 +1008,490 @@ def require_admin_or_recruiter(user=Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return user
 
+# --------------------------------------------------------------------
+# Réplicas de lecture
+# --------------------------------------------------------------------
+# DB_REPLICAS="replica1:3306,replica2" : les routes GET lisent sur un réplica sain (le moins chargé),
+# les écritures restent sur le primaire. Sans réplica configuré, tout passe par le primaire.
+DB_REPLICAS = [h.strip() for h in os.getenv("DB_REPLICAS", "").split(",") if h.strip()]
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_EJECT_SECONDS = float(os.getenv("REPLICA_EJECT_SECONDS", "30"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "5"))
+# après une écriture, l'auteur lit sur le primaire pendant cette durée (≥ REPLICA_MAX_LAG)
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", str(REPLICA_MAX_LAG + 1)))
+RYW_COOKIE = "jb_rw"
+
+class Replica:
+    def __init__(self, address: str):
+        host, _, port = address.partition(":")
+        self.address = address
+        self.pool = AsyncDBPool(
+            lambda: connect_instrumented_async(host=host, port=int(port or 3306)),
+            min_size=0,
+            max_size=int(os.getenv("DB_REPLICA_POOL_MAX", "50")),
+            timeout=float(os.getenv("DB_REPLICA_POOL_TIMEOUT", "1")),
+            recycle=float(os.getenv("DB_POOL_RECYCLE", "1800")),
+            stale_after=float(os.getenv("DB_POOL_STALE_AFTER", "30")),
+        )
+        self.ejected_until = 0.0
+        self.reason: str | None = None
+        self.lag: float | None = None
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def eject(self, reason: str):
+        self.ejected_until = time.monotonic() + REPLICA_EJECT_SECONDS
+        self.reason = reason
+
+    def snapshot(self) -> dict:
+        return {"address": self.address, "healthy": self.healthy, "reason": self.reason,
+                "lag": self.lag, **self.pool.snapshot()}
+
+replicas = [Replica(address) for address in DB_REPLICAS]
+# positionné par ReadYourWritesMiddleware (auteur d'une écriture récente) ou par le cache HTTP
+_read_from_primary: contextvars.ContextVar[bool] = contextvars.ContextVar("read_from_primary", default=False)
+
+def pick_replica() -> Replica | None:
+    if _read_from_primary.get():
+        return None
+    candidates = [r for r in replicas if r.healthy]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda r: r.pool.snapshot()["in_use"])
+
+@contextlib.asynccontextmanager
+async def aio_read_connection():
+    """Connexion de lecture : un réplica sain si possible, sinon le primaire (jamais d'écriture ici)."""
+    replica = pick_replica()
+    conn = None
+    if replica is not None:
+        try:
+            conn = await replica.pool.acquire()
+        except PoolTimeout:
+            pass  # pool du réplica occupé, pas en panne : cette lecture passe par le primaire
+        except (Error, OSError) as e:
+            replica.eject(f"connect: {e}")
+    if conn is None:
+        async with aio_connection() as conn:
+            yield conn
+        return
+    broken = False
+    try:
+        yield conn
+        await conn.rollback()  # referme le snapshot de lecture
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            await conn.rollback()
+        except Error:
+            broken = True
+        if broken:
+            replica.eject(f"connection lost: {exc}")
+        raise
+    finally:
+        await replica.pool.release(conn, broken=broken)
+
+async def get_read_db_async():
+    """Dépendance des routes GET : comme get_db_async, mais servie par un réplica."""
+    async with aio_read_connection() as conn:
+        yield conn
+
+async def _check_replica(replica: Replica):
+    try:
+        conn = await replica.pool.acquire()
+    except PoolTimeout:
+        return  # toutes les connexions servent des lectures : le réplica répond, on vérifiera au prochain tour
+    except (Error, OSError) as e:
+        replica.eject(f"connect: {e}")
+        return
+    broken = False
+    try:
+        async with await conn.cursor(dictionary=True) as cur:
+            await cur.execute("SHOW REPLICA STATUS")
+            status_row = await cur.fetchone()
+        await conn.rollback()
+    except Error as e:
+        if getattr(e, "errno", None) == 1227:  # pas le privilège REPLICATION CLIENT : retard inconnu
+            replica.lag = None
+            return
+        broken = True
+        replica.eject(f"check: {e}")
+        return
+    finally:
+        await replica.pool.release(conn, broken=broken)
+    lag = (status_row or {}).get("Seconds_Behind_Source")
+    replica.lag = None if lag is None else float(lag)
+    if status_row is not None and lag is None:
+        replica.eject("replication stopped")
+    elif replica.lag is not None and replica.lag > REPLICA_MAX_LAG:
+        replica.eject(f"lag {replica.lag:.0f}s")
+    else:
+        replica.ejected_until, replica.reason = 0.0, None
+
+async def _watch_replicas():
+    while True:
+        await asyncio.gather(*(_check_replica(r) for r in replicas), return_exceptions=True)
+        await asyncio.sleep(REPLICA_CHECK_INTERVAL)
+
+@app.on_event("startup")
+async def _start_replica_watch():
+    if replicas:
+        asyncio.get_running_loop().create_task(_watch_replicas())
+
+# user_id -> True pendant READ_YOUR_WRITES_WINDOW après une écriture réussie
+_recent_writers = TTLCache(maxsize=100_000, ttl=READ_YOUR_WRITES_WINDOW)
+
+def _bearer_user_id(scope) -> int | None:
+    auth = Headers(scope=scope).get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    token = auth[7:].strip()
+    cached = _token_cache.get(token)
+    if cached is not None:
+        return cached["id"]
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGO]).get("id")
+    except JWTError:
+        return None
+
+class ReadYourWritesMiddleware:
+    """Après une écriture, son auteur (token ou cookie jb_rw) relit sur le primaire le temps que les réplicas rattrapent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replicas:
+            await self.app(scope, receive, send)
+            return
+        user_id = _bearer_user_id(scope)
+        cookie = SimpleCookie(Headers(scope=scope).get("cookie", "")).get(RYW_COOKIE)
+        try:
+            recent_cookie = cookie is not None and float(cookie.value) > time.time()
+        except ValueError:
+            recent_cookie = False
+        token = _read_from_primary.set(recent_cookie or (user_id is not None and _recent_writers.get(user_id) is not None))
+        is_write = scope["method"] not in ("GET", "HEAD", "OPTIONS")
+
+        async def send_wrapper(message):
+            if is_write and message["type"] == "http.response.start" and message["status"] < 400:
+                if user_id is not None:
+                    _recent_writers.set(user_id, True)
+                until = time.time() + READ_YOUR_WRITES_WINDOW
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{RYW_COOKIE}={until:.0f}; Max-Age={READ_YOUR_WRITES_WINDOW:.0f}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _read_from_primary.reset(token)
+
+app.add_middleware(ReadYourWritesMiddleware)
+
+async def _read_after_invalidation(tags: set[str], producer):
+    """Un miss juste après une invalidation relit sur le primaire : le réplica n'a peut-être pas encore l'écriture."""
+    if not replicas or not response_cache.recently_invalidated(tags, READ_YOUR_WRITES_WINDOW):
+        return await producer()
+    token = _read_from_primary.set(True)
+    try:
+        return await producer()
+    finally:
+        _read_from_primary.reset(token)
+
+# --------------------------------------------------------------------
+# Métriques (Prometheus) et journal des requêtes SQL lentes
+# --------------------------------------------------------------------
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+slow_query_log = logging.getLogger("jobboard.slow_query")
+
+class Histogram:
+    """Histogramme Prometheus minimal (buckets cumulés, _sum, _count) par jeu de labels."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help_text, labels, buckets
+        self._series: dict[tuple, list] = {}  # labels -> [compteurs par bucket..., somme, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for label_values, series in items:
+            base = _prom_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_prom_labels_with(base, 'le', str(bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_prom_labels_with(base, 'le', '+Inf')} {series[-1]}")
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]):
+        self.name, self.help, self.labels = name, help_text, labels
+        self._values: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: int = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{{{_prom_labels(self.labels, k)}}} {v}" for k, v in items]
+        return lines
+
+def _prom_escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _prom_labels(names, values) -> str:
+    return ",".join(f'{n}="{_prom_escape(v)}"' for n, v in zip(names, values))
+
+def _prom_labels_with(base: str, name: str, value: str) -> str:
+    return "{" + (base + "," if base else "") + f'{name}="{value}"' + "}"
+
+def _gauge(name: str, help_text: str, samples: list[tuple[str, float]]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    lines += [f"{name}{{{labels}}} {value}" if labels else f"{name} {value}" for labels, value in samples]
+    return lines
+
+http_requests = Counter("http_requests_total", "Requêtes HTTP traitées.", ("method", "route", "status"))
+http_latency = Histogram("http_request_duration_seconds", "Durée des requêtes HTTP.", ("method", "route"))
+db_connect_latency = Histogram("db_connect_duration_seconds", "Ouverture d'une connexion MySQL.", ("pool",))
+db_query_latency = Histogram("db_query_duration_seconds", "Durée des requêtes SQL.", ("route", "verb"))
+_in_flight = {"n": 0}
+
+# scope ASGI de la requête en cours : la route (gabarit de chemin) n'est connue qu'après le routage
+_request_scope: contextvars.ContextVar[dict | None] = contextvars.ContextVar("request_scope", default=None)
+
+def current_route() -> str:
+    scope = _request_scope.get()
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+_SQL_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_SQL_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SQL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_SPACE = re.compile(r"\s+")
+
+def sql_fingerprint(sql: str) -> str:
+    """Forme normalisée d'une requête : littéraux et paramètres -> ?, listes IN (?, ?...) -> (?+)."""
+    text = _SQL_STRING.sub("?", sql.replace("%s", "?"))
+    text = _SQL_NUMBER.sub("?", text)
+    text = _SQL_LIST.sub("(?+)", text)
+    return _SQL_SPACE.sub(" ", text).strip()
+
+# (route, fingerprint) -> {"route", "fingerprint", "count", "total_ms", "max_ms"}, au-delà de SLOW_QUERY_MS
+SLOW_QUERY_KEEP = int(os.getenv("SLOW_QUERY_KEEP", "500"))
+_slow_queries: dict[tuple, dict] = {}
+_slow_lock = threading.Lock()
+
+def _record_query(sql, started: float):
+    elapsed = time.perf_counter() - started
+    text = sql.decode() if isinstance(sql, bytes) else str(sql)
+    verb = text.lstrip().split(None, 1)[0].upper() if text.strip() else "?"
+    route = current_route()
+    db_query_latency.observe(elapsed, route, verb)
+    if elapsed * 1000 < SLOW_QUERY_MS:
+        return
+    fingerprint = sql_fingerprint(text)
+    key = (route, fingerprint)
+    with _slow_lock:
+        entry = _slow_queries.get(key)
+        if entry is None:
+            if len(_slow_queries) >= SLOW_QUERY_KEEP:  # on oublie la moins coûteuse
+                del _slow_queries[min(_slow_queries, key=lambda k: _slow_queries[k]["total_ms"])]
+            entry = _slow_queries[key] = {
+                "route": route, "fingerprint": fingerprint, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+            }
+        entry["count"] += 1
+        entry["total_ms"] += elapsed * 1000
+        entry["max_ms"] = max(entry["max_ms"], elapsed * 1000)
+    slow_query_log.warning("slow query %.1f ms route=%s sql=%s", elapsed * 1000, route, fingerprint)
+
+class _TimedCursor:
+    """Curseur MySQL dont execute/executemany sont chronométrés ; le reste est délégué."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, sql, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, params, *args, **kwargs)
+        finally:
+            _record_query(sql, started)
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq_params, *args, **kwargs)
+        finally:
+            _record_query(sql, started)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+class _TimedAsyncCursor(_TimedCursor):
+    async def execute(self, sql, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self._cursor.execute(sql, params, *args, **kwargs)
+        finally:
+            _record_query(sql, started)
+
+    async def executemany(self, sql, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self._cursor.executemany(sql, seq_params, *args, **kwargs)
+        finally:
+            _record_query(sql, started)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._cursor.close()
+
+class _TimedConnection:
+    """Connexion dont les curseurs sont instrumentés (les pools ne voient que cet enrobage)."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return _TimedCursor(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+class _TimedAsyncConnection(_TimedConnection):
+    async def cursor(self, *args, **kwargs):
+        return _TimedAsyncCursor(await self._conn.cursor(*args, **kwargs))
+
+def connect_instrumented():
+    started = time.perf_counter()
+    conn = mysql.connector.connect(**_db_config())
+    db_connect_latency.observe(time.perf_counter() - started, "sync")
+    return _TimedConnection(conn)
+
+async def connect_instrumented_async(**overrides):
+    started = time.perf_counter()
+    conn = await mysql.connector.aio.connect(**{**_db_config(), **overrides})
+    db_connect_latency.observe(time.perf_counter() - started, "replica" if overrides else "async")
+    return _TimedAsyncConnection(conn)
+
+class MetricsMiddleware:
+    """Latence et nombre de requêtes par route (gabarit, pas le chemin brut), requêtes en cours."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+        status_code = 500
+        token = _request_scope.set(scope)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        _in_flight["n"] += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _in_flight["n"] -= 1
+            route = current_route()
+            http_latency.observe(time.perf_counter() - started, scope["method"], route)
+            http_requests.inc(scope["method"], route, str(status_code))
+            _request_scope.reset(token)
+
+app.add_middleware(MetricsMiddleware)
+
+def _pool_gauges() -> list[str]:
+    lines = []
+    fields = {
+        "size": "Connexions ouvertes.", "idle": "Connexions au repos.",
+        "in_use": "Connexions empruntées.", "max_size": "Taille maximale du pool.",
+    }
+    pools = [("sync", _pool.snapshot() if _pool else None), ("async", _aio_pool.snapshot() if _aio_pool else None)]
+    pools += [(f"replica:{r.address}", r.pool.snapshot()) for r in replicas]
+    for field, help_text in fields.items():
+        lines += _gauge(f"db_pool_{field}", help_text, [(f'pool="{p}"', snap[field]) for p, snap in pools if snap])
+    for field in ("checkouts", "timeouts", "created", "invalidated"):
+        lines += [f"# TYPE db_pool_{field}_total counter"]
+        lines += [f'db_pool_{field}_total{{pool="{p}"}} {snap[field]}' for p, snap in pools if snap]
+    return lines
+
+@app.get("/metrics")
+async def metrics():
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    hash_capacity = HASH_WORKERS + HASH_QUEUE_LIMIT
+    lines = [
+        *http_requests.expose(),
+        *http_latency.expose(),
+        *_gauge("http_requests_in_flight", "Requêtes HTTP en cours.", [("", _in_flight["n"])]),
+        *db_connect_latency.expose(),
+        *db_query_latency.expose(),
+        *_pool_gauges(),
+        *_gauge("threadpool_busy", "Threads anyio occupés (routes sync).", [("", limiter.borrowed_tokens)]),
+        *_gauge("threadpool_size", "Threads anyio disponibles au total.", [("", limiter.total_tokens)]),
+        *_gauge("hash_pool_in_flight", "Hachages de mot de passe en cours ou en file.",
+                [("", hash_stats["in_flight"])]),
+        *_gauge("hash_pool_capacity", "Hachages acceptés avant de répondre 503.", [("", hash_capacity)]),
+        *_gauge("feed_subscribers", "Abonnés SSE de ce worker.", [("", feed_hub.stats["subscribers"])]),
+        *_gauge("intake_pending", "Candidatures journalisées pas encore insérées.", [("", intake.pending)]),
+        "# TYPE hash_pool_rejected_total counter",
+        f"hash_pool_rejected_total {hash_stats['rejected']}",
+    ]
+    return Response("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.get("/api/admin/slow-queries")
+def slow_queries(limit: int = 50, _: dict = Depends(require_admin)):
+    """Requêtes au-delà de SLOW_QUERY_MS, regroupées par route et fingerprint, les plus coûteuses d'abord."""
+    with _slow_lock:
+        entries = [dict(entry) for entry in _slow_queries.values()]
+    entries.sort(key=lambda e: e["total_ms"], reverse=True)
+    return {"threshold_ms": SLOW_QUERY_MS, "queries": entries[: max(1, min(500, limit))]}
+
 # --------------------------------------------------------------------
 # Health
 # --------------------------------------------------------------------
@@ -149,6 +1505,14 @@ def db_ping(db=Depends(get_db)):
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Ping failed: {e}")
 
+@app.get("/db/pool")
+async def db_pool_stats():
+    return {
+        "sync": _pool.snapshot() if _pool else None,
+        "async": _aio_pool.snapshot() if _aio_pool else None,
+        "replicas": [r.snapshot() for r in replicas],
+    }
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
@@ -158,49 +1522,363 @@ def health():
 # --------------------------------------------------------------------
 @app.post("/upload/image", status_code=201)
 def upload_image(file: UploadFile = File(...), current_user=Depends(require_user)):
-    raw = file.file.read(MAX_BYTES + 1)
-    if len(raw) > MAX_BYTES:
-        raise HTTPException(status_code=413, detail="File too large (max 2MB)")
-    kind = _validate_image_bytes(raw)
-    if kind not in ALLOWED_KINDS:
-        raise HTTPException(status_code=400, detail="Unsupported image (jpg/png/webp)")
-
-    ext = "jpg" if kind == "jpeg" else kind
-    name = _safe_image_name(prefix=str(current_user["id"]), ext=ext)
-    dest = UPLOAD_DIR / name
-    with open(dest, "wb") as f:
-        f.write(raw)
+    digest = hashlib.sha256()
+    size = 0
+    kind = None
+    tmp = tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, prefix=".upload_", delete=False)
+    try:
+        with tmp:
+            while chunk := file.file.read(UPLOAD_CHUNK):
+                if kind is None:
+                    kind = _validate_image_bytes(chunk[:UPLOAD_SNIFF_BYTES])
+                    if kind not in ALLOWED_KINDS:
+                        raise HTTPException(status_code=400, detail="Unsupported image (jpg/png/webp)")
+                size += len(chunk)
+                if size > MAX_BYTES:
+                    raise HTTPException(status_code=413, detail="File too large (max 8MB)")
+                digest.update(chunk)
+                tmp.write(chunk)
+        if kind is None:
+            raise HTTPException(status_code=400, detail="Unsupported image (jpg/png/webp)")
+
+        ext = "jpg" if kind == "jpeg" else kind
+        name = _content_image_name(digest.hexdigest(), ext)
+        dest = UPLOAD_DIR / name
+        if dest.exists():
+            os.utime(dest)  # repousse le balayage des fichiers dédupliqués
+        else:
+            os.replace(tmp.name, dest)
+    finally:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+    schedule_variants(dest)
 
     url = f"/uploads/{name}"
     return {"url": url}
 
+def sweep_uploads(cur, grace_seconds: float = UPLOAD_SWEEP_GRACE) -> list[str]:
+    """Supprime les fichiers d'uploads/ qui ne sont plus référencés par un profil ou une entreprise.
+
+    Les fichiers plus récents que grace_seconds sont gardés : ils viennent peut-être d'être
+    envoyés et pas encore enregistrés dans profiles.avatar_url / companies.banner_url.
+    """
+    cur.execute(
+        "SELECT avatar_url AS url FROM profiles WHERE avatar_url LIKE %s "
+        "UNION SELECT banner_url FROM companies WHERE banner_url LIKE %s",
+        ("%/uploads/%", "%/uploads/%"),
+    )
+    referenced = {Path(row[0] if not isinstance(row, dict) else row["url"]).name for row in cur.fetchall()}
+    cutoff = time.time() - grace_seconds
+    removed = []
+    for path in UPLOAD_DIR.iterdir():
+        if not path.is_file() or path.name in referenced:
+            continue
+        if path.stat().st_mtime > cutoff:
+            continue
+        path.unlink(missing_ok=True)
+        for variant in VARIANT_DIR.glob(f"{path.stem}_*"):
+            variant.unlink(missing_ok=True)
+        removed.append(path.name)
+    return removed
+
+@app.post("/api/admin/uploads/sweep")
+def sweep_uploads_endpoint(db=Depends(get_db), _: dict = Depends(require_admin)):
+    with db.cursor() as cur:
+        removed = sweep_uploads(cur)
+    return {"removed": removed}
+
+async def _sweep_uploads_periodically():
+    while True:
+        await asyncio.sleep(UPLOAD_SWEEP_INTERVAL)
+        try:
+            await asyncio.to_thread(_sweep_uploads_once)
+        except Exception:
+            pass
+
+def _sweep_uploads_once():
+    db = get_pool().acquire()
+    broken = False
+    try:
+        with db.cursor() as cur:
+            sweep_uploads(cur)
+        db.rollback()
+    except Error:
+        broken = True
+        raise
+    finally:
+        get_pool().release(db, broken=broken)
+
+@app.on_event("startup")
+async def _start_upload_sweeper():
+    if UPLOAD_SWEEP_INTERVAL > 0:
+        asyncio.get_running_loop().create_task(_sweep_uploads_periodically())
+
 # --------------------------------------------------------------------
-# Companies
+# Pagination
 # --------------------------------------------------------------------
-@app.get("/api/companies")
-def list_companies(db=Depends(get_db)):
+TOTAL_MODES = {"exact", "cached", "estimate", "none"}
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+_count_cache = TTLCache(maxsize=2048, ttl=COUNT_CACHE_TTL)
+
+def _encode_cursor(sort_at: datetime, row_id: int) -> str:
+    raw = json.dumps([sort_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
     try:
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                """
-                SELECT id, name, hq_city, description, website, banner_url
-                FROM companies
-                ORDER BY id DESC
-                LIMIT 50
-                """
-            )
-            rows = cur.fetchall()
-        return {"items": rows}
-    except Error as e:
-        raise HTTPException(status_code=500, detail=f"Query failed: {e}")
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-@app.post("/api/companies", status_code=201)
-def create_company(
-    payload: dict,
-    db=Depends(get_db),
-    _: dict = Depends(require_admin_or_recruiter),
-):
-    name = payload.get("name")
+def _keyset_clause(sort_expr: str, id_expr: str, cursor: str) -> tuple[str, list]:
+    """Condition « après le curseur » pour un tri (sort_expr DESC, id_expr DESC)."""
+    sort_at, row_id = _decode_cursor(cursor)
+    return f"({sort_expr} < %s OR ({sort_expr} = %s AND {id_expr} < %s))", [sort_at, sort_at, row_id]
+
+def _total_mode(total: str | None, cursor: str | None) -> str:
+    # compatibilité : total exact en pagination par offset, aucun total en mode curseur
+    mode = total or ("none" if cursor is not None else "exact")
+    if mode not in TOTAL_MODES:
+        raise HTTPException(status_code=400, detail=f"total must be one of {sorted(TOTAL_MODES)}")
+    return mode
+
+async def _listing_total(cur, mode: str, table: str, count_sql: str, params: list, filtered: bool):
+    """Total d'un listing : exact, mis en cache quelques secondes, estimé, ou absent."""
+    if mode == "none":
+        return None
+    if mode == "estimate" and not filtered:
+        await cur.execute(
+            "SELECT TABLE_ROWS AS total FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,),
+        )
+        row = await cur.fetchone()
+        if row and row["total"] is not None:
+            return int(row["total"])
+    key = (count_sql, tuple(params))
+    if mode != "exact":
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached
+    await cur.execute(count_sql, tuple(params))
+    total = (await cur.fetchone())["total"]
+    _count_cache.set(key, total)
+    return total
+
+def _page_result(rows: list, page_size: int, sort_key: str = "_sort_at") -> tuple[list, str | None]:
+    """Découpe les page_size+1 lignes lues et calcule le curseur de la page suivante."""
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = _encode_cursor(last[sort_key], last["id"])
+    if sort_key.startswith("_"):
+        for row in rows:
+            row.pop(sort_key, None)
+    return rows, next_cursor
+
+# --------------------------------------------------------------------
+# Lecture groupée (?ids=) et projection (?fields=)
+# --------------------------------------------------------------------
+MAX_BATCH_IDS = 100
+
+# champ exposé -> expression SQL ; seuls ces champs peuvent être demandés via fields=
+JOB_FIELDS = {
+    "id": "j.id", "company_id": "j.company_id", "title": "j.title", "short_desc": "j.short_desc",
+    "full_desc": "j.full_desc", "location": "j.location", "profile_sought": "j.profile_sought",
+    "contract_type": "j.contract_type", "work_mode": "j.work_mode", "salary_min": "j.salary_min",
+    "salary_max": "j.salary_max", "currency": "j.currency", "tags": "j.tags", "created_at": "j.created_at",
+    "company_name": "c.name", "company_website": "c.website", "company_banner_url": "c.banner_url",
+}
+COMPANY_FIELDS = {
+    name: f"co.{name}" for name in (
+        "id", "name", "hq_city", "sector", "description", "website", "social_links", "headcount",
+        "banner_url", "created_at",
+    )
+}
+# pas de téléphone ni de date de naissance : la fiche candidat est publique
+PROFILE_FIELDS = {
+    name: f"p.{name}" for name in (
+        "id", "user_id", "first_name", "last_name", "city", "diplomas", "experiences", "skills",
+        "languages", "qualities", "interests", "job_target", "motivation", "links", "avatar_url",
+        "created_at", "updated_at",
+    )
+}
+
+def parse_ids(ids: str) -> list[int]:
+    try:
+        values = list(dict.fromkeys(int(v) for v in split_list(ids)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not values or len(values) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"ids must contain between 1 and {MAX_BATCH_IDS} ids")
+    return values
+
+def select_fields(fields: str | None, allowed: dict[str, str], required: tuple[str, ...] = ("id",)) -> str:
+    """Liste SELECT réduite aux champs demandés (tous par défaut) ; les champs requis sont toujours lus."""
+    names = split_list(fields) or list(allowed)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    names = list(dict.fromkeys([*required, *names]))
+    return ", ".join(f"{allowed[name]} AS {name}" for name in names)
+
+def in_order(rows: list[dict], ids: list[int]) -> dict:
+    """Lignes dans l'ordre des ids demandés, et les ids introuvables."""
+    by_id = {row["id"]: row for row in rows}
+    return {"items": [by_id[i] for i in ids if i in by_id], "missing": [i for i in ids if i not in by_id]}
+
+# --------------------------------------------------------------------
+# Recherche plein texte (jobs)
+# --------------------------------------------------------------------
+JOBS_SEARCH_MODE = os.getenv("JOBS_SEARCH_MODE", "fulltext")  # "fulltext" | "like"
+
+FR_STOPWORDS = {
+    "a", "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "en", "et",
+    "il", "elle", "la", "le", "les", "leur", "l", "d", "ou", "par", "pour", "qui",
+    "que", "sa", "se", "ses", "son", "sur", "un", "une", "vous", "nous", "the",
+    "and", "of", "to", "in", "for", "with",
+}
+# suffixes retirés du plus long au plus court (texte déjà sans accents)
+FR_SUFFIXES = (
+    "issements", "issement", "atrices", "atrice", "ateurs", "ateur", "ations", "ation",
+    "ements", "ement", "ments", "ment", "euses", "euse", "eurs", "eur", "ites", "ite",
+    "ives", "ive", "ifs", "if", "ees", "ee", "er", "ez", "es", "e",
+)
+
+def fold_text(text: str) -> str:
+    """Minuscules sans accents : « Développeur » -> « developpeur »."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+def stem_fr(word: str) -> str:
+    """Racinisation française légère (pluriels + suffixes flexionnels courants)."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith("eaux"):
+        word = word[:-1]
+    elif word.endswith("aux"):
+        word = word[:-3] + "al"
+    elif word[-1] in "sx":
+        word = word[:-1]
+    for suffix in FR_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+    if len(word) > 3 and word[-1] == word[-2] and word[-1].isalpha():
+        word = word[:-1]  # developp -> develop
+    return word
+
+def analyze_text(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [stem_fr(t) for t in re.findall(r"\w+", fold_text(text)) if t not in FR_STOPWORDS]
+
+def _job_search_document(job: dict) -> str:
+    # le titre est répété pour peser plus lourd dans le score de pertinence
+    parts = [job.get("title"), job.get("title"), job.get("short_desc"), job.get("full_desc"),
+             job.get("tags"), job.get("company_name")]
+    return " ".join(t for part in parts for t in analyze_text(part))
+
+def _fulltext_query(q: str) -> str | None:
+    """Requête booléenne : tous les termes requis, préfixe sur le dernier (saisie en cours)."""
+    terms = analyze_text(q)
+    if not terms:
+        return None
+    return " ".join(f"+{t}" for t in terms[:-1]) + (" " if len(terms) > 1 else "") + f"+{terms[-1]}*"
+
+JOB_SEARCH_FIELDS = {"title", "short_desc", "full_desc", "tags", "company_id"}
+
+JOB_SEARCH_SOURCE_SQL = """
+    SELECT j.id, j.title, j.short_desc, j.full_desc, j.tags, c.name AS company_name
+    FROM jobs j
+    JOIN companies c ON c.id = j.company_id
+"""
+
+def index_jobs(cur, where_sql: str, params: tuple = ()) -> int:
+    """(Ré)indexe les jobs sélectionnés par where_sql dans job_search. Curseur synchrone."""
+    cur.execute(JOB_SEARCH_SOURCE_SQL + where_sql, params)
+    rows = cur.fetchall()
+    if rows and not isinstance(rows[0], dict):
+        cols = [d[0] for d in cur.description]
+        rows = [dict(zip(cols, r)) for r in rows]
+    docs = [(row["id"], _job_search_document(row)) for row in rows]
+    if docs:
+        cur.executemany(
+            "INSERT INTO job_search (job_id, document) VALUES (%s, %s) AS new "
+            "ON DUPLICATE KEY UPDATE document = new.document",
+            docs,
+        )
+    return len(docs)
+
+@app.post("/api/admin/search/reindex")
+def reindex_job_search(db=Depends(get_db), _: dict = Depends(require_admin)):
+    with db.cursor() as cur:
+        count = index_jobs(cur, "")
+    return {"indexed": count}
+
+# --------------------------------------------------------------------
+# Companies
+# --------------------------------------------------------------------
+# Requêtes des routes chaudes : constantes (gabarits .format pour les parties variables) reprises
+# telles quelles par scripts/explain_check.py, qui en vérifie les plans d'exécution.
+COMPANIES_PAGE_SQL = """
+    SELECT id, name, hq_city, description, website, banner_url
+    FROM companies
+    ORDER BY id DESC
+    LIMIT 50
+"""
+
+@app.get("/api/companies")
+async def list_companies(
+    request: Request,
+    ids: str | None = None,
+    fields: str | None = None,
+    format: str | None = None,
+):
+    columnar = check_row_format(format)
+    if ids is not None:
+        return await _companies_by_ids(request, parse_ids(ids), fields, columnar)
+
+    async def load():
+        try:
+            async with aio_read_connection() as db:
+                async with await db.cursor(dictionary=True) as cur:
+                    await cur.execute(COMPANIES_PAGE_SQL)
+                    rows = await cur.fetchall()
+            return shape_rows({"items": with_variants(rows, "banner_url")}, columnar), set()
+        except Error as e:
+            raise HTTPException(status_code=500, detail=f"Query failed: {e}")
+
+    key = "companies?columns" if columnar else "companies"
+    return await cached_response(request, key, {"companies"}, load)
+
+async def _companies_by_ids(request: Request, ids: list[int], fields: str | None, columnar: bool):
+    columns = select_fields(fields, COMPANY_FIELDS)
+
+    async def load():
+        async with aio_read_connection() as db:
+            async with await db.cursor(dictionary=True) as cur:
+                await cur.execute(
+                    f"SELECT {columns} FROM companies co WHERE co.id IN ({', '.join(['%s'] * len(ids))})",
+                    tuple(ids),
+                )
+                rows = await cur.fetchall()
+        return shape_rows(in_order(with_variants(rows, "banner_url"), ids), columnar), set()
+
+    key = "companies?" + urlencode(sorted(request.query_params.multi_items()))
+    return await cached_response(request, key, {f"company:{i}" for i in ids}, load)
+
+@app.post("/api/companies", status_code=201)
+def create_company(
+    payload: dict,
+    db=Depends(get_db),
+    _: dict = Depends(require_admin_or_recruiter),
+):
+    name = payload.get("name")
     if not name:
         raise HTTPException(status_code=400, detail="name is required")
     with db.cursor() as cur:
@@ -209,6 +1887,8 @@ def create_company(
             (name, payload.get("website"), payload.get("banner_url")),
         )
         new_id = cur.lastrowid
+    invalidate_responses(db, "companies")
+    suggest_update(db, [], company_suggestions({"name": name}))
     return {"id": new_id, **payload}
 
 @app.put("/api/companies/{company_id}", status_code=200)
@@ -231,10 +1911,18 @@ def update_company(
     set_clause = ", ".join(f"{k}=%s" for k in data.keys())
     values = list(data.values())
     try:
+        with db.cursor(dictionary=True) as cur:
+            cur.execute("SELECT name, hq_city FROM companies WHERE id=%s", (company_id,))
+            before = cur.fetchone()
         with db.cursor() as cur:
             cur.execute(f"UPDATE companies SET {set_clause} WHERE id=%s", (*values, company_id))
+            if cur.rowcount:
+                publish_events(db, cur, [("company.updated", None, company_id, {"id": company_id, **data})])
             if cur.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Company not found")
+            if "name" in data:
+                index_jobs(cur, "WHERE j.company_id = %s", (company_id,))
+        invalidate_responses(db, "companies", "jobs", f"company:{company_id}")
         with db.cursor(dictionary=True) as cur:
             cur.execute("""
                 SELECT id, name, hq_city, sector, description, website,
@@ -242,6 +1930,7 @@ def update_company(
                 FROM companies WHERE id=%s
             """, (company_id,))
             company = cur.fetchone()
+        suggest_update(db, company_suggestions(before), company_suggestions(company))
         return company
     except Error as e:
         raise HTTPException(status_code=500, detail=f"DB error: {e}")
@@ -252,41 +1941,158 @@ def delete_company(
     db=Depends(get_db),
     _: dict = Depends(require_admin_or_recruiter),
 ):
-    with db.cursor() as cur:
+    with db.cursor(dictionary=True) as cur:
+        cur.execute("SELECT name, hq_city FROM companies WHERE id=%s", (company_id,))
+        before = cur.fetchone()
+        # offres supprimées en cascade : leurs vecteurs de matching partent avec elles
+        cur.execute("SELECT id FROM jobs WHERE company_id=%s", (company_id,))
+        job_ids = [row["id"] for row in cur.fetchall()]
         cur.execute("DELETE FROM companies WHERE id=%s", (company_id,))
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Company not found")
+        forget_matches(cur, "job", job_ids)
+        publish_events(db, cur, [("company.deleted", None, company_id, {"id": company_id})])
+    invalidate_responses(db, "companies", "jobs", f"company:{company_id}")
+    after_commit(db, lambda: schedule_matches("job", job_ids))
+    suggest_update(db, company_suggestions(before), [])
     return Response(status_code=204)
 
 # --------------------------------------------------------------------
 # Jobs
 # --------------------------------------------------------------------
+JOB_SQL = """
+    SELECT {columns}
+    FROM jobs j
+    JOIN companies c ON c.id = j.company_id
+    WHERE j.id = %s
+"""
+
 @app.get("/api/jobs/{job_id}")
-def get_job(job_id: int, db=Depends(get_db)):
-    with db.cursor(dictionary=True) as cur:
-        cur.execute(
-            """
-            SELECT j.*,
-                   c.name AS company_name,
-                   c.website AS company_website,
-                   c.banner_url AS company_banner_url
-            FROM jobs j
-            JOIN companies c ON c.id = j.company_id
-            WHERE j.id = %s
-            """,
-            (job_id,),
-        )
-        row = cur.fetchone()
-    if not row:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return row
+async def get_job(job_id: int, request: Request, fields: str | None = None):
+    """Fiche d'une offre ; fields=title,short_desc,... limite les colonnes lues (id et company_id toujours)."""
+    columns = select_fields(fields, JOB_FIELDS, ("id", "company_id"))
+
+    async def load():
+        async with aio_read_connection() as db:
+            async with await db.cursor(dictionary=True) as cur:
+                await cur.execute(JOB_SQL.format(columns=columns), (job_id,))
+                row = await cur.fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return with_variants(row, "company_banner_url"), {f"company:{row['company_id']}"}
+
+    key = f"job:{job_id}" + (f"?fields={fields}" if fields else "")
+    return await cached_response(request, key, {f"job:{job_id}"}, load)
+
+async def _jobs_by_ids(request: Request, ids: list[int], fields: str | None, columnar: bool):
+    columns = select_fields(fields, JOB_FIELDS, ("id", "company_id"))
+
+    async def load():
+        async with aio_read_connection() as db:
+            async with await db.cursor(dictionary=True) as cur:
+                await cur.execute(
+                    f"""
+                    SELECT {columns}
+                    FROM jobs j
+                    JOIN companies c ON c.id = j.company_id
+                    WHERE j.id IN ({', '.join(['%s'] * len(ids))})
+                    """,
+                    tuple(ids),
+                )
+                rows = await cur.fetchall()
+        with_variants(rows, "company_banner_url")
+        return shape_rows(in_order(rows, ids), columnar), {f"company:{row['company_id']}" for row in rows}
+
+    key = "jobs?" + urlencode(sorted(request.query_params.multi_items()))
+    return await cached_response(request, key, {f"job:{i}" for i in ids}, load)
+
+JOBS_SEARCH_COUNT_SQL = """
+    SELECT COUNT(*) AS total
+    FROM job_search s
+    WHERE MATCH(s.document) AGAINST (%s IN BOOLEAN MODE)
+"""
+JOBS_SEARCH_SQL = """
+    SELECT j.id, j.title, j.short_desc, j.location,
+           j.contract_type, j.work_mode,
+           c.name AS company_name,
+           c.banner_url AS company_banner_url,
+           MATCH(s.document) AGAINST (%s IN BOOLEAN MODE) AS score
+    FROM job_search s
+    JOIN jobs j ON j.id = s.job_id
+    JOIN companies c ON c.id = j.company_id
+    WHERE MATCH(s.document) AGAINST (%s IN BOOLEAN MODE)
+    ORDER BY score DESC, j.created_at DESC, j.id DESC
+    LIMIT %s OFFSET %s
+"""
+
+async def _search_jobs(db, ft_query: str, page: int, page_size: int, total_mode: str):
+    """Recherche classée par pertinence sur l'index FULLTEXT de job_search."""
+    async with await db.cursor(dictionary=True) as cur:
+        total_count = await _listing_total(cur, total_mode, "job_search", JOBS_SEARCH_COUNT_SQL, [ft_query], True)
+        await cur.execute(JOBS_SEARCH_SQL, (ft_query, ft_query, page_size, (page - 1) * page_size))
+        items = with_variants(await cur.fetchall(), "company_banner_url")
+    return {"items": items, "page": page, "page_size": page_size, "total": total_count, "next_cursor": None}
 
 @app.get("/api/jobs")
-def list_jobs(q: str | None = None, page: int = 1, page_size: int = 10, db=Depends(get_db)):
+async def list_jobs(
+    request: Request,
+    q: str | None = None,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: str | None = None,
+    total: str | None = None,
+    mode: str | None = None,
+    ids: str | None = None,
+    fields: str | None = None,
+    format: str | None = None,
+):
+    """Listing paginé des offres, ou lecture groupée avec ids=1,2,3 (et fields= pour réduire les colonnes).
+
+    format=columns renvoie {"columns": [...], "rows": [[...], ...]} au lieu de items.
+    """
+    columnar = check_row_format(format)
+    if ids is not None:
+        return await _jobs_by_ids(request, parse_ids(ids), fields, columnar)
+
+    async def load():
+        async with aio_read_connection() as db:
+            return shape_rows(await _list_jobs(db, q, page, page_size, cursor, total, mode), columnar), set()
+
+    key = "jobs?" + urlencode(sorted(request.query_params.multi_items()))
+    return await cached_response(request, key, {"jobs"}, load)
+
+JOBS_COUNT_SQL = """
+    SELECT COUNT(*) AS total
+    FROM jobs j
+    JOIN companies c ON c.id = j.company_id
+    {where}
+"""
+JOBS_PAGE_SQL = """
+    SELECT j.id, j.title, j.short_desc, j.location,
+           j.contract_type, j.work_mode,
+           c.name AS company_name,
+           c.banner_url AS company_banner_url,
+           j.created_at AS _sort_at
+    FROM jobs j
+    JOIN companies c ON c.id = j.company_id
+    {where}
+    ORDER BY j.created_at DESC, j.id DESC
+    LIMIT %s OFFSET %s
+"""
+
+async def _list_jobs(db, q, page, page_size, cursor, total, mode):
     try:
         page = max(1, int(page))
         page_size = max(1, min(100, int(page_size)))
         offset = (page - 1) * page_size
+        total_mode = _total_mode(total, cursor)
+
+        if q and (mode or JOBS_SEARCH_MODE) == "fulltext":
+            ft_query = _fulltext_query(q)
+            if ft_query:
+                if cursor is not None:
+                    raise HTTPException(status_code=400, detail="cursor pagination is not available for ranked search")
+                return await _search_jobs(db, ft_query, page, page_size, total_mode)
 
         where = []
         params = []
@@ -295,36 +2101,29 @@ def list_jobs(q: str | None = None, page: int = 1, page_size: int = 10, db=Depen
             params += [f"%{q}%", f"%{q}%"]
         where_sql = "WHERE " + " AND ".join(where) if where else ""
 
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                f"""
-                SELECT COUNT(*) AS total
-                FROM jobs j
-                JOIN companies c ON c.id = j.company_id
-                {where_sql}
-                """,
-                tuple(params),
+        page_where, page_params = list(where), list(params)
+        if cursor:
+            clause, values = _keyset_clause("j.created_at", "j.id", cursor)
+            page_where.append(clause)
+            page_params += values
+        page_where_sql = "WHERE " + " AND ".join(page_where) if page_where else ""
+
+        async with await db.cursor(dictionary=True) as cur:
+            total_count = await _listing_total(
+                cur, total_mode, "jobs", JOBS_COUNT_SQL.format(where=where_sql), params, bool(where),
             )
-            total = cur.fetchone()["total"]
 
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                f"""
-                SELECT j.id, j.title, j.short_desc, j.location,
-                        j.contract_type, j.work_mode,
-                       c.name AS company_name,
-                       c.banner_url AS company_banner_url
-                FROM jobs j
-                JOIN companies c ON c.id = j.company_id
-                {where_sql}
-                ORDER BY j.created_at DESC, j.id DESC
-                LIMIT %s OFFSET %s
-                """,
-                tuple(params + [page_size, offset]),
+        async with await db.cursor(dictionary=True) as cur:
+            await cur.execute(
+                JOBS_PAGE_SQL.format(where=page_where_sql),
+                tuple(page_params + [page_size + 1, 0 if cursor is not None else offset]),
             )
-            items = cur.fetchall()
+            items, next_cursor = _page_result(await cur.fetchall(), page_size)
+        with_variants(items, "company_banner_url")
 
-        return {"items": items, "page": page, "page_size": page_size, "total": total}
+        if cursor is not None:
+            return {"items": items, "page_size": page_size, "total": total_count, "next_cursor": next_cursor}
+        return {"items": items, "page": page, "page_size": page_size, "total": total_count, "next_cursor": next_cursor}
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {e}")
 
@@ -332,7 +2131,7 @@ def list_jobs(q: str | None = None, page: int = 1, page_size: int = 10, db=Depen
 def create_job(
     payload: dict,
     db=Depends(get_db),
-    _: dict = Depends(require_admin_or_recruiter),
+    current_user: dict = Depends(require_admin_or_recruiter),
 ):
     company_id = payload.get("company_id")
     title = payload.get("title")
@@ -365,8 +2164,9 @@ def create_job(
                 """
                 INSERT INTO jobs
                     (company_id, title, short_desc, full_desc, location, profile_sought,
-                     contract_type, work_mode, salary_min, salary_max, currency, tags, created_at)
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s, NOW())
+                     contract_type, work_mode, salary_min, salary_max, currency, tags,
+                     created_by, created_at)
+                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s, NOW())
                 """,
                 (
                     company_id,
@@ -381,9 +2181,15 @@ def create_job(
                     salary_max,
                     currency,
                     tags,
+                    current_user["id"],
                 ),
             )
             new_id = cur.lastrowid
+            index_jobs(cur, "WHERE j.id = %s", (new_id,))
+            publish_events(db, cur, [("job.created", new_id, company_id, {"id": new_id, "title": title})])
+        invalidate_responses(db, "jobs")
+        after_commit(db, lambda: schedule_matches("job", [new_id]))
+        suggest_update(db, [], job_suggestions({"title": title, "location": location, "tags": tags}))
         return {
             "id": new_id,
             "company_id": company_id,
@@ -402,6 +2208,229 @@ def create_job(
     except Error as e:
         raise HTTPException(status_code=500, detail=f"DB error: {e}")
 
+# Import en masse (flux ATS) : NDJSON en streaming ou tableau JSON, par lots transactionnels.
+BULK_CHUNK = int(os.getenv("BULK_CHUNK", "500"))
+BULK_JOB_COLUMNS = (
+    "company_id", "title", "short_desc", "full_desc", "location", "profile_sought",
+    "contract_type", "work_mode", "salary_min", "salary_max", "currency", "tags", "external_ref",
+    "created_by",
+)
+BULK_UPSERT_SQL = f"""
+    INSERT INTO jobs ({", ".join(BULK_JOB_COLUMNS)}, created_at)
+    VALUES ({", ".join(["%s"] * len(BULK_JOB_COLUMNS))}, NOW()) AS new
+    ON DUPLICATE KEY UPDATE {", ".join(f"{c}=new.{c}" for c in BULK_JOB_COLUMNS if c not in ("company_id", "external_ref", "created_by"))}
+"""
+
+def _bulk_validate(index: int, item) -> dict | None:
+    if not isinstance(item, dict):
+        return {"index": index, "status": "error", "detail": "row must be a JSON object"}
+    if not item.get("company_id") or not item.get("title") or not item.get("short_desc"):
+        return {"index": index, "status": "error", "detail": "company_id, title and short_desc are required"}
+    try:
+        item["company_id"] = int(item["company_id"])
+    except (TypeError, ValueError):
+        return {"index": index, "status": "error", "detail": "company_id must be an integer"}
+    return None
+
+# erreurs propres à une ligne (valeur hors domaine, entreprise supprimée entre-temps) : la ligne est
+# écartée, le reste du lot passe ; toute autre erreur fait échouer le lot entier
+BULK_ROW_ERRORS = (mysql.connector.errors.DataError, mysql.connector.errors.IntegrityError)
+
+def _upsert_bulk_rows(cur, rows: list[tuple[int, dict]], results: dict) -> list[tuple[int, dict]]:
+    """executemany sous un savepoint ; si le lot est refusé, bissection pour isoler les lignes fautives.
+
+    Renvoie les lignes écrites, dans l'ordre du lot.
+    """
+    if not rows:
+        return []
+    cur.execute("SAVEPOINT bulk_rows")
+    try:
+        cur.executemany(BULK_UPSERT_SQL, [tuple(item.get(c) for c in BULK_JOB_COLUMNS) for _, item in rows])
+        return rows
+    except BULK_ROW_ERRORS as e:
+        cur.execute("ROLLBACK TO SAVEPOINT bulk_rows")
+        if len(rows) == 1:
+            index = rows[0][0]
+            results[index] = {"index": index, "status": "error", "detail": f"DB error: {e}"}
+            return []
+    middle = len(rows) // 2
+    return _upsert_bulk_rows(cur, rows[:middle], results) + _upsert_bulk_rows(cur, rows[middle:], results)
+
+def _ingest_jobs_chunk(chunk: list[tuple[int, dict]], known_companies: set[int]) -> list[dict]:
+    """Insère / met à jour un lot de jobs, son index de recherche et ses événements en une transaction.
+
+    Exécuté dans un thread.
+    """
+    results = {}
+    valid = []
+    for index, item in chunk:
+        error = _bulk_validate(index, item)
+        if error:
+            results[index] = error
+        else:
+            valid.append((index, item))
+
+    pool = get_pool()
+    db = pool.acquire()
+    broken = False
+    try:
+        with db.cursor() as cur:
+            # ids d'entreprises résolus en une requête ensembliste (mémorisés pour les lots suivants)
+            unknown = {item["company_id"] for _, item in valid} - known_companies
+            if unknown:
+                cur.execute(
+                    f"SELECT id FROM companies WHERE id IN ({', '.join(['%s'] * len(unknown))})",
+                    tuple(unknown),
+                )
+                known_companies.update(row[0] for row in cur.fetchall())
+            rows = []
+            for index, item in valid:
+                if item["company_id"] not in known_companies:
+                    results[index] = {"index": index, "status": "error", "detail": "Company not found"}
+                else:
+                    rows.append((index, item))
+
+            existing = _jobs_by_external_ref(
+                cur, {(item["company_id"], item["external_ref"]) for _, item in rows if item.get("external_ref")}
+            )
+            # sans external_ref, une clé de transit unique sert à relire l'id puis est effacée
+            # (même transaction : jamais visible des autres connexions)
+            staging = f"~bulk:{uuid.uuid4().hex}:"
+            staged = {index: f"{staging}{index}" for index, item in rows if not item.get("external_ref")}
+            rows = [(index, {**item, "external_ref": staged[index]} if index in staged else item)
+                    for index, item in rows]
+            rows = _upsert_bulk_rows(cur, rows, results)
+            ids = _jobs_by_external_ref(cur, {(item["company_id"], item["external_ref"]) for _, item in rows})
+            cleared = [ids[(item["company_id"], item["external_ref"])] for index, item in rows if index in staged]
+            if cleared:
+                # updated_at = updated_at : pas d'horodatage de modification pour ces créations
+                cur.execute(
+                    "UPDATE jobs SET external_ref = NULL, updated_at = updated_at "
+                    f"WHERE id IN ({', '.join(['%s'] * len(cleared))})",
+                    tuple(cleared),
+                )
+
+            # statut dans l'ordre du lot : une référence déjà vue (en base ou plus haut dans le lot) est une mise à jour
+            seen = set(existing)
+            for index, item in rows:
+                key = (item["company_id"], item["external_ref"])
+                status_ = "updated" if key in seen else "inserted"
+                seen.add(key)
+                results[index] = {"index": index, "status": status_, "id": ids[key]}
+
+            written = sorted({results[index]["id"] for index, _ in rows})
+            if written:
+                index_jobs(cur, f"WHERE j.id IN ({', '.join(['%s'] * len(written))})", tuple(written))
+            publish_events(None, cur, [
+                ("job.updated" if results[index]["status"] == "updated" else "job.created", results[index]["id"],
+                 item["company_id"], {"id": results[index]["id"], "title": item.get("title")})
+                for index, item in rows
+            ])
+            db.commit()
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            db.rollback()
+        except Error:
+            broken = True
+        raise
+    finally:
+        pool.release(db, broken=broken)
+    changed_ids = [r["id"] for r in results.values() if r.get("id")]
+    response_cache.invalidate("jobs", *(f"job:{i}" for i in changed_ids))
+    schedule_matches("job", changed_ids)
+    feed_hub.wake()
+    # nouvelles offres seulement : les mises à jour seront reprises au prochain rechargement
+    suggest_index.update([], [pair for index, item in chunk if results[index].get("status") == "inserted"
+                              for pair in job_suggestions(item)])
+    return [results[index] for index, _ in chunk]
+
+def _jobs_by_external_ref(cur, refs: set[tuple[int, str]]) -> dict[tuple[int, str], int]:
+    if not refs:
+        return {}
+    cur.execute(
+        "SELECT company_id, external_ref, id FROM jobs WHERE external_ref IN "
+        f"({', '.join(['%s'] * len(refs))})",
+        tuple({ref for _, ref in refs}),
+    )
+    return {(c, ref): job_id for c, ref, job_id in cur.fetchall() if (c, ref) in refs}
+
+async def _bulk_items(request: Request):
+    """Lignes du corps : NDJSON lu en flux (mémoire bornée) ou tableau JSON."""
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        buffer = b""
+        async for part in request.stream():
+            buffer += part
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="body must be a JSON array or NDJSON")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="body must be a JSON array or NDJSON")
+        for item in items:
+            yield item
+
+@app.post("/api/jobs/bulk")
+async def bulk_upsert_jobs(
+    request: Request,
+    report: str = "all",
+    current_user: dict = Depends(require_admin_or_recruiter),
+):
+    """Import massif : upsert par (company_id, external_ref), rapport ligne à ligne.
+
+    report=errors ne renvoie que les lignes en erreur.
+    """
+    known_companies: set[int] = set()
+    results: list[dict] = []
+    chunk: list[tuple[int, dict]] = []
+    index = 0
+
+    async def flush():
+        if chunk:
+            # les lots précédents sont commités : leur rapport accompagne l'erreur
+            try:
+                results.extend(await anyio.to_thread.run_sync(_ingest_jobs_chunk, list(chunk), known_companies))
+            except PoolTimeout as e:
+                raise HTTPException(status_code=503, detail={
+                    "message": f"DB pool exhausted: {e}", "failed_from": chunk[0][0],
+                    **_bulk_report(results, index, report),
+                }) from e
+            except Error as e:
+                raise HTTPException(status_code=500, detail={
+                    "message": f"DB error after {len(results)} rows: {e}", "failed_from": chunk[0][0],
+                    **_bulk_report(results, index, report),
+                })
+            chunk.clear()
+
+    async for raw in _bulk_items(request):
+        if isinstance(raw, bytes):
+            try:
+                raw = json.loads(raw)
+            except ValueError:
+                raw = None
+        if isinstance(raw, dict):
+            raw["created_by"] = current_user["id"]
+        chunk.append((index, raw))
+        index += 1
+        if len(chunk) >= BULK_CHUNK:
+            await flush()
+    await flush()
+    return _bulk_report(results, index, report)
+
+def _bulk_report(results: list[dict], received: int, report: str) -> dict:
+    counts = {status_: sum(1 for r in results if r["status"] == status_) for status_ in ("inserted", "updated", "error")}
+    summary = {"inserted": counts["inserted"], "updated": counts["updated"], "errors": counts["error"]}
+    rows = [r for r in results if r["status"] == "error"] if report == "errors" else results
+    return {"received": received, **summary, "results": rows}
+
 @app.patch("/api/jobs/{job_id}")
 def patch_job(
     job_id: int,
@@ -413,10 +2442,19 @@ def patch_job(
         raise HTTPException(status_code=400, detail="empty payload")
     cols, vals = zip(*payload.items())
     set_clause = ", ".join([f"{c}=%s" for c in cols])
-    with db.cursor() as cur:
+    with db.cursor(dictionary=True) as cur:
+        cur.execute("SELECT company_id, title, location, tags FROM jobs WHERE id=%s", (job_id,))
+        before = cur.fetchone()
         cur.execute(f"UPDATE jobs SET {set_clause} WHERE id=%s", (*vals, job_id))
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Job not found")
+        publish_events(db, cur, [("job.updated", job_id, before["company_id"], {"id": job_id, **payload})])
+        if JOB_SEARCH_FIELDS & set(cols):
+            index_jobs(cur, "WHERE j.id = %s", (job_id,))
+    invalidate_responses(db, "jobs", f"job:{job_id}")
+    if JOB_MATCH_FIELDS & set(cols):
+        after_commit(db, lambda: schedule_matches("job", [job_id]))
+    suggest_update(db, job_suggestions(before), job_suggestions({**before, **payload}))
     return {"id": job_id, **payload}
 
 @app.delete("/api/jobs/{job_id}", status_code=204)
@@ -425,70 +2463,207 @@ def delete_job(
     db=Depends(get_db),
     _: dict = Depends(require_admin_or_recruiter),
 ):
-    with db.cursor() as cur:
+    with db.cursor(dictionary=True) as cur:
+        cur.execute("SELECT company_id, title, location, tags FROM jobs WHERE id=%s", (job_id,))
+        before = cur.fetchone()
         cur.execute("DELETE FROM jobs WHERE id=%s", (job_id,))
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Job not found")
+        publish_events(db, cur, [("job.deleted", job_id, before["company_id"], {"id": job_id})])
+    invalidate_responses(db, "jobs", f"job:{job_id}")
+    after_commit(db, lambda: schedule_matches("job", [job_id]))
+    suggest_update(db, job_suggestions(before), [])
     return Response(status_code=204)
 
 # --------------------------------------------------------------------
 # Profiles
 # --------------------------------------------------------------------
+def normalize_term(term: str) -> str:
+    """Forme canonique d'une compétence / langue : « Node.js » et « node.JS » -> « node.js »."""
+    return " ".join(fold_text(term).split())
+
+def profile_terms(profile: dict) -> set[tuple[str, str]]:
+    terms = {("skill", normalize_term(v)) for v in split_list(profile.get("skills"))}
+    terms |= {("language", normalize_term(v)) for v in split_list(profile.get("languages"))}
+    return terms
+
+def index_profile_terms(cur, profile_id: int, before: dict | None, after: dict | None):
+    """Synchronise profile_terms (index compétences / langues exactes) pour un profil."""
+    old = profile_terms(before or {})
+    new = profile_terms(after or {})
+    removed = old - new
+    added = new - old
+    if removed:
+        cur.executemany(
+            "DELETE FROM profile_terms WHERE kind=%s AND term=%s AND profile_id=%s",
+            [(kind, term, profile_id) for kind, term in removed],
+        )
+    if added:
+        cur.executemany(
+            "INSERT IGNORE INTO profile_terms (kind, term, profile_id) VALUES (%s, %s, %s)",
+            [(kind, term, profile_id) for kind, term in added],
+        )
+
+@app.post("/api/admin/profiles/terms/rebuild")
+def rebuild_profile_terms(db=Depends(get_db), _: dict = Depends(require_admin)):
+    with db.cursor(dictionary=True) as cur:
+        cur.execute("SELECT id, skills, languages FROM profiles")
+        rows = cur.fetchall()
+        cur.execute("DELETE FROM profile_terms")
+        values = [(kind, term, row["id"]) for row in rows for kind, term in profile_terms(row)]
+        if values:
+            cur.executemany(
+                "INSERT IGNORE INTO profile_terms (kind, term, profile_id) VALUES (%s, %s, %s)",
+                values,
+            )
+    return {"profiles": len(rows), "terms": len(values)}
+
+def _terms_join(alias: str, kind: str, raw: str | None, match: str) -> tuple[str, list]:
+    """Jointure sur profile_terms : tous les termes (match=all) ou au moins un (match=any)."""
+    terms = list(dict.fromkeys(normalize_term(t) for t in split_list(raw)))
+    if not terms:
+        return "", []
+    having = " HAVING COUNT(*) = %s" if match == "all" else ""
+    sql = (
+        f"JOIN (SELECT profile_id, COUNT(*) AS matched FROM profile_terms "
+        f"WHERE kind = %s AND term IN ({', '.join(['%s'] * len(terms))}) "
+        f"GROUP BY profile_id{having}) {alias} ON {alias}.profile_id = p.id"
+    )
+    params = [kind, *terms] + ([len(terms)] if having else [])
+    return sql, params
+
+PROFILES_COUNT_SQL = """
+    SELECT COUNT(*) AS total
+    FROM profiles p
+    {join}
+    {where}
+"""
+PROFILES_PAGE_SQL = """
+    SELECT p.id, p.user_id, p.first_name, p.last_name, p.city, p.skills,
+           p.job_target, p.motivation, p.avatar_url,
+           {extra}p.sort_at AS _sort_at
+    FROM profiles p
+    {join}
+    {where}
+    ORDER BY {order}
+    LIMIT %s OFFSET %s
+"""
+PROFILES_ORDER = "p.sort_at DESC, p.id DESC"
+
 @app.get("/api/profiles")
-def list_profiles(
+async def list_profiles(
     q: str | None = None,
     city: str | None = None,
     skills: str | None = None,
+    languages: str | None = None,
+    match: str = "all",
+    rank: bool = False,
     page: int = 1,
     page_size: int = 10,
-    db=Depends(get_db),
+    cursor: str | None = None,
+    total: str | None = None,
+    ids: str | None = None,
+    fields: str | None = None,
+    format: str | None = None,
+    db=Depends(get_read_db_async),
 ):
+    """Recherche de candidats.
+
+    skills / languages / city acceptent des listes séparées par des virgules ;
+    match=all exige toutes les compétences et langues demandées, match=any au moins une.
+    rank=true trie par nombre de compétences demandées couvertes.
+    ids=1,2,3 (avec fields= éventuellement) lit directement ces profils.
+    format=columns renvoie {"columns": [...], "rows": [[...], ...]} au lieu de items.
+    """
+    columnar = check_row_format(format)
+    if ids is not None:
+        wanted = parse_ids(ids)
+        return FastJSONResponse(shape_rows(in_order(await _profiles_by_ids(db, wanted, fields), wanted), columnar))
     try:
         page = max(1, int(page))
         page_size = max(1, min(100, int(page_size)))
         offset = (page - 1) * page_size
+        total_mode = _total_mode(total, cursor)
+        if match not in ("all", "any"):
+            raise HTTPException(status_code=400, detail="match must be all or any")
+
+        joins, join_params = [], []
+        has_skill_join = False  # ms.matched n'existe que si la jointure sur les compétences est posée
+        for alias, kind, raw in (("ms", "skill", skills), ("ml", "language", languages)):
+            sql, values = _terms_join(alias, kind, raw, match)
+            if sql:
+                joins.append(sql)
+                join_params += values
+                has_skill_join = has_skill_join or alias == "ms"
+        rank = rank and has_skill_join
+        if rank and cursor is not None:
+            raise HTTPException(status_code=400, detail="cursor pagination is not available with rank")
+        join_sql = "\n".join(joins)
 
         where = []
         params: list = []
         if q:
             where.append("(p.first_name LIKE %s OR p.last_name LIKE %s)")
             params += [f"%{q}%", f"%{q}%"]
-        if city:
-            where.append("p.city = %s")
-            params.append(city)
-        if skills:
-            where.append("p.skills LIKE %s")
-            params.append(f"%{skills}%")
+        cities = split_list(city)
+        if cities:
+            where.append(f"p.city IN ({', '.join(['%s'] * len(cities))})")
+            params += cities
         where_sql = "WHERE " + " AND ".join(where) if where else ""
 
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                f"""
-                SELECT COUNT(*) AS total
-                FROM profiles p
-                {where_sql}
-                """,
-                tuple(params),
+        page_where, page_params = list(where), list(params)
+        if cursor:
+            clause, values = _keyset_clause("p.sort_at", "p.id", cursor)
+            page_where.append(clause)
+            page_params += values
+        page_where_sql = "WHERE " + " AND ".join(page_where) if page_where else ""
+        order_sql = "ms.matched DESC, " + PROFILES_ORDER if rank else PROFILES_ORDER
+
+        async with await db.cursor(dictionary=True) as cur:
+            total_count = await _listing_total(
+                cur, total_mode, "profiles", PROFILES_COUNT_SQL.format(join=join_sql, where=where_sql),
+                join_params + params, bool(where or joins),
             )
-            total = cur.fetchone()["total"]
 
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                f"""
-                SELECT p.id, p.user_id, p.first_name, p.last_name, p.city, p.skills, 
-                       p.job_target, p.motivation, p.avatar_url
-                FROM profiles p
-                {where_sql}
-                ORDER BY COALESCE(p.updated_at, p.created_at) DESC, p.id DESC
-                LIMIT %s OFFSET %s
-                """,
-                tuple(params + [page_size, offset]),
+        async with await db.cursor(dictionary=True) as cur:
+            await cur.execute(
+                PROFILES_PAGE_SQL.format(
+                    extra="ms.matched AS matched_skills, " if rank else "",
+                    join=join_sql, where=page_where_sql, order=order_sql,
+                ),
+                tuple(join_params + page_params + [page_size + 1, 0 if cursor is not None else offset]),
             )
-            items = cur.fetchall()
+            items, next_cursor = _page_result(await cur.fetchall(), page_size)
+        if rank:
+            next_cursor = None  # l'ordre par pertinence ne suit pas la clé du curseur
+        with_variants(items, "avatar_url")
+
+        result = {"items": items, "page": page, "page_size": page_size, "total": total_count, "next_cursor": next_cursor}
+        if cursor is not None:
+            del result["page"]
+        return FastJSONResponse(shape_rows(result, columnar))
+    except Error as e:
+        raise HTTPException(status_code=500, detail=f"Query failed: {e}")
 
-        return {"items": items, "page": page, "page_size": page_size, "total": total}
+async def _profiles_by_ids(db, ids: list[int], fields: str | None) -> list[dict]:
+    columns = select_fields(fields, PROFILE_FIELDS)
+    try:
+        async with await db.cursor(dictionary=True) as cur:
+            await cur.execute(
+                f"SELECT {columns} FROM profiles p WHERE p.id IN ({', '.join(['%s'] * len(ids))})",
+                tuple(ids),
+            )
+            rows = await cur.fetchall()
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {e}")
+    return with_variants(rows, "avatar_url")
+
+@app.get("/api/profiles/{profile_id}")
+async def get_profile(profile_id: int, fields: str | None = None, db=Depends(get_read_db_async)):
+    rows = await _profiles_by_ids(db, [profile_id], fields)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FastJSONResponse(rows[0])
 
 @app.post("/api/profiles", status_code=201)
 def create_profile(
@@ -516,6 +2691,10 @@ def create_profile(
                 (user_id, first_name, last_name, city, skills, avatar_url),
             )
             new_id = cur.lastrowid
+            update_profile_facets(db, cur, None, {"skills": skills})
+            index_profile_terms(cur, new_id, None, {"skills": skills})
+        after_commit(db, lambda: schedule_matches("profile", [new_id]))
+        suggest_update(db, [], profile_suggestions({"city": city, "skills": skills}))
         return {
             "id": new_id,
             "user_id": user_id,
@@ -538,7 +2717,10 @@ def update_profile(
     if not payload:
         raise HTTPException(status_code=400, detail="empty payload")
     with db.cursor(dictionary=True) as cur:
-        cur.execute("SELECT id, user_id FROM profiles WHERE id=%s", (profile_id,))
+        cur.execute(
+            "SELECT id, user_id, city, skills, languages, diplomas, experiences FROM profiles WHERE id=%s",
+            (profile_id,),
+        )
         prof = cur.fetchone()
     if not prof:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -575,6 +2757,11 @@ def update_profile(
                 (profile_id,),
             )
             updated = cur.fetchone()
+            update_profile_facets(db, cur, prof, updated)
+            index_profile_terms(cur, profile_id, prof, updated)
+        if PROFILE_MATCH_FIELDS & data.keys():
+            after_commit(db, lambda: schedule_matches("profile", [profile_id]))
+        suggest_update(db, profile_suggestions(prof), profile_suggestions(updated))
         return updated
     except Error as e:
         raise HTTPException(status_code=500, detail=f"DB error: {e}")
@@ -586,7 +2773,10 @@ def delete_profile(
     current_user=Depends(get_current_user),
 ):
     with db.cursor(dictionary=True) as cur:
-        cur.execute("SELECT id, user_id FROM profiles WHERE id=%s", (profile_id,))
+        cur.execute(
+            "SELECT id, user_id, city, skills, languages, diplomas, experiences FROM profiles WHERE id=%s",
+            (profile_id,),
+        )
         prof = cur.fetchone()
     if not prof:
         raise HTTPException(status_code=404, detail="Profile not found")
@@ -596,126 +2786,1682 @@ def delete_profile(
         cur.execute("DELETE FROM profiles WHERE id=%s", (profile_id,))
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Profile not found")
+        update_profile_facets(db, cur, prof, None)
+    after_commit(db, lambda: schedule_matches("profile", [profile_id]))
+    suggest_update(db, profile_suggestions(prof), [])
     return Response(status_code=204)
 
 
 # --------------------------------------------------------------------
 #Filtre pour les entreprises
 # --------------------------------------------------------------------
-@app.get("/api/candidate_filters")
-def get_candidate_filters(db=Depends(get_db)):
-    try:
-        with db.cursor(dictionary=True) as cur:
-            cur.execute("SELECT skills FROM profiles WHERE skills IS NOT NULL")
-            all_skills = [s.strip() for row in cur.fetchall() for s in row["skills"].split(",") if s.strip()]
-            skills = sorted(set(all_skills))
+# Index de facettes (profile_facets) : une ligne (facette, valeur) -> nombre de profils,
+# mis à jour par delta à chaque création / modification / suppression de profil.
+PROFILE_FACET_COLUMNS = ("skills", "languages", "diplomas", "experiences")
+FACET_VALUE_MAX = 191  # profile_facets.value VARCHAR(191)
+FACETS_CACHE_TTL = float(os.getenv("FACETS_CACHE_TTL", "60"))
+_facets_cache = TTLCache(maxsize=1, ttl=FACETS_CACHE_TTL)
 
-            cur.execute("SELECT DISTINCT diplomas FROM profiles WHERE diplomas IS NOT NULL")
-            degrees = [row["diplomas"] for row in cur.fetchall()]
+def split_list(text: str | None) -> list[str]:
+    """« JS, React,TS » -> ["JS", "React", "TS"] (sans doublons, ordre conservé)."""
+    if not text:
+        return []
+    seen = {}
+    for item in text.split(","):
+        item = item.strip()
+        if item and item.lower() not in seen:
+            seen[item.lower()] = item
+    return list(seen.values())
 
-            cur.execute("SELECT languages FROM profiles WHERE languages IS NOT NULL")
-            all_langs = [l.strip() for row in cur.fetchall() for l in row["languages"].split(",") if l.strip()]
-            languages = sorted(set(all_langs))
+def experience_years(text: str | None) -> int | None:
+    """Nombre d'années d'expérience lu dans le texte libre (« 2 ans dev front » -> 2)."""
+    if not text:
+        return None
+    match = re.search(r"(\d+)\s*an", text)
+    return int(match.group(1)) if match else None
 
-            cur.execute("SELECT DISTINCT experience_years FROM profiles WHERE experience_years IS NOT NULL ORDER BY experience_years")
-            experiences = [row["experience_years"] for row in cur.fetchall()]
+def profile_facets(profile: dict | None) -> set[tuple[str, str]]:
+    """Valeurs de facettes d'un profil, tronquées à la taille de la colonne.
 
-        return {
-            "skills": skills,
-            "degrees": degrees,
-            "languages": languages,
-            "experiences": experiences
-        }
+    Une valeur par clé de la collation (_ai_ci) : « SQL » et « sql » comptent une fois.
+    """
+    if not profile:
+        return set()
+    values = [("skill", v) for v in split_list(profile.get("skills"))]
+    values += [("language", v) for v in split_list(profile.get("languages"))]
+    if profile.get("diplomas"):
+        values.append(("diploma", profile["diplomas"].strip()))
+    years = experience_years(profile.get("experiences"))
+    if years is not None:
+        values.append(("experience", str(years)))
+    facets = {}
+    for facet, value in values:
+        value = value[:FACET_VALUE_MAX].rstrip()
+        facets.setdefault((facet, fold_text(value)), (facet, value))
+    return set(facets.values())
 
+def update_profile_facets(db, cur, before: dict | None, after: dict | None):
+    """Applique à profile_facets la différence entre l'ancienne et la nouvelle version d'un profil."""
+    old, new = profile_facets(before), profile_facets(after)
+    delta = [(f, v, 1) for f, v in new - old] + [(f, v, -1) for f, v in old - new]
+    if not delta:
+        return
+    cur.executemany(
+        "INSERT INTO profile_facets (facet, value, n) VALUES (%s, %s, %s) AS new "
+        "ON DUPLICATE KEY UPDATE n = profile_facets.n + new.n",
+        delta,
+    )
+    decremented = [(f, v) for f, v, d in delta if d < 0]
+    if decremented:
+        cur.executemany("DELETE FROM profile_facets WHERE facet=%s AND value=%s AND n <= 0", decremented)
+    after_commit(db, _facets_cache.clear)
+
+@app.post("/api/admin/facets/rebuild")
+def rebuild_profile_facets(db=Depends(get_db), _: dict = Depends(require_admin)):
+    counts: dict[tuple[str, str], int] = {}
+    with db.cursor(dictionary=True) as cur:
+        cur.execute(f"SELECT {', '.join(PROFILE_FACET_COLUMNS)} FROM profiles")
+        for row in cur.fetchall():
+            for key in profile_facets(row):
+                counts[key] = counts.get(key, 0) + 1
+        cur.execute("DELETE FROM profile_facets")
+        if counts:
+            # des valeurs distinctes ici peuvent être égales pour la collation : on les additionne
+            cur.executemany(
+                "INSERT INTO profile_facets (facet, value, n) VALUES (%s, %s, %s) AS new "
+                "ON DUPLICATE KEY UPDATE n = profile_facets.n + new.n",
+                [(f, v, n) for (f, v), n in counts.items()],
+            )
+    after_commit(db, _facets_cache.clear)
+    return {"values": len(counts)}
+
+PROFILE_FACETS_SQL = "SELECT facet, value, n FROM profile_facets WHERE n > 0"
+
+@app.get("/api/candidate_filters")
+async def get_candidate_filters(db=Depends(get_read_db_async)):
+    cached = _facets_cache.get("filters")
+    if cached is not None:
+        return cached
+    try:
+        async with await db.cursor(dictionary=True) as cur:
+            await cur.execute(PROFILE_FACETS_SQL)
+            rows = await cur.fetchall()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors du chargement des filtres : {e}")
 
+    counts: dict[str, dict] = {"skill": {}, "diploma": {}, "language": {}, "experience": {}}
+    for row in rows:
+        counts.setdefault(row["facet"], {})[row["value"]] = row["n"]
+    result = {
+        "skills": sorted(counts["skill"], key=str.lower),
+        "degrees": sorted(counts["diploma"], key=str.lower),
+        "languages": sorted(counts["language"], key=str.lower),
+        "experiences": sorted(int(v) for v in counts["experience"]),
+        "counts": {
+            "skills": counts["skill"],
+            "degrees": counts["diploma"],
+            "languages": counts["language"],
+            "experiences": counts["experience"],
+        },
+    }
+    _facets_cache.set("filters", result)
+    return result
+
+
+# --------------------------------------------------------------------
+# Matching candidats / offres
+# --------------------------------------------------------------------
+# Chaque offre et chaque profil devient un vecteur creux de termes pondérés (tf-idf, norme 1) rangé
+# dans match_terms. Le score d'un couple est le produit scalaire des deux vecteurs (cosinus) :
+# pour une ligne, le produit matrice creuse x vecteur contre tout l'autre côté est fait par MySQL
+# en agrégeant les postings de match_terms. Les top-k sont précalculés dans job_matches /
+# profile_matches et mis à jour en tâche de fond après chaque écriture.
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", "20"))
+MATCH_FANOUT = int(os.getenv("MATCH_FANOUT", "2000"))  # meilleurs vis-à-vis examinés pour les listes inverses
+MATCH_REFILL = int(os.getenv("MATCH_REFILL", "200"))
+MATCH_IDF_TTL = float(os.getenv("MATCH_IDF_TTL", "600"))
+JOB_MATCH_FIELDS = {"title", "tags", "profile_sought"}
+PROFILE_MATCH_FIELDS = {"skills", "job_target"}
+
+def job_match_terms(job: dict) -> dict[tuple[str, str], float]:
+    terms = {("skill", normalize_term(t)): 1.0 for t in split_list(job.get("tags"))}
+    for token in analyze_text(job.get("title")):
+        terms.setdefault(("role", token), 0.5)
+    for token in analyze_text(job.get("profile_sought")):
+        terms.setdefault(("role", token), 0.25)
+    return terms
+
+def profile_match_terms(profile: dict) -> dict[tuple[str, str], float]:
+    terms = {("skill", normalize_term(t)): 1.0 for t in split_list(profile.get("skills"))}
+    for token in analyze_text(profile.get("job_target")):
+        terms.setdefault(("role", token), 0.5)
+    return terms
+
+# côté -> table source, colonnes lues, vectorisation, table des top-k (propriétaire, vis-à-vis)
+MATCH_SIDES = {
+    "job": {"table": "jobs", "columns": "id, title, tags, profile_sought", "terms": job_match_terms,
+            "top": ("job_matches", "job_id", "profile_id"), "other": "profile"},
+    "profile": {"table": "profiles", "columns": "id, skills, job_target", "terms": profile_match_terms,
+                "top": ("profile_matches", "profile_id", "job_id"), "other": "job"},
+}
+_idf_cache = TTLCache(maxsize=4, ttl=MATCH_IDF_TTL)
+
+def _idf(cur, side: str) -> tuple[int, dict]:
+    cached = _idf_cache.get(side)
+    if cached is None:
+        cur.execute(f"SELECT COUNT(*) FROM {MATCH_SIDES[side]['table']}")
+        n = cur.fetchone()[0]
+        cur.execute("SELECT kind, term, COUNT(*) FROM match_terms WHERE side=%s GROUP BY kind, term", (side,))
+        cached = (n, {(kind, term): df for kind, term, df in cur.fetchall()})
+        _idf_cache.set(side, cached)
+    return cached
+
+def weigh(raw: dict, idf: tuple[int, dict]) -> dict[tuple[str, str], float]:
+    """tf x idf puis normalisation L2 : le produit scalaire de deux vecteurs est leur cosinus."""
+    n, df = idf
+    vector = {t: w * math.log(1 + (n + 1) / (df.get(t, 0) + 1)) for t, w in raw.items() if len(t[1]) <= 100}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {t: w / norm for t, w in vector.items()} if norm else {}
+
+def _store_terms(cur, side: str, entity_id: int, vector: dict):
+    cur.execute("DELETE FROM match_terms WHERE side=%s AND entity_id=%s", (side, entity_id))
+    if vector:
+        cur.executemany(
+            "INSERT INTO match_terms (side, kind, term, entity_id, weight) VALUES (%s, %s, %s, %s, %s)",
+            [(side, kind, term, entity_id, w) for (kind, term), w in vector.items()],
+        )
+
+def _stored_vector(cur, side: str, entity_id: int) -> dict:
+    cur.execute("SELECT kind, term, weight FROM match_terms WHERE side=%s AND entity_id=%s", (side, entity_id))
+    return {(kind, term): w for kind, term, w in cur.fetchall()}
+
+def match_scores_query(vector: dict, against: str, limit: int) -> tuple[str, tuple]:
+    """Produit creux vecteur x (tous les vecteurs du côté `against`), meilleurs scores d'abord.
+
+    La jointure sur la table source écarte les termes d'une ligne supprimée pas encore nettoyés :
+    sans elle, l'id partirait dans job_matches / profile_matches et violerait leur clé étrangère.
+    """
+    sql = f"""
+        SELECT m.entity_id, SUM(m.weight * q.w) AS score
+        FROM (VALUES {", ".join(["ROW(%s, %s, %s)"] * len(vector))}) AS q (kind, term, w)
+        JOIN match_terms m ON m.side = %s AND m.kind = q.kind AND m.term = q.term
+        JOIN {MATCH_SIDES[against]["table"]} e ON e.id = m.entity_id
+        GROUP BY m.entity_id
+        ORDER BY score DESC, m.entity_id
+        LIMIT %s
+    """
+    return sql, (*(v for (kind, term), w in vector.items() for v in (kind, term, w)), against, limit)
+
+def match_scores(cur, vector: dict, against: str, limit: int) -> list[tuple[int, float]]:
+    if not vector:
+        return []
+    cur.execute(*match_scores_query(vector, against, limit))
+    return [(entity_id, float(score)) for entity_id, score in cur.fetchall()]
+
+def forget_matches(cur, side: str, ids: list[int]):
+    """Termes des lignes supprimées en cascade (match_terms n'a pas de clé étrangère vers elles)."""
+    if ids:
+        cur.execute(
+            f"DELETE FROM match_terms WHERE side=%s AND entity_id IN ({', '.join(['%s'] * len(ids))})",
+            (side, *ids),
+        )
+
+def _store_top(cur, side: str, entity_id: int, scores: list[tuple[int, float]]):
+    table, owner, item = MATCH_SIDES[side]["top"]
+    cur.execute(f"DELETE FROM {table} WHERE {owner}=%s", (entity_id,))
+    if scores:
+        cur.executemany(
+            f"INSERT INTO {table} ({owner}, {item}, score) VALUES (%s, %s, %s)",
+            [(entity_id, other_id, score) for other_id, score in scores],
+        )
+
+def _propagate(cur, side: str, entity_id: int, scores: list[tuple[int, float]]):
+    """Replace entity_id dans les top-k du côté opposé où son nouveau score le fait entrer."""
+    other = MATCH_SIDES[side]["other"]
+    table, owner, item = MATCH_SIDES[other]["top"]
+    cur.execute(f"SELECT {owner} FROM {table} WHERE {item}=%s", (entity_id,))
+    previous = {row[0] for row in cur.fetchall()}
+    cur.execute(f"DELETE FROM {table} WHERE {item}=%s", (entity_id,))
+    floors = {}
+    if scores:
+        cur.execute(
+            f"SELECT {owner}, COUNT(*), MIN(score) FROM {table} "
+            f"WHERE {owner} IN ({', '.join(['%s'] * len(scores))}) GROUP BY {owner}",
+            tuple(other_id for other_id, _ in scores),
+        )
+        floors = {row[0]: (row[1], row[2]) for row in cur.fetchall()}
+    entering = [
+        (other_id, score) for other_id, score in scores
+        if floors.get(other_id, (0, 0))[0] < MATCH_TOP_K or score > floors[other_id][1]
+    ]
+    if entering:
+        cur.executemany(
+            f"INSERT INTO {table} ({owner}, {item}, score) VALUES (%s, %s, %s)",
+            [(other_id, entity_id, score) for other_id, score in entering],
+        )
+        full = [other_id for other_id, _ in entering if floors.get(other_id, (0, 0))[0] >= MATCH_TOP_K]
+        for other_id in full:  # une entrée de trop : on retire la plus faible
+            cur.execute(f"DELETE FROM {table} WHERE {owner}=%s ORDER BY score, {item} LIMIT 1", (other_id,))
+    # les listes qui ont perdu entity_id sont recalculées (dans la limite de MATCH_REFILL)
+    lost = sorted(previous - {other_id for other_id, _ in entering})[:MATCH_REFILL]
+    for other_id in lost:
+        _store_top(cur, other, other_id, match_scores(cur, _stored_vector(cur, other, other_id), side, MATCH_TOP_K))
+
+def refresh_matches(cur, side: str, entity_id: int):
+    """Revectorise une offre ou un profil et met à jour ses top-k et ceux du côté opposé."""
+    conf = MATCH_SIDES[side]
+    cur.execute(f"SELECT {conf['columns']} FROM {conf['table']} WHERE id=%s", (entity_id,))
+    columns = [d[0] for d in cur.description]
+    row = cur.fetchone()
+    if row is None:  # supprimé : les couples sont partis en cascade, restent ses termes
+        cur.execute("DELETE FROM match_terms WHERE side=%s AND entity_id=%s", (side, entity_id))
+        return
+    vector = weigh(conf["terms"](dict(zip(columns, row))), _idf(cur, side))
+    _store_terms(cur, side, entity_id, vector)
+    scores = match_scores(cur, vector, conf["other"], MATCH_FANOUT)
+    _store_top(cur, side, entity_id, scores[:MATCH_TOP_K])
+    _propagate(cur, side, entity_id, scores)
+
+# Une seule tâche de fond : les mises à jour des listes inverses ne se marchent pas dessus,
+# et un même (côté, id) modifié plusieurs fois avant traitement n'est recalculé qu'une fois.
+_match_executor: ThreadPoolExecutor | None = None
+_match_pending: set[tuple[str, int]] = set()
+_match_lock = threading.Lock()
+match_log = logging.getLogger("jobboard.matching")
+
+def schedule_matches(side: str, ids):
+    global _match_executor
+    with _match_lock:
+        fresh = [(side, i) for i in dict.fromkeys(ids) if (side, i) not in _match_pending]
+        _match_pending.update(fresh)
+        if _match_executor is None:
+            _match_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="matching")
+    for key in fresh:
+        _match_executor.submit(_refresh_matches_task, *key)
+
+def _refresh_matches_task(side: str, entity_id: int):
+    with _match_lock:
+        _match_pending.discard((side, entity_id))
+    pool = get_pool()
+    db = pool.acquire()
+    broken = False
+    try:
+        with db.cursor() as cur:
+            refresh_matches(cur, side, entity_id)
+        db.commit()
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            db.rollback()
+        except Error:
+            broken = True
+        match_log.exception("refresh %s %s failed", side, entity_id)
+    finally:
+        pool.release(db, broken=broken)
+
+def _iter_rows(cur, conf: dict, batch: int = 1000):
+    """Lignes source par paquets (pagination sur l'id), sans tout charger en mémoire."""
+    last_id = 0
+    while True:
+        cur.execute(
+            f"SELECT {conf['columns']} FROM {conf['table']} WHERE id > %s ORDER BY id LIMIT %s",
+            (last_id, batch),
+        )
+        columns = [d[0] for d in cur.description]
+        rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]["id"]
+
+def rebuild_matches(cur, db):
+    """Recalcul complet : idf à jour, vecteurs de toutes les lignes, puis top-k de chaque ligne."""
+    for side, conf in MATCH_SIDES.items():
+        n, df = 0, {}
+        for rows in _iter_rows(cur, conf):
+            for row in rows:
+                n += 1
+                for term in conf["terms"](row):
+                    df[term] = df.get(term, 0) + 1
+        _idf_cache.set(side, (n, df))
+        cur.execute("DELETE FROM match_terms WHERE side=%s", (side,))
+        for rows in _iter_rows(cur, conf):
+            for row in rows:
+                _store_terms(cur, side, row["id"], weigh(conf["terms"](row), (n, df)))
+            db.commit()
+    for side, conf in MATCH_SIDES.items():
+        for rows in _iter_rows(cur, conf):
+            for row in rows:
+                vector = _stored_vector(cur, side, row["id"])
+                _store_top(cur, side, row["id"], match_scores(cur, vector, conf["other"], MATCH_TOP_K))
+            db.commit()
+
+def _rebuild_matches_task():
+    pool = get_pool()
+    db = pool.acquire()
+    broken = False
+    try:
+        with db.cursor() as cur:
+            rebuild_matches(cur, db)
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        match_log.exception("matches rebuild failed")
+    finally:
+        pool.release(db, broken=broken)
+
+@app.post("/api/admin/matches/rebuild", status_code=202)
+def rebuild_matches_endpoint(_: dict = Depends(require_admin)):
+    """Long sur une grosse base : lancé dans la tâche de fond du matching."""
+    global _match_executor
+    with _match_lock:
+        if _match_executor is None:
+            _match_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="matching")
+    _match_executor.submit(_rebuild_matches_task)
+    return {"scheduled": True}
+
+@app.on_event("shutdown")
+def _stop_match_worker():
+    if _match_executor is not None:
+        _match_executor.shutdown(wait=False, cancel_futures=True)
+
+JOB_MATCHES_SQL = """
+    SELECT p.id, p.first_name, p.last_name, p.city, p.job_target, p.skills, p.avatar_url, m.score
+    FROM job_matches m
+    JOIN profiles p ON p.id = m.profile_id
+    WHERE m.job_id = %s
+    ORDER BY m.score DESC, m.profile_id
+    LIMIT %s
+"""
+
+@app.get("/api/jobs/{job_id}/matches")
+async def job_matches(
+    job_id: int,
+    limit: int = MATCH_TOP_K,
+    db=Depends(get_read_db_async),
+    current_user: dict = Depends(require_admin_or_recruiter),
+):
+    """Meilleurs candidats pour une offre (liste précalculée)."""
+    owned_sql, owned_params = _owned_jobs_clause(current_user)
+    async with await db.cursor(dictionary=True) as cur:
+        await cur.execute(f"SELECT 1 FROM jobs j WHERE j.id = %s AND {owned_sql}", (job_id, *owned_params))
+        if not await cur.fetchone():
+            raise HTTPException(status_code=404, detail="Job not found")
+        await cur.execute(JOB_MATCHES_SQL, (job_id, max(1, min(MATCH_TOP_K, int(limit)))))
+        items = await cur.fetchall()
+    return {"job_id": job_id, "items": with_variants(items, "avatar_url")}
+
+@app.get("/api/profiles/{profile_id}/matches")
+async def profile_matches(
+    profile_id: int,
+    limit: int = MATCH_TOP_K,
+    db=Depends(get_read_db_async),
+    current_user: dict = Depends(require_user),
+):
+    """Offres les plus proches d'un profil : pour son propriétaire, un recruteur ou un admin."""
+    async with await db.cursor(dictionary=True) as cur:
+        await cur.execute("SELECT user_id FROM profiles WHERE id = %s", (profile_id,))
+        prof = await cur.fetchone()
+        if not prof:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        if current_user["role"] == "user" and prof["user_id"] != current_user["id"]:
+            raise HTTPException(status_code=403, detail="Not allowed to see these matches")
+        await cur.execute(
+            """
+            SELECT j.id, j.title, j.short_desc, j.location, j.contract_type, j.work_mode,
+                   c.name AS company_name, c.banner_url AS company_banner_url, m.score
+            FROM profile_matches m
+            JOIN jobs j ON j.id = m.job_id
+            JOIN companies c ON c.id = j.company_id
+            WHERE m.profile_id = %s
+            ORDER BY m.score DESC, m.job_id
+            LIMIT %s
+            """,
+            (profile_id, max(1, min(MATCH_TOP_K, int(limit)))),
+        )
+        items = await cur.fetchall()
+    return {"profile_id": profile_id, "items": with_variants(items, "company_banner_url")}
+
+# --------------------------------------------------------------------
+# Suggestions (saisie semi-automatique)
+# --------------------------------------------------------------------
+SUGGEST_KINDS = ("title", "company", "city", "skill")
+SUGGEST_TOP = 50  # résultats gardés par préfixe ; limit= pioche dedans
+SUGGEST_MEMO_SIZE = int(os.getenv("SUGGEST_MEMO_SIZE", "4096"))  # préfixes dont le top est mémorisé
+SUGGEST_RELOAD_INTERVAL = float(os.getenv("SUGGEST_RELOAD_INTERVAL", "3600"))
+suggest_log = logging.getLogger("jobboard.suggest")
+
+class SuggestIndex:
+    """Index de préfixes en mémoire : tableau trié de clés (bisect) + top par préfixe mémorisé.
+
+    Chaque libellé (« Développeur Python ») est indexé à chaque début de mot, sans accents
+    (« developpeur python », « python ») ; son poids est son nombre d'occurrences (offres,
+    profils, entreprises). Les écritures appliquent des deltas ; seuls les préfixes des clés
+    touchées sont retirés du cache des tops (LRU borné : q vient du client).
+
+    Le tableau trié est copié à chaque écriture plutôt que modifié sur place : une recherche
+    parcourt l'instantané qu'elle a pris, hors verrou, sans bloquer les autres requêtes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: list[tuple[str, int]] = []  # (clé repliée, id d'entrée), trié
+        self._entries: dict[int, list] = {}     # id -> [kind, libellé, poids]
+        self._ids: dict[tuple[str, str], int] = {}
+        self._top = TTLCache(maxsize=SUGGEST_MEMO_SIZE, ttl=SUGGEST_RELOAD_INTERVAL)  # préfixe -> ids
+        self._generation = 0  # incrémentée à chaque écriture : un top calculé avant n'est pas mémorisé
+        self._next_id = 0
+        self.loaded = False
+
+    @staticmethod
+    def _fold(label: str) -> str:
+        return " ".join(re.findall(r"\w+", fold_text(label)))
+
+    @classmethod
+    def _label_keys(cls, label: str) -> list[str]:
+        words = cls._fold(label).split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def _apply(self, kind: str, label: str, delta: int):
+        folded = self._fold(label)
+        if not folded:
+            return
+        entry_id = self._ids.get((kind, folded))
+        if entry_id is None:
+            if delta <= 0:
+                return
+            entry_id = self._ids[(kind, folded)] = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = [kind, label.strip(), 0]
+            for key in self._label_keys(label):
+                bisect.insort(self._keys, (key, entry_id))
+        entry = self._entries[entry_id]
+        entry[2] += delta
+        if entry[2] <= 0:
+            for key in self._label_keys(entry[1]):
+                index = bisect.bisect_left(self._keys, (key, entry_id))
+                if index < len(self._keys) and self._keys[index] == (key, entry_id):
+                    del self._keys[index]
+            del self._entries[entry_id], self._ids[(kind, folded)]
+        for key in self._label_keys(label):
+            for i in range(1, len(key) + 1):
+                self._top.pop(key[:i], None)
+
+    def update(self, before: list[tuple[str, str]], after: list[tuple[str, str]]):
+        """Retire les libellés de l'ancienne version d'une ligne et ajoute ceux de la nouvelle."""
+        with self._lock:
+            self._keys = list(self._keys)
+            self._generation += 1
+            for kind, label in before:
+                if label:
+                    self._apply(kind, label, -1)
+            for kind, label in after:
+                if label:
+                    self._apply(kind, label, 1)
+
+    def replace(self, counts: dict[tuple[str, str], int]):
+        fresh = SuggestIndex()
+        for (kind, label), n in counts.items():
+            fresh._apply(kind, label, n)
+        with self._lock:
+            self._keys, self._entries, self._ids = fresh._keys, fresh._entries, fresh._ids
+            self._next_id = fresh._next_id
+            self._generation += 1
+            self._top.clear()
+            self.loaded = True
+
+    def search(self, q: str, limit: int = 5, kinds: set[str] | None = None) -> list[dict]:
+        prefix = self._fold(q)
+        if not prefix:
+            return []
+        with self._lock:
+            keys, entries, generation = self._keys, self._entries, self._generation
+        top = self._top.get(prefix)
+        if top is None:
+            seen = set()
+            for i in range(bisect.bisect_left(keys, (prefix, -1)), len(keys)):
+                key, entry_id = keys[i]
+                if not key.startswith(prefix):
+                    break
+                if entry_id in entries:
+                    seen.add(entry_id)
+            top = heapq.nlargest(SUGGEST_TOP, seen, key=lambda e: (entries.get(e, ("", "", 0))[2], -e))
+            with self._lock:
+                if self._generation == generation:
+                    self._top.set(prefix, top)
+        results = []
+        for entry_id in top:
+            entry = entries.get(entry_id)
+            if entry is None:
+                continue  # retiré par une écriture concurrente
+            kind, label, weight = entry
+            if kinds is None or kind in kinds:
+                results.append({"label": label, "kind": kind, "weight": weight})
+                if len(results) == limit:
+                    break
+        return results
+
+suggest_index = SuggestIndex()
+
+def job_suggestions(job: dict | None) -> list[tuple[str, str]]:
+    if not job:
+        return []
+    return [("title", job.get("title")), ("city", job.get("location"))] + \
+        [("skill", tag) for tag in split_list(job.get("tags"))]
+
+def company_suggestions(company: dict | None) -> list[tuple[str, str]]:
+    if not company:
+        return []
+    return [("company", company.get("name")), ("city", company.get("hq_city"))]
+
+def profile_suggestions(profile: dict | None) -> list[tuple[str, str]]:
+    if not profile:
+        return []
+    return [("city", profile.get("city"))] + [("skill", s) for s in split_list(profile.get("skills"))]
+
+def suggest_update(db, before: list, after: list):
+    """Mise à jour de l'index de suggestions une fois la transaction commitée."""
+    if before != after:
+        after_commit(db, lambda: suggest_index.update(before, after))
+
+def load_suggestions():
+    """Comptage complet (offres, entreprises, profils) puis remplacement atomique de l'index."""
+    counts: dict[tuple[str, str], int] = {}
+
+    def count(pairs, n: int = 1):
+        for kind, label in pairs:
+            if label:
+                key = (kind, label.strip())
+                counts[key] = counts.get(key, 0) + n
+
+    pool = get_pool()
+    db = pool.acquire()
+    broken = False
+    try:
+        with db.cursor() as cur:
+            for rows in _iter_rows(cur, {"table": "jobs", "columns": "id, title, location, tags"}):
+                for row in rows:
+                    count(job_suggestions(row))
+            for rows in _iter_rows(cur, {"table": "companies", "columns": "id, name, hq_city"}):
+                for row in rows:
+                    count(company_suggestions(row))
+            for rows in _iter_rows(cur, {"table": "profiles", "columns": "id, city, skills"}):
+                for row in rows:
+                    count(profile_suggestions(row))
+        db.rollback()
+    except Error:
+        broken = True
+        raise
+    finally:
+        pool.release(db, broken=broken)
+    suggest_index.replace(counts)
+
+async def _reload_suggestions_periodically():
+    while True:
+        try:
+            await asyncio.to_thread(load_suggestions)
+        except Exception:
+            suggest_log.exception("suggestions reload failed")
+        await asyncio.sleep(SUGGEST_RELOAD_INTERVAL)
+
+@app.on_event("startup")
+async def _start_suggestions():
+    asyncio.get_running_loop().create_task(_reload_suggestions_periodically())
+
+@app.get("/api/suggest")
+async def suggest(q: str = "", limit: int = 5, kinds: str | None = None):
+    """Suggestions pour la barre de recherche, servies depuis la mémoire (aucune requête SQL)."""
+    wanted = set(split_list(kinds)) or None
+    if wanted and not wanted <= set(SUGGEST_KINDS):
+        raise HTTPException(status_code=400, detail=f"kinds must be among {list(SUGGEST_KINDS)}")
+    return {"items": suggest_index.search(q, max(1, min(20, limit)), wanted), "ready": suggest_index.loaded}
 
 # --------------------------------------------------------------------
 # Applications
 # --------------------------------------------------------------------
+APPLICATIONS_COUNT_SQL = "SELECT COUNT(*) AS total FROM applications a WHERE a.job_id = %s"
+APPLICATIONS_PAGE_SQL = """
+    SELECT a.id, a.user_id, COALESCE(u.email, a.email) AS candidate_email,
+           a.phone, a.message, a.cv_url, a.status, a.created_at
+    FROM applications a
+    LEFT JOIN users u ON u.id = a.user_id
+    WHERE {where}
+    ORDER BY a.created_at DESC, a.id DESC
+    LIMIT %s OFFSET %s
+"""
+
 @app.get("/api/{job_id}/applications")
-def list_applications(
+async def list_applications(
     job_id: int,
     page: int = 1,
     page_size: int = 10,
-    db=Depends(get_db),
+    cursor: str | None = None,
+    total: str | None = None,
+    format: str | None = None,
+    db=Depends(get_read_db_async),
     _: dict = Depends(require_admin_or_recruiter),
 ):
+    columnar = check_row_format(format)
     try:
         page = max(1, int(page))
         page_size = max(1, min(100, int(page_size)))
         offset = (page - 1) * page_size
+        total_mode = _total_mode(total, cursor)
 
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                "SELECT COUNT(*) AS total FROM applications a WHERE a.job_id = %s",
-                (job_id,),
-            )
-            total = cur.fetchone()["total"]
+        page_where, page_params = ["a.job_id = %s"], [job_id]
+        if cursor:
+            clause, values = _keyset_clause("a.created_at", "a.id", cursor)
+            page_where.append(clause)
+            page_params += values
 
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                """
-                SELECT a.id, a.user_id, COALESCE(u.email, a.email) AS candidate_email,
-                       a.phone, a.message, a.cv_url, a.status, a.created_at
-                FROM applications a
-                LEFT JOIN users u ON u.id = a.user_id
-                WHERE a.job_id = %s
-                ORDER BY a.created_at DESC, a.id DESC
-                LIMIT %s OFFSET %s
-                """,
-                (job_id, page_size, offset),
+        async with await db.cursor(dictionary=True) as cur:
+            total_count = await _listing_total(cur, total_mode, "applications", APPLICATIONS_COUNT_SQL, [job_id], True)
+
+        async with await db.cursor(dictionary=True) as cur:
+            await cur.execute(
+                APPLICATIONS_PAGE_SQL.format(where=" AND ".join(page_where)),
+                tuple(page_params + [page_size + 1, 0 if cursor is not None else offset]),
             )
-            items = cur.fetchall()
+            items, next_cursor = _page_result(await cur.fetchall(), page_size, sort_key="created_at")
 
-        return {"items": items, "page": page, "page_size": page_size, "total": total}
+        result = {"items": items, "page": page, "page_size": page_size, "total": total_count, "next_cursor": next_cursor}
+        if cursor is not None:
+            del result["page"]
+        return FastJSONResponse(shape_rows(result, columnar))
     except Error as e:
         raise HTTPException(status_code=500, detail=f"Query failed: {e}")
 
 @app.post("/api/applications", status_code=201)
 def create_application(
     payload: dict,
-    db=Depends(get_db),
+    response: Response,
+    idempotency_key: str | None = Header(default=None, max_length=64),
     current_user=Depends(require_user),  # impose d'être connecté pour postuler
 ):
     job_id = payload.get("job_id")
     if not job_id:
         raise HTTPException(status_code=400, detail="job_id is required")
+    try:
+        job_id = int(job_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="job_id must be an integer")
+
+    if APPLICATION_INTAKE == "log":
+        # acquittée dès qu'elle est sur disque ; insérée par le flusher (voir « Réception des candidatures »)
+        key = idempotency_key or uuid.uuid4().hex
+        intake.append({
+            "key": key, "job_id": job_id, "user_id": current_user["id"],
+            "candidate_email": current_user["email"] or payload.get("email"),
+            **{f: payload.get(f) for f in INTAKE_FIELDS}, "status": payload.get("status") or "new",
+            "received_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),  # UTC, converti à l'insertion
+        })
+        response.status_code = 202
+        return {"idempotency_key": key, "state": "pending", **payload, "job_id": job_id, "user_id": current_user["id"]}
+
+    def replayed(cur):
+        cur.execute(
+            "SELECT id FROM applications WHERE intake_key=%s AND user_id=%s",
+            (idempotency_key, current_user["id"]),
+        )
+        row = cur.fetchone()
+        if row:
+            response.status_code = 200
+            return {"id": row[0], **payload, "user_id": current_user["id"]}
+        return None
+
+    with db_connection() as db, db.cursor() as cur:
+        if idempotency_key:
+            replay = replayed(cur)
+            if replay:
+                return replay
 
-    with db.cursor() as cur:
         # Job existe ?
         cur.execute("SELECT 1 FROM jobs WHERE id=%s", (job_id,))
         if not cur.fetchone():
             raise HTTPException(status_code=404, detail="Job not found")
 
+        try:
+            cur.execute(
+                """
+                INSERT INTO applications
+                    (job_id, user_id, name, email, phone, message, cv_url, status, intake_key, created_at)
+                VALUES
+                    (%s, %s, %s, %s, %s, %s, %s, COALESCE(%s, 'new'), %s, NOW())
+                """,
+                (
+                    job_id,
+                    current_user["id"],
+                    payload.get("name"),
+                    payload.get("email"),
+                    payload.get("phone"),
+                    payload.get("message"),
+                    payload.get("cv_url"),
+                    payload.get("status"),
+                    idempotency_key,
+                ),
+            )
+        except mysql.connector.errors.IntegrityError as e:
+            # même Idempotency-Key envoyée deux fois en parallèle : l'autre requête a gagné, on la rejoue
+            # (rollback d'abord : le snapshot de la transaction ne voit pas sa ligne)
+            if not idempotency_key or getattr(e, "errno", None) != 1062:
+                raise
+            db.rollback()
+            replay = replayed(cur)
+            if replay is None:
+                raise
+            return replay
+        new_id = cur.lastrowid
+        bump_application_counts(cur, [(job_id, payload.get("status") or "new", 1)])
+        publish_events(db, cur, [("application.created", job_id, None, {
+            "id": new_id, "user_id": current_user["id"],
+            "candidate_email": current_user["email"] or payload.get("email"),
+            "phone": payload.get("phone"), "message": payload.get("message"), "cv_url": payload.get("cv_url"),
+            "status": payload.get("status") or "new",
+        })])
+
+    return {"id": new_id, **payload, "user_id": current_user["id"]}
+
+# --------------------------------------------------------------------
+# Réception des candidatures par journal (APPLICATION_INTAKE=log)
+# --------------------------------------------------------------------
+# Mode « log » : la candidature est ajoutée à un journal local (une ligne JSON, fsync groupé entre
+# requêtes concurrentes) puis acquittée en 202, sans connexion MySQL. Un flusher valide les job_id
+# par lots et insère par INSERT multi-lignes, un commit par lot. Chaque ligne porte une clé
+# d'idempotence (en-tête Idempotency-Key, sinon générée) : rejouer un segment après un crash ne
+# duplique rien. Un segment est verrouillé (flock) par le worker qui l'écrit ; au démarrage et
+# périodiquement, les segments orphelins d'un worker arrêté sont repris.
+APPLICATION_INTAKE = os.getenv("APPLICATION_INTAKE", "direct")  # direct | log
+INTAKE_DIR = Path(os.getenv("INTAKE_DIR", "data/intake"))
+INTAKE_BATCH = int(os.getenv("INTAKE_BATCH", "500"))
+INTAKE_FLUSH_INTERVAL = float(os.getenv("INTAKE_FLUSH_INTERVAL", "0.2"))
+INTAKE_RECOVERY_INTERVAL = 60.0
+INTAKE_FIELDS = ("name", "email", "phone", "message", "cv_url", "status")
+intake_log = logging.getLogger("jobboard.intake")
+intake_stats = {"appended": 0, "inserted": 0, "duplicates": 0, "rejected": 0}
+# erreurs SQL propres à une ligne (valeur trop longue, clé étrangère...) : la rejouer n'y changera rien
+INTAKE_PERMANENT_ERRORS = (mysql.connector.errors.DataError, mysql.connector.errors.IntegrityError)
+
+class IntakeSegment:
+    """Fichier journal ouvert en ajout et verrouillé tant que ce worker l'écrit ou le rejoue."""
+
+    def __init__(self, path: Path, fd: int):
+        self.path = path
+        self.fd = fd
+        self.count = 0
+
+    @classmethod
+    def create(cls) -> "IntakeSegment":
+        INTAKE_DIR.mkdir(parents=True, exist_ok=True)
+        path = INTAKE_DIR / f"{uuid.uuid4().hex}.log"
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return cls(path, fd)
+
+    @classmethod
+    def claim(cls, path: Path) -> "IntakeSegment | None":
+        """Segment d'un worker disparu (verrou libre), ou None s'il est encore tenu."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        if not path.exists():  # traité et supprimé entre-temps par un autre worker
+            os.close(fd)
+            return None
+        return cls(path, fd)
+
+    def records(self) -> list[dict]:
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # ligne tronquée par un arrêt brutal : jamais acquittée (le fsync n'a pas abouti)
+                    intake_log.warning("%s:%s: ignored truncated record", self.path.name, number)
+        return records
+
+    def discard(self):
+        self.path.unlink(missing_ok=True)
+        os.close(self.fd)
+
+class IntakeLog:
+    def __init__(self):
+        self._lock = threading.Lock()  # écriture et rotation du segment courant
+        self._sync_lock = threading.Lock()
+        self._segment: IntakeSegment | None = None
+        self._written = 0
+        self._synced = 0
+
+    def append(self, record: dict):
+        """Ajoute une ligne et rend la main une fois qu'elle est sur disque.
+
+        fsync groupé : les threads en attente derrière un fsync en cours sont couverts par lui.
+        """
+        line = (json.dumps(record, default=str, ensure_ascii=False) + "\n").encode()
+        with self._lock:
+            if self._segment is None:
+                self._segment = IntakeSegment.create()
+            os.write(self._segment.fd, line)
+            self._segment.count += 1
+            self._written += 1
+            seq, fd = self._written, self._segment.fd
+        with self._sync_lock:
+            if self._synced < seq:
+                target = self._written
+                os.fsync(fd)
+                self._synced = target
+        intake_stats["appended"] += 1
+
+    def rotate(self) -> IntakeSegment | None:
+        """Retire le segment courant (s'il contient des lignes) ; les suivantes iront dans un nouveau."""
+        with self._lock, self._sync_lock:
+            segment = self._segment
+            if segment is None or not segment.count:
+                return None
+            os.fsync(segment.fd)
+            self._synced = self._written
+            self._segment = None
+            return segment
+
+    @property
+    def pending(self) -> int:
+        segment = self._segment
+        return segment.count if segment is not None else 0
+
+intake = IntakeLog()
+
+def _insert_intake(records: list[dict]):
+    """Insère un lot du journal en une transaction (clés déjà présentes ignorées, job_id validés ensemble)."""
+    # clé d'idempotence propre à chaque candidat : unicité sur (user_id, intake_key)
+    by_key = {(r["user_id"], r["key"]): r for r in records}
+    placeholders = ", ".join(["(%s, %s)"] * len(by_key))
+    pool = get_pool()
+    db = pool.acquire()
+    broken = False
+    try:
+        with db.cursor() as cur:
+            cur.execute(
+                f"SELECT user_id, intake_key FROM applications WHERE (user_id, intake_key) IN ({placeholders})",
+                tuple(v for key in by_key for v in key),
+            )
+            done = set(cur.fetchall())
+            fresh = [r for key, r in by_key.items() if key not in done]
+            intake_stats["duplicates"] += len(records) - len(fresh)
+            job_ids = sorted({r["job_id"] for r in fresh})
+            known = set()
+            if job_ids:
+                cur.execute(f"SELECT id FROM jobs WHERE id IN ({', '.join(['%s'] * len(job_ids))})", tuple(job_ids))
+                known = {row[0] for row in cur.fetchall()}
+            _reject_intake(cur, [r for r in fresh if r["job_id"] not in known], "Job not found")
+            fresh = [r for r in fresh if r["job_id"] in known]
+            if fresh:
+                cur.executemany(
+                    "INSERT INTO applications "
+                    "(job_id, user_id, name, email, phone, message, cv_url, status, intake_key, created_at) "
+                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, CONVERT_TZ(%s, '+00:00', @@session.time_zone)) AS new "
+                    "ON DUPLICATE KEY UPDATE intake_key = applications.intake_key",
+                    [(r["job_id"], r["user_id"], *(r.get(f) for f in INTAKE_FIELDS), r["key"], r["received_at"])
+                     for r in fresh],
+                )
+                cur.execute(
+                    "SELECT id, user_id, intake_key FROM applications "
+                    f"WHERE (user_id, intake_key) IN ({', '.join(['(%s, %s)'] * len(fresh))})",
+                    tuple(v for r in fresh for v in (r["user_id"], r["key"])),
+                )
+                ids = {(user_id, key): id_ for id_, user_id, key in cur.fetchall()}
+                deltas: dict[tuple[int, str], int] = {}
+                for r in fresh:
+                    deltas[(r["job_id"], r["status"])] = deltas.get((r["job_id"], r["status"]), 0) + 1
+                bump_application_counts(cur, [(job_id, status_, n) for (job_id, status_), n in deltas.items()])
+                publish_events(None, cur, [
+                    ("application.created", r["job_id"], None, {
+                        "id": ids.get((r["user_id"], r["key"])), "user_id": r["user_id"], "candidate_email": r["candidate_email"],
+                        "phone": r.get("phone"), "message": r.get("message"), "cv_url": r.get("cv_url"),
+                        "status": r["status"],
+                    })
+                    for r in fresh
+                ])
+        db.commit()
+        intake_stats["inserted"] += len(fresh)
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            db.rollback()
+        except Error:
+            broken = True
+        raise
+    finally:
+        pool.release(db, broken=broken)
+    if fresh:
+        feed_hub.wake()
+        response_cache.invalidate(*(f"job:{job_id}" for job_id in {r["job_id"] for r in fresh}))
+
+def _reject_intake(cur, records: list[dict], detail: str):
+    """Écarte des enregistrements dans application_intake_rejects, lisible par tous les workers."""
+    if not records:
+        return
+    cur.executemany(
+        "INSERT INTO application_intake_rejects (user_id, intake_key, job_id, detail, record, created_at) "
+        "VALUES (%s, %s, %s, %s, %s, NOW()) AS new ON DUPLICATE KEY UPDATE detail = new.detail",
+        [(r["user_id"], r["key"], r.get("job_id"), detail[:255], json.dumps(r, default=str, ensure_ascii=False))
+         for r in records],
+    )
+    intake_stats["rejected"] += len(records)
+
+def _reject_intake_record(record: dict, detail: str):
+    intake_log.warning("rejected intake record %s: %s", record.get("key"), detail)
+    pool = get_pool()
+    db = pool.acquire()
+    broken = False
+    try:
+        with db.cursor() as cur:
+            _reject_intake(cur, [record], detail)
+        db.commit()
+    except Exception as exc:
+        broken = isinstance(exc, mysql.connector.errors.InterfaceError)
+        try:
+            db.rollback()
+        except Error:
+            broken = True
+        raise
+    finally:
+        pool.release(db, broken=broken)
+
+def _insert_intake_batch(records: list[dict]):
+    try:
+        _insert_intake(records)
+    except INTAKE_PERMANENT_ERRORS:
+        # une ligne invalide fait échouer tout le lot : on l'isole en rejouant ligne à ligne.
+        # Les erreurs passagères (connexion, verrou...) remontent : le segment sera rejoué plus tard.
+        for record in records:
+            try:
+                _insert_intake([record])
+            except INTAKE_PERMANENT_ERRORS as e:
+                _reject_intake_record(record, str(e))
+
+def _replay_segment(segment: IntakeSegment):
+    try:
+        records = segment.records()
+        for start in range(0, len(records), INTAKE_BATCH):
+            _insert_intake_batch(records[start:start + INTAKE_BATCH])
+    except Exception:
+        os.close(segment.fd)  # verrou relâché : le segment sera repris par recover_intake
+        raise
+    # supprimé seulement une fois tout commité : un crash avant ici rejoue le segment sans doublon
+    segment.discard()
+
+def flush_intake():
+    segment = intake.rotate()
+    if segment is not None:
+        _replay_segment(segment)
+
+def recover_intake():
+    """Reprend les segments laissés par un worker arrêté (verrou libéré par le système)."""
+    if not INTAKE_DIR.is_dir():
+        return
+    for path in sorted(INTAKE_DIR.glob("*.log")):
+        segment = IntakeSegment.claim(path)
+        if segment is not None:
+            intake_log.info("recovering %s", path.name)
+            _replay_segment(segment)
+
+async def _run_intake_flusher():
+    recovered_at = 0.0
+    while True:
+        try:
+            if time.monotonic() - recovered_at > INTAKE_RECOVERY_INTERVAL:
+                await asyncio.to_thread(recover_intake)
+                recovered_at = time.monotonic()
+            await asyncio.to_thread(flush_intake)
+        except Exception:
+            # le segment reste sur disque : repris au prochain recover_intake
+            intake_log.exception("intake flush failed")
+        await asyncio.sleep(INTAKE_FLUSH_INTERVAL)
+
+@app.on_event("startup")
+async def _start_intake():
+    if APPLICATION_INTAKE == "log":
+        asyncio.get_running_loop().create_task(_run_intake_flusher())
+
+@app.on_event("shutdown")
+def _stop_intake():
+    if APPLICATION_INTAKE == "log":
+        try:
+            flush_intake()
+        except Exception:
+            intake_log.exception("final intake flush failed, segment kept for recovery")
+
+@app.get("/api/applications/intake/{key}")
+async def application_intake_status(
+    key: str,
+    db=Depends(get_db_async),
+    current_user=Depends(require_user),
+):
+    """Devenir d'une candidature acquittée en 202 : pending, accepted (avec id) ou rejected."""
+    async with await db.cursor(dictionary=True) as cur:
+        await cur.execute(
+            "SELECT id, job_id, status FROM applications WHERE intake_key=%s AND user_id=%s",
+            (key, current_user["id"]),
+        )
+        row = await cur.fetchone()
+        if row:
+            return {"key": key, "state": "accepted", **row}
+        await cur.execute(
+            "SELECT job_id, detail FROM application_intake_rejects WHERE intake_key=%s AND user_id=%s",
+            (key, current_user["id"]),
+        )
+        rejected = await cur.fetchone()
+    if rejected:
+        return {"key": key, "state": "rejected", **rejected}
+    return {"key": key, "state": "pending"}
+
+# --------------------------------------------------------------------
+# Pipeline recruteur
+# --------------------------------------------------------------------
+# application_counts (job_id, status) -> n : tenu à jour à chaque candidature et changement de statut.
+APPLICATION_STATUSES = ("new", "review", "interview", "offer", "hired", "rejected")
+
+def bump_application_counts(cur, deltas: list[tuple[int, str, int]]):
+    deltas = [d for d in deltas if d[2]]
+    if not deltas:
+        return
+    cur.executemany(
+        "INSERT INTO application_counts (job_id, status, n) VALUES (%s, %s, %s) AS new "
+        "ON DUPLICATE KEY UPDATE n = application_counts.n + new.n",
+        deltas,
+    )
+
+def _owned_jobs_clause(user: dict, alias: str = "j") -> tuple[str, list]:
+    """Un recruteur voit les offres qu'il a créées ; un admin voit tout.
+
+    Les offres antérieures à jobs.created_by (NULL) reviennent aux recruteurs de leur entreprise,
+    c'est-à-dire à ceux qui y ont déjà publié une offre. La table dérivée est matérialisée :
+    la clause reste valable dans un UPDATE joint à jobs.
+    """
+    if user["role"] == "admin":
+        return "1=1", []
+    return (
+        f"({alias}.created_by = %s OR ({alias}.created_by IS NULL AND {alias}.company_id IN ("
+        "SELECT company_id FROM (SELECT DISTINCT company_id FROM jobs WHERE created_by = %s) AS mine)))",
+        [user["id"], user["id"]],
+    )
+
+@app.get("/api/recruiter/dashboard")
+async def recruiter_dashboard(
+    company_id: int | None = None,
+    limit: int = 200,
+    db=Depends(get_read_db_async),
+    current_user: dict = Depends(require_admin_or_recruiter),
+):
+    """Compteurs de candidatures par statut pour toutes les offres du recruteur, en une requête."""
+    owned_sql, params = _owned_jobs_clause(current_user)
+    where = [owned_sql]
+    if company_id is not None:
+        where.append("j.company_id = %s")
+        params.append(company_id)
+    limit = max(1, min(1000, int(limit)))
+    try:
+        async with await db.cursor(dictionary=True) as cur:
+            await cur.execute(
+                f"""
+                SELECT j.id AS job_id, j.title, j.company_id, ac.status, ac.n
+                FROM (
+                    SELECT id, title, company_id, created_at FROM jobs j
+                    WHERE {" AND ".join(where)}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT %s
+                ) j
+                LEFT JOIN application_counts ac ON ac.job_id = j.id AND ac.n > 0
+                ORDER BY j.created_at DESC, j.id DESC
+                """,
+                tuple(params + [limit]),
+            )
+            rows = await cur.fetchall()
+    except Error as e:
+        raise HTTPException(status_code=500, detail=f"Query failed: {e}")
+
+    jobs: dict[int, dict] = {}
+    totals = {s: 0 for s in APPLICATION_STATUSES}
+    for row in rows:
+        job = jobs.setdefault(row["job_id"], {
+            "job_id": row["job_id"], "title": row["title"], "company_id": row["company_id"],
+            "counts": {}, "total": 0,
+        })
+        if row["status"] is not None:
+            job["counts"][row["status"]] = row["n"]
+            job["total"] += row["n"]
+            totals[row["status"]] = totals.get(row["status"], 0) + row["n"]
+    return {"jobs": list(jobs.values()), "totals": totals}
+
+@app.post("/api/applications/status")
+def bulk_update_application_status(
+    payload: dict,
+    db=Depends(get_db),
+    current_user: dict = Depends(require_admin_or_recruiter),
+):
+    """Change le statut de plusieurs candidatures en une instruction.
+
+    payload : {"ids": [...], "status": "review", "from_status": "new" (optionnel)}
+    """
+    ids = payload.get("ids") or []
+    new_status = payload.get("status")
+    from_status = payload.get("from_status")
+    if new_status not in APPLICATION_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of {list(APPLICATION_STATUSES)}")
+    try:
+        ids = sorted({int(i) for i in ids})
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="ids must be a list of integers")
+    if not ids or len(ids) > 1000:
+        raise HTTPException(status_code=400, detail="ids must contain between 1 and 1000 ids")
+
+    owned_sql, owned_params = _owned_jobs_clause(current_user)
+    where = [f"a.id IN ({', '.join(['%s'] * len(ids))})", "a.status <> %s", owned_sql]
+    params = [*ids, new_status, *owned_params]
+    if from_status:
+        where.append("a.status = %s")
+        params.append(from_status)
+    where_sql = " AND ".join(where)
+
+    with db.cursor() as cur:
+        # verrouille les lignes visées et relève les anciens statuts pour les compteurs
         cur.execute(
-            """
-            INSERT INTO applications
-                (job_id, user_id, name, email, phone, message, cv_url, status, created_at)
-            VALUES
-                (%s, %s, %s, %s, %s, %s, %s, COALESCE(%s, 'new'), NOW())
+            f"""
+            SELECT a.id, a.job_id, a.status FROM applications a
+            JOIN jobs j ON j.id = a.job_id
+            WHERE {where_sql}
+            FOR UPDATE
             """,
-            (
-                job_id,
-                current_user["id"],
-                payload.get("name"),
-                payload.get("email"),
-                payload.get("phone"),
-                payload.get("message"),
-                payload.get("cv_url"),
-                payload.get("status"),
-            ),
+            tuple(params),
         )
-        new_id = cur.lastrowid
+        locked = cur.fetchall()
+        cur.execute(
+            f"""
+            UPDATE applications a
+            JOIN jobs j ON j.id = a.job_id
+            SET a.status = %s
+            WHERE {where_sql}
+            """,
+            (new_status, *params),
+        )
+        updated = cur.rowcount
+        previous: dict[tuple[int, str], int] = {}
+        per_job: dict[int, list[int]] = {}
+        for application_id, job_id, status_ in locked:
+            previous[(job_id, status_)] = previous.get((job_id, status_), 0) + 1
+            per_job.setdefault(job_id, []).append(application_id)
+        deltas = [(job_id, status_, -n) for (job_id, status_), n in previous.items()]
+        deltas += [(job_id, new_status, len(ids_)) for job_id, ids_ in per_job.items()]
+        bump_application_counts(cur, deltas)
+        publish_events(db, cur, [
+            ("application.status", job_id, None, {"ids": ids_, "status": new_status})
+            for job_id, ids_ in per_job.items()
+        ])
+    return {"updated": updated, "status": new_status}
 
-    return {"id": new_id, **payload, "user_id": current_user["id"]}
+@app.post("/api/admin/application_counts/rebuild")
+def rebuild_application_counts(db=Depends(get_db), _: dict = Depends(require_admin)):
+    with db.cursor() as cur:
+        cur.execute("DELETE FROM application_counts")
+        cur.execute(
+            "INSERT INTO application_counts (job_id, status, n) "
+            "SELECT job_id, status, COUNT(*) FROM applications GROUP BY job_id, status"
+        )
+        rows = cur.rowcount
+    return {"rows": rows}
+
+# --------------------------------------------------------------------
+# Flux temps réel (Server-Sent Events)
+# --------------------------------------------------------------------
+# Les écritures ajoutent leurs événements à feed_events dans leur propre transaction. Dans chaque
+# worker, une seule tâche lit la table (une requête toutes les FEED_POLL_INTERVAL s, ou dès le commit
+# d'une écriture locale) et distribue aux abonnés : les pages recruteur n'ont plus à re-interroger
+# /api/{job_id}/applications. Livraison « au moins une fois » : l'id d'événement sert de jeton de reprise.
+FEED_POLL_INTERVAL = float(os.getenv("FEED_POLL_INTERVAL", "1.0"))
+FEED_QUEUE_SIZE = int(os.getenv("FEED_QUEUE_SIZE", "256"))  # au-delà, l'abonné rattrape depuis la base
+FEED_REPLAY_MAX = int(os.getenv("FEED_REPLAY_MAX", "1000"))  # au-delà, événement reset : recharger la page
+FEED_RETENTION_HOURS = int(os.getenv("FEED_RETENTION_HOURS", "48"))
+FEED_HEARTBEAT = 15.0  # commentaire « ping » pour les proxys et la détection des clients partis
+FEED_RETRY_MS = 3000  # délai de reconnexion conseillé à EventSource
+FEED_GAP_TIMEOUT = 10.0  # un id sauté (transaction pas encore commitée) est attendu au plus ce temps
+FEED_MAX_TOPICS = 200
+feed_log = logging.getLogger("jobboard.feed")
+_FEED_COLUMNS = "id, kind, job_id, company_id, payload, created_at"
+
+def publish_events(db, cur, events: list[tuple[str, int | None, int | None, dict]]):
+    """Événements (kind, job_id, company_id, data) écrits dans la transaction de la route.
+
+    Les abonnés d'une offre reçoivent ses événements, ceux d'une entreprise les événements
+    portant son company_id (jamais les candidatures, réservées au recruteur de l'offre).
+    """
+    if not events:
+        return
+    cur.executemany(
+        "INSERT INTO feed_events (kind, job_id, company_id, payload, created_at) VALUES (%s, %s, %s, %s, NOW())",
+        [(kind, job_id, company_id, json.dumps(data, default=str)) for kind, job_id, company_id, data in events],
+    )
+    if db is not None:
+        after_commit(db, feed_hub.wake)
+
+def _feed_event(row: dict) -> dict:
+    payload = row["payload"]
+    return {
+        "id": row["id"], "kind": row["kind"], "job_id": row["job_id"], "company_id": row["company_id"],
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+        "data": json.loads(payload) if payload else {},
+    }
+
+def _sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+class FeedSubscriber:
+    def __init__(self, jobs: set[int], companies: set[int]):
+        self.jobs = jobs
+        self.companies = companies
+        self.queue: asyncio.Queue = asyncio.Queue(FEED_QUEUE_SIZE)
+        self.lagging = False
+
+_LAGGED = object()  # marqueur de file : l'abonné a décroché et doit relire la base
+
+class FeedHub:
+    """Abonnés du worker indexés par offre et par entreprise ; ne bloque jamais sur un client lent."""
+
+    def __init__(self):
+        self.by_job: dict[int, set[FeedSubscriber]] = {}
+        self.by_company: dict[int, set[FeedSubscriber]] = {}
+        self.last_id: int | None = None
+        self.gaps: dict[int, float] = {}  # id non encore vu -> instant où le saut a été constaté
+        self.stats = {"subscribers": 0, "events": 0, "lagged": 0}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+
+    def subscribe(self, sub: FeedSubscriber):
+        for job_id in sub.jobs:
+            self.by_job.setdefault(job_id, set()).add(sub)
+        for company_id in sub.companies:
+            self.by_company.setdefault(company_id, set()).add(sub)
+        self.stats["subscribers"] += 1
+
+    def unsubscribe(self, sub: FeedSubscriber):
+        for index, keys in ((self.by_job, sub.jobs), (self.by_company, sub.companies)):
+            for key in keys:
+                subs = index.get(key)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del index[key]
+        self.stats["subscribers"] -= 1
+
+    def wake(self):
+        """Relève immédiate de la table ; appelable depuis un thread (after_commit d'une route sync)."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def dispatch(self, event: dict):
+        targets = self.by_job.get(event["job_id"], set()) | self.by_company.get(event["company_id"], set())
+        for sub in targets:
+            if sub.lagging:
+                continue
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # client trop lent : sa file est vidée, il rattrapera depuis la base à son rythme
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                sub.queue.put_nowait(_LAGGED)
+                sub.lagging = True
+                self.stats["lagged"] += 1
+        self.stats["events"] += 1
+
+    async def poll(self, cur) -> int:
+        if self.last_id is None:
+            await cur.execute("SELECT COALESCE(MAX(id), 0) AS id FROM feed_events")
+            self.last_id = (await cur.fetchone())["id"]
+            return 0
+        # les id AUTO_INCREMENT ne sont pas commités dans l'ordre : un trou est relu quelques secondes
+        now = time.monotonic()
+        self.gaps = {i: seen for i, seen in self.gaps.items() if now - seen < FEED_GAP_TIMEOUT}
+        where, params = "id > %s", [self.last_id]
+        if self.gaps:
+            where += f" OR id IN ({', '.join(['%s'] * len(self.gaps))})"
+            params += list(self.gaps)
+        await cur.execute(f"SELECT {_FEED_COLUMNS} FROM feed_events WHERE {where} ORDER BY id LIMIT 1000", tuple(params))
+        rows = await cur.fetchall()
+        for row in rows:
+            if row["id"] > self.last_id:
+                if row["id"] - self.last_id <= 100 and len(self.gaps) < 1000:
+                    self.gaps.update((i, now) for i in range(self.last_id + 1, row["id"]))
+                self.last_id = row["id"]
+            else:
+                self.gaps.pop(row["id"], None)
+            self.dispatch(_feed_event(row))
+        return len(rows)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        purged_at = 0.0
+        while True:
+            try:
+                async with aio_connection() as db:
+                    async with await db.cursor(dictionary=True) as cur:
+                        full = await self.poll(cur) == 1000
+                        if time.monotonic() - purged_at > 3600:
+                            await cur.execute(
+                                "DELETE FROM feed_events WHERE created_at < NOW() - INTERVAL %s HOUR LIMIT 10000",
+                                (FEED_RETENTION_HOURS,),
+                            )
+                            purged_at = time.monotonic()
+            except Exception:
+                feed_log.exception("feed poll failed")
+                full = False
+            if full:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), FEED_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+feed_hub = FeedHub()
+
+@app.on_event("startup")
+async def _start_feed():
+    asyncio.get_running_loop().create_task(feed_hub.run())
+
+async def _feed_backlog(sub: FeedSubscriber, after_id: int) -> list[dict] | None:
+    """Événements manqués depuis after_id ; None s'ils sont trop nombreux ou déjà purgés."""
+    where, params = [], []
+    if sub.jobs:
+        where.append(f"job_id IN ({', '.join(['%s'] * len(sub.jobs))})")
+        params += sorted(sub.jobs)
+    if sub.companies:
+        where.append(f"company_id IN ({', '.join(['%s'] * len(sub.companies))})")
+        params += sorted(sub.companies)
+    async with aio_connection() as db:
+        async with await db.cursor(dictionary=True) as cur:
+            await cur.execute("SELECT MIN(id) AS id FROM feed_events")
+            oldest = (await cur.fetchone())["id"]
+            if oldest is not None and after_id + 1 < oldest:
+                return None
+            await cur.execute(
+                f"SELECT {_FEED_COLUMNS} FROM feed_events WHERE id > %s AND ({' OR '.join(where)}) ORDER BY id LIMIT %s",
+                (after_id, *params, FEED_REPLAY_MAX + 1),
+            )
+            rows = await cur.fetchall()
+    if len(rows) > FEED_REPLAY_MAX:
+        return None
+    return [_feed_event(row) for row in rows]
+
+async def _feed_stream(sub: FeedSubscriber, after_id: int | None):
+    feed_hub.subscribe(sub)
+    try:
+        yield f"retry: {FEED_RETRY_MS}\n\n"
+        catch_up = after_id is not None
+        if after_id is None:
+            after_id = feed_hub.last_id or 0
+        replayed: set[int] = set()
+        while True:
+            if catch_up:
+                catch_up = False
+                backlog = await _feed_backlog(sub, after_id)
+                if backlog is None:
+                    yield f"event: reset\ndata: {json.dumps({'last_id': feed_hub.last_id})}\n\n"
+                    after_id = feed_hub.last_id or after_id
+                    backlog = []
+                replayed = {event["id"] for event in backlog}
+                for event in backlog:
+                    after_id = max(after_id, event["id"])
+                    yield _sse(event)
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), FEED_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is _LAGGED:
+                sub.lagging = False
+                catch_up = True
+                continue
+            if event["id"] in replayed:
+                continue
+            after_id = max(after_id, event["id"])
+            yield _sse(event)
+    finally:
+        feed_hub.unsubscribe(sub)
+
+async def get_stream_user(request: Request, access_token: str | None = None) -> dict:
+    """EventSource ne sait pas envoyer d'en-tête Authorization : le token est aussi accepté en ?access_token=."""
+    header = request.headers.get("authorization", "")
+    token = header[7:] if header.lower().startswith("bearer ") else access_token
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+@app.get("/api/feed")
+async def feed(
+    request: Request,
+    jobs: str | None = None,
+    companies: str | None = None,
+    last_event_id: int | None = None,
+    current_user: dict = Depends(get_stream_user),
+):
+    """Flux SSE des candidatures et des changements d'offres / d'entreprises suivies.
+
+    Événements : application.created, application.status (abonnés de l'offre), job.created
+    (abonnés de l'entreprise), job.updated, job.deleted, company.updated, company.deleted.
+    À la reconnexion, EventSource renvoie Last-Event-ID et les événements manqués sont rejoués ;
+    un événement reset signale qu'il faut recharger la page (trop d'événements manqués).
+    """
+    require_admin_or_recruiter(current_user)
+    job_ids = set(parse_ids(jobs)) if jobs else set()
+    company_ids = set(parse_ids(companies)) if companies else set()
+    if not job_ids and not company_ids:
+        raise HTTPException(status_code=400, detail="jobs or companies is required")
+    if len(job_ids) + len(company_ids) > FEED_MAX_TOPICS:
+        raise HTTPException(status_code=400, detail=f"At most {FEED_MAX_TOPICS} jobs and companies")
+    if job_ids and current_user["role"] != "admin":
+        owned_sql, owned_params = _owned_jobs_clause(current_user)
+        async with aio_connection() as db:
+            async with await db.cursor() as cur:
+                await cur.execute(
+                    f"SELECT id FROM jobs j WHERE id IN ({', '.join(['%s'] * len(job_ids))}) AND {owned_sql}",
+                    (*sorted(job_ids), *owned_params),
+                )
+                owned = {row[0] for row in await cur.fetchall()}
+        if owned != job_ids:
+            raise HTTPException(status_code=403, detail=f"Not your jobs: {sorted(job_ids - owned)}")
+
+    header = request.headers.get("last-event-id")
+    if header is not None:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer")
+    return StreamingResponse(
+        _feed_stream(FeedSubscriber(job_ids, company_ids), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# --------------------------------------------------------------------
+# Exports (admin)
+# --------------------------------------------------------------------
+EXPORT_BATCH = int(os.getenv("EXPORT_BATCH", "1000"))
+# entité -> (colonnes, table aliasée, colonne de watermark, filtres autorisés {param: colonne})
+EXPORTS = {
+    "jobs": (
+        ("id", "company_id", "external_ref", "title", "short_desc", "full_desc", "location",
+         "profile_sought", "contract_type", "work_mode", "salary_min", "salary_max", "currency",
+         "tags", "created_at", "updated_at"),
+        "jobs t", "t.changed_at",
+        {"company_id": "t.company_id", "contract_type": "t.contract_type", "location": "t.location"},
+    ),
+    "profiles": (
+        ("id", "user_id", "first_name", "last_name", "date_birth", "city", "phone", "diplomas",
+         "experiences", "skills", "languages", "qualities", "interests", "job_target", "motivation",
+         "links", "avatar_url", "created_at", "updated_at"),
+        "profiles t", "t.sort_at",
+        {"city": "t.city", "user_id": "t.user_id"},
+    ),
+    "applications": (
+        ("id", "job_id", "user_id", "name", "email", "phone", "message", "cv_url", "status",
+         "created_at", "updated_at"),
+        "applications t", "t.changed_at",
+        {"job_id": "t.job_id", "status": "t.status"},
+    ),
+}
+
+def _export_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _export_rows(db, sql: str, params: tuple, columns: tuple, fmt: str):
+    """Générateur : lit un curseur non bufferisé par paquets et émet du CSV ou du NDJSON.
+
+    La connexion est empruntée au pool pour toute la durée du flux et rendue à la fin.
+    """
+    pool = get_pool()
+    completed = False
+    try:
+        with db.cursor(buffered=False) as cur:
+            cur.execute(sql, params)
+            if fmt == "csv":
+                out = io.StringIO()
+                writer = csv.writer(out)
+                writer.writerow(columns)
+                yield out.getvalue()
+            while rows := cur.fetchmany(EXPORT_BATCH):
+                if fmt == "csv":
+                    out = io.StringIO()
+                    writer = csv.writer(out)
+                    writer.writerows([[_export_value(v) for v in row] for row in rows])
+                    yield out.getvalue()
+                else:
+                    yield "".join(
+                        json.dumps(dict(zip(columns, map(_export_value, row))), ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+        db.rollback()  # fin de la transaction en lecture seule
+        completed = True
+    finally:
+        # client parti (GeneratorExit) ou erreur : résultat non lu et transaction ouverte, on jette la connexion
+        pool.release(db, broken=not completed)
+
+@app.get("/api/admin/export/{entity}")
+def export_entity(
+    entity: str,
+    request: Request,
+    format: str = "ndjson",
+    updated_since: datetime | None = None,
+    _: dict = Depends(require_admin),
+):
+    """Export complet ou incrémental (updated_since) d'une table, en flux à mémoire constante.
+
+    Les autres paramètres de requête servent de filtres d'égalité (voir EXPORTS).
+    L'en-tête X-Export-Watermark donne la valeur à repasser en updated_since au prochain export.
+    """
+    if entity not in EXPORTS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    if format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    columns, table, watermark_col, filters = EXPORTS[entity]
+
+    where, params = [], []
+    for name, column in filters.items():
+        value = request.query_params.get(name)
+        if value is not None:
+            where.append(f"{column} = %s")
+            params.append(value)
+    if updated_since is not None:
+        where.append(f"{watermark_col} >= %s")
+        params.append(updated_since)
+    where_sql = "WHERE " + " AND ".join(where) if where else ""
+    sql = (
+        f"SELECT {', '.join('t.' + c for c in columns)} FROM {table} {where_sql} "
+        f"ORDER BY {watermark_col}, t.id"
+    )
+
+    pool = get_pool()
+    try:
+        db = pool.acquire()
+    except PoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"DB pool exhausted: {e}") from e
+    try:
+        db.start_transaction(consistent_snapshot=True, readonly=True)
+        with db.cursor() as cur:
+            cur.execute("SELECT NOW()")
+            watermark = cur.fetchone()[0]
+    except Error as e:
+        pool.release(db, broken=True)
+        raise HTTPException(status_code=500, detail=f"DB error: {e}")
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    filename = f"{entity}_{watermark:%Y%m%d%H%M%S}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        _export_rows(db, sql, tuple(params), columns, format),
+        media_type=media_type,
+        headers={
+            "X-Export-Watermark": watermark.isoformat(),
+            "Content-Disposition": f'attachment; filename="{filename}"',
+        },
+    )
+
+# --------------------------------------------------------------------
+# Users (admin)
+# --------------------------------------------------------------------
+@app.patch("/api/users/{user_id}/role")
+def update_user_role(
+    user_id: int,
+    payload: dict,
+    db=Depends(get_db),
+    _: dict = Depends(require_admin),
+):
+    role = payload.get("role")
+    if role not in ("user", "recruiter", "admin"):
+        raise HTTPException(status_code=400, detail="role must be user, recruiter or admin")
+    with db.cursor() as cur:
+        cur.execute("UPDATE users SET role=%s WHERE id=%s", (role, user_id))
+        if cur.rowcount == 0:
+            cur.execute("SELECT 1 FROM users WHERE id=%s", (user_id,))
+            if not cur.fetchone():
+                raise HTTPException(status_code=404, detail="User not found")
+        invalidate_user(db, cur, user_id)
+    return {"id": user_id, "role": role}
+
+@app.delete("/api/users/{user_id}", status_code=204)
+def delete_user(
+    user_id: int,
+    db=Depends(get_db),
+    _: dict = Depends(require_admin),
+):
+    with db.cursor(dictionary=True) as cur:
+        # profils supprimés en cascade : leurs vecteurs de matching et leurs facettes partent avec eux
+        cur.execute(f"SELECT id, {', '.join(PROFILE_FACET_COLUMNS)} FROM profiles WHERE user_id=%s", (user_id,))
+        profiles = cur.fetchall()
+        profile_ids = [row["id"] for row in profiles]
+        cur.execute("DELETE FROM users WHERE id=%s", (user_id,))
+        if cur.rowcount == 0:
+            raise HTTPException(status_code=404, detail="User not found")
+        forget_matches(cur, "profile", profile_ids)
+        for profile in profiles:
+            update_profile_facets(db, cur, profile, None)
+        invalidate_user(db, cur, user_id)
+    after_commit(db, lambda: schedule_matches("profile", profile_ids))
+    db.commit()
+    return Response(status_code=204)
 
 # --------------------------------------------------------------------
 # Auth
 # --------------------------------------------------------------------
 @app.post("/auth/signup", status_code=201)
-def auth_signup(payload: dict, db=Depends(get_db)):
+async def auth_signup(payload: dict):
     email = (payload.get("email") or "").strip().lower()
     password = payload.get("password")
     role = payload.get("role", "user")  # ⚠ en prod, ne pas laisser libre
@@ -723,22 +4469,25 @@ def auth_signup(payload: dict, db=Depends(get_db)):
     if not email or not password:
         raise HTTPException(status_code=400, detail="email and password are required")
 
-    hashed = hash_password(password)
+    hashed = await run_hashing(hash_password, password)
     try:
-        with db.cursor() as cur:
-            cur.execute(
-                "INSERT INTO users (email, password_hash, role) VALUES (%s,%s,%s)",
-                (email, hashed, role),
-            )
-            new_id = cur.lastrowid
+        async with aio_connection() as db:
+            async with await db.cursor() as cur:
+                await cur.execute(
+                    "INSERT INTO users (email, password_hash, role) VALUES (%s,%s,%s)",
+                    (email, hashed, role),
+                )
+                new_id = cur.lastrowid
         return {"id": new_id, "email": email, "role": role}
     except Error as e:
         if getattr(e, "errno", None) == 1062:  # email unique
             raise HTTPException(status_code=409, detail="email already exists")
         raise HTTPException(status_code=500, detail=f"DB error: {e}")
 
+LOGIN_SQL = "SELECT id, email, password_hash, role FROM users WHERE email=%s"
+
 @app.post("/auth/login")
-def auth_login(payload: dict, db=Depends(get_db)):
+async def auth_login(payload: dict):
     email = (payload.get("email") or "").strip().lower()
     password = payload.get("password")
 
@@ -746,19 +4495,31 @@ def auth_login(payload: dict, db=Depends(get_db)):
         raise HTTPException(status_code=400, detail="email and password are required")
 
     try:
-        with db.cursor(dictionary=True) as cur:
-            cur.execute(
-                "SELECT id, email, password_hash, role FROM users WHERE email=%s",
-                (email,),
-            )
-            user = cur.fetchone()
+        async with aio_connection() as db:
+            async with await db.cursor(dictionary=True) as cur:
+                await cur.execute(LOGIN_SQL, (email,))
+                user = await cur.fetchone()
     except Error as e:
         raise HTTPException(status_code=500, detail=f"DB error: {e}")
 
-    if not user or not verify_password(password, user["password_hash"]):
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, new_hash = await run_hashing(verify_and_rehash, password, user["password_hash"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # ré-hachage transparent (schéma déprécié ou coût relevé) ; sans effet si le hash a changé entre-temps
+        try:
+            async with aio_connection() as db:
+                async with await db.cursor() as cur:
+                    await cur.execute(
+                        "UPDATE users SET password_hash=%s WHERE id=%s AND password_hash=%s",
+                        (new_hash, user["id"], user["password_hash"]),
+                    )
+        except Error:
+            pass  # la connexion reste valide, on réessaiera à la prochaine
 
-    token = create_access_token({"sub": user["email"], "role": user["role"]})
+    token = create_access_token({"sub": user["email"], "id": user["id"], "role": user["role"]})
     return {"access_token": token, "token_type": "bearer"}
 
 @app.get("/auth/me")
@@ -783,3 +4544,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --------------------------------------------------------------------
+# Compression des réponses JSON
+# --------------------------------------------------------------------
+API_PREFIXES = ("/api", "/auth", "/db")
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+
+class JSONCompressionMiddleware:
+    """gzip des réponses de l'API au-delà de GZIP_MIN_SIZE ; les fichiers statiques ont leurs variantes."""
+
+    def __init__(self, app, minimum_size: int = GZIP_MIN_SIZE):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=6)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(API_PREFIXES):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+app.add_middleware(JSONCompressionMiddleware)
+
+# --------------------------------------------------------------------
+# Front-end statique (docs/)
+# --------------------------------------------------------------------
+# Monté en dernier : "/" attrape tout ce qu'aucune route de l'API n'a servi.
+FRONTEND_DIR = os.getenv("FRONTEND_DIR", "docs")
+if FRONTEND_DIR and Path(FRONTEND_DIR).is_dir():
+    app.mount("/", AssetStaticFiles(directory=FRONTEND_DIR, html=True, precompress=True), name="frontend")
@@ -0,0 +1,86 @@
+"""Microbenchmark de la sérialisation des listings : chemin FastAPI par défaut contre dumps_json.
+
+    python scripts/bench_json.py                 # pages de 100 profils, 2000 itérations
+    python scripts/bench_json.py --rows 10 --number 10000
+
+Les pages sont synthétiques mais ont la forme des lignes de list_profiles (TEXT de motivation,
+variantes d'avatar, datetime, Decimal) ; aucune base n'est nécessaire. Compare :
+jsonable_encoder + json.dumps (ce que fait FastAPI sur un dict renvoyé par une route),
+dumps_json (orjson si installé, sinon json de la stdlib) et dumps_json au format colonnes.
+"""
+import json
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from main import dumps_json, orjson, shape_rows  # noqa: E402
+
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Bordeaux", "Lille"]
+SKILLS = ["Python", "SQL", "React", "Docker", "JS", "Java", "AWS", "Linux", "Go", "Figma"]
+WORDS = ("motivé curieuse autonome équipe projet produit données qualité client agile "
+         "déploiement sécurité performance accessibilité").split()
+
+
+def page(rows: int, seed: int = 42) -> dict:
+    rnd = random.Random(seed)
+    items = []
+    for i in range(rows):
+        avatar = f"/uploads/avatars/{i}.jpg"
+        items.append({
+            "id": 100000 - i, "user_id": 500000 - i,
+            "first_name": rnd.choice(["Chloé", "Inès", "Hugo", "Léa", "Yanis"]),
+            "last_name": rnd.choice(["Martin", "Dubois", "Lefebvre", "Roux"]),
+            "city": rnd.choice(CITIES), "skills": ", ".join(rnd.sample(SKILLS, 4)),
+            "job_target": "Développeur Fullstack",
+            "motivation": " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(150, 250))),
+            "avatar_url": avatar,
+            "avatar_variants": {"webp": avatar[:-4] + ".webp", "thumb": avatar[:-4] + "_thumb.jpg"},
+            "expected_salary": Decimal(rnd.randrange(30, 80) * 1000),
+            "score": Decimal("0.8125"),
+            "created_at": datetime(2024, 1, 1) + timedelta(seconds=rnd.randrange(10**8)),
+        })
+    return {"items": items, "page": 1, "page_size": rows, "total": rows * 40, "next_cursor": None}
+
+
+def fastapi_default(data) -> bytes:
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def main(argv: list[str]) -> int:
+    options = {"--rows": 100, "--number": 2000}
+    args = iter(argv)
+    for arg in args:
+        if arg not in options:
+            raise SystemExit(__doc__)
+        options[arg] = int(next(args))
+    data = page(options["--rows"])
+    number = options["--number"]
+
+    if json.loads(fastapi_default(data)) != json.loads(dumps_json(data)):
+        print("dumps_json ne produit pas le même JSON que jsonable_encoder", file=sys.stderr)
+        return 1
+
+    cases = [
+        ("jsonable_encoder + json", lambda: fastapi_default(data)),
+        ("dumps_json", lambda: dumps_json(data)),
+        ("dumps_json colonnes", lambda: dumps_json(shape_rows(data, True))),
+    ]
+    print(f"page de {options['--rows']} lignes, {number} itérations, "
+          f"encodeur : {'orjson ' + orjson.__version__ if orjson else 'json (stdlib)'}")
+    print(f"{'chemin':<26}{'µs/page':>10}{'octets':>10}{'gain':>8}")
+    baseline = None
+    for name, fn in cases:
+        per_call = min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+        baseline = baseline or per_call
+        print(f"{name:<26}{per_call:>10.1f}{len(fn()):>10}{baseline / per_call:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
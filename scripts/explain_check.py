@@ -0,0 +1,105 @@
+"""Vérifie les plans d'exécution (EXPLAIN) des requêtes chaudes de main.py.
+
+    python scripts/migrate.py && python scripts/explain_check.py
+
+À lancer sur une base locale migrée et peuplée (jobboard_mysql.sql, idéalement avec un
+volume réaliste : sur quelques dizaines de lignes, MySQL préfère parfois un scan complet
+à un index). Le script sort en erreur (code 1) si une requête passe en scan complet
+(type=ALL) ou en tri fichier (Using filesort) alors qu'elle ne devrait pas : à brancher
+en CI pour repérer les régressions de plan après un changement de requête ou d'index.
+
+Les requêtes viennent de main.py (constantes *_SQL et constructeurs de clauses) : le script
+vérifie exactement ce que l'API exécute. Il importe donc main.py et ses dépendances.
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from migrate import connect  # noqa: E402
+import main  # noqa: E402
+
+JOBS_CURSOR = main._keyset_clause("j.created_at", "j.id", main._encode_cursor(datetime(2030, 1, 1), 10**9))
+PROFILES_CURSOR = main._keyset_clause("p.sort_at", "p.id", main._encode_cursor(datetime(2030, 1, 1), 10**9))
+SKILLS_ALL = main._terms_join("ms", "skill", "python,sql", "all")
+PAGE = (11, 0)  # LIMIT page_size + 1 OFFSET 0
+
+
+def _profiles_page(join=("", []), where=("", [])) -> tuple[str, tuple]:
+    sql = main.PROFILES_PAGE_SQL.format(
+        extra="", join=join[0], where="WHERE " + where[0] if where[0] else "", order=main.PROFILES_ORDER,
+    )
+    return sql, (*join[1], *where[1], *PAGE)
+
+
+# (nom, requête, paramètres, écarts tolérés : {"scan", "filesort"} + raison)
+QUERIES = [
+    ("list_jobs", main.JOBS_PAGE_SQL.format(where=""), PAGE, set()),
+    ("list_jobs cursor", main.JOBS_PAGE_SQL.format(where="WHERE " + JOBS_CURSOR[0]), (*JOBS_CURSOR[1], *PAGE),
+     set()),
+    ("list_jobs count", main.JOBS_COUNT_SQL.format(where=""), (),
+     {"scan"}),  # comptage complet par nature : préférer total=cached/estimate
+    ("list_jobs search", main.JOBS_SEARCH_SQL, ("+develop*", "+develop*", 10, 0),
+     {"filesort"}),  # tri par score : sur les seuls résultats FULLTEXT
+    ("list_jobs search count", main.JOBS_SEARCH_COUNT_SQL, ("+develop*",), set()),
+    ("get_job", main.JOB_SQL.format(columns=main.select_fields(None, main.JOB_FIELDS, ("id", "company_id"))),
+     (1,), set()),
+    ("list_companies", main.COMPANIES_PAGE_SQL, (), set()),
+    ("list_profiles", *_profiles_page(), set()),
+    ("list_profiles cursor", *_profiles_page(where=PROFILES_CURSOR), set()),
+    ("list_profiles city", *_profiles_page(where=("p.city IN (%s)", ["Paris"])), set()),
+    ("list_profiles skills", *_profiles_page(join=SKILLS_ALL),
+     {"filesort"}),  # tri des seuls profils retenus par l'index profile_terms
+    ("candidate_filters", main.PROFILE_FACETS_SQL, (),
+     {"scan"}),  # la table entière est la réponse (une ligne par valeur de facette)
+    ("list_applications", main.APPLICATIONS_PAGE_SQL.format(where="a.job_id = %s"), (1, *PAGE), set()),
+    ("list_applications count", main.APPLICATIONS_COUNT_SQL, (1,), set()),
+    ("job matches", main.JOB_MATCHES_SQL, (1, main.MATCH_TOP_K),
+     {"filesort"}),  # tri des au plus MATCH_TOP_K lignes de l'offre
+    ("match scores", *main.match_scores_query({("skill", "python"): 1.0, ("skill", "sql"): 0.5}, "profile", 20),
+     {"filesort"}),  # agrégat par entity_id des seules postings des termes du vecteur
+    ("login", main.LOGIN_SQL, ("alice@example.com",), set()),
+]
+
+ANALYZED_TABLES = ("users", "profiles", "companies", "jobs", "applications", "job_search", "profile_terms",
+                   "match_terms", "job_matches")
+
+
+def check(cur, name, sql, params, allowed) -> list[str]:
+    cur.execute("EXPLAIN " + sql, params)
+    problems = []
+    for row in cur.fetchall():
+        table = row.get("table") or ""
+        extra = row.get("Extra") or ""
+        if table.startswith("<"):  # table dérivée / union, déjà filtrée par un index
+            continue
+        if row.get("type") == "ALL" and "scan" not in allowed:
+            problems.append(f"{name}: scan complet de {table}")
+        if "Using filesort" in extra and "filesort" not in allowed:
+            problems.append(f"{name}: filesort sur {table}")
+    return problems
+
+
+def main() -> int:
+    conn = connect()
+    cur = conn.cursor(dictionary=True)
+    for table in ANALYZED_TABLES:
+        cur.execute(f"ANALYZE TABLE {table}")
+        cur.fetchall()
+
+    failures = []
+    for name, sql, params, allowed in QUERIES:
+        problems = check(cur, name, sql, params, allowed)
+        print(f"{'FAIL' if problems else 'ok  '}  {name}")
+        failures += problems
+    cur.close()
+    conn.close()
+
+    for problem in failures:
+        print("  - " + problem, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
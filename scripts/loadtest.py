@@ -0,0 +1,181 @@
+"""Test de charge asynchrone : rejoue un mélange pondéré des appels du front (docs/js/*.js).
+
+    python scripts/loadtest.py --duration 60 --concurrency 50 --out bench/v1.json
+    python scripts/loadtest.py --compare bench/v1.json bench/v2.json
+
+À lancer contre une API démarrée sur une base peuplée par scripts/seed.py (le compte
+recruiter1@seed.test / loadtest sert aux routes authentifiées). Le rapport JSON (débit,
+erreurs, p50/p95/p99 par scénario) a des clés triées : il se compare d'une version à l'autre
+avec --compare ou un simple diff.
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+DEFAULTS = {
+    "base_url": "http://127.0.0.1:8000", "duration": 30.0, "concurrency": 20, "seed": 42,
+    "email": "recruiter1@seed.test", "password": "loadtest", "out": None,
+}
+SEARCH_TERMS = ["react", "python", "développeur", "data", "devops", "java", "sql", "ux", "cloud", "go"]
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Bordeaux", "Lille"]
+SKILLS = ["Python", "SQL", "React", "Docker", "JS", "Java", "AWS", "Linux"]
+
+
+# (nom, poids, authentifié, fabrique de chemin) ; les poids suivent le trafic des pages du front
+def scenarios(max_job_id: int, max_profile_id: int):
+    return [
+        ("jobs page", 25, False,  # nolog_jobs_display.js
+         lambda r: f"/api/jobs?page={r.choice([1, 1, 1, 2, 3])}&page_size=10"),
+        ("jobs search", 15, False,  # research.js / search_jobs.js
+         lambda r: f"/api/jobs?q={r.choice(SEARCH_TERMS)}&page=1&page_size=10"),
+        ("suggest", 10, False,  # research.js (saisie semi-automatique)
+         lambda r: f"/api/suggest?q={r.choice(SEARCH_TERMS)[:r.randint(1, 4)]}&limit=5"),
+        ("job detail", 15, False,  # search_jobs.js
+         lambda r: f"/api/jobs/{r.randint(1, max_job_id)}"),
+        ("job cards", 5, False,  # lecture groupée d'offres (?ids=, fields=)
+         lambda r: "/api/jobs?fields=title,short_desc,company_name&ids="
+                   + ",".join(str(r.randint(1, max_job_id)) for _ in range(10))),
+        ("companies", 5, False,  # nolog_companies_display.js
+         lambda r: "/api/companies"),
+        ("profiles page", 10, False,  # user_display.js
+         lambda r: f"/api/profiles?page=1&page_size=12&city={r.choice(CITIES)}"),
+        ("profiles filter", 10, False,  # filter_entreprises.js
+         lambda r: f"/api/profiles?skills={','.join(r.sample(SKILLS, 2))}&languages=EN"),
+        ("profile detail", 5, False,  # user_display.js
+         lambda r: f"/api/profiles/{r.randint(1, max_profile_id)}"
+                   "?fields=first_name,last_name,city,job_target,skills,motivation"),
+        ("candidate filters", 5, False,  # filter_candidates.js
+         lambda r: "/api/candidate_filters"),
+        ("applications", 8, True,  # espace recruteur
+         lambda r: f"/api/{r.randint(1, max_job_id)}/applications?page=1&page_size=10"),
+        ("recruiter dashboard", 2, True,
+         lambda r: "/api/recruiter/dashboard"),
+    ]
+
+
+def parse_args(argv: list[str]) -> dict:
+    options = dict(DEFAULTS)
+    args = iter(argv)
+    for arg in args:
+        key = arg.lstrip("-").replace("-", "_")
+        if not arg.startswith("--") or key not in options:
+            raise SystemExit(__doc__)
+        value = next(args)
+        options[key] = type(DEFAULTS[key])(value) if DEFAULTS[key] is not None else value
+    return options
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def discover(client: httpx.AsyncClient) -> tuple[int, int]:
+    """Ordre de grandeur des identifiants (plus grand id des 100 plus récents), pour tirer des lignes existantes."""
+    ids = []
+    for path in ("/api/jobs", "/api/profiles"):
+        page = (await client.get(path, params={"page_size": 100, "total": "none"})).json()
+        ids.append(max((row["id"] for row in page.get("items") or []), default=1))
+    return ids[0], ids[1]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    if response.status_code != 200:
+        print(f"Connexion {email} impossible ({response.status_code}) : scénarios authentifiés ignorés",
+              file=sys.stderr)
+        return {}
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def worker(client, rnd: random.Random, mix, auth: dict, deadline: float, samples: dict):
+    names, weights = [m[0] for m in mix], [m[1] for m in mix]
+    by_name = {m[0]: m for m in mix}
+    while time.monotonic() < deadline:
+        name, _, needs_auth, make_path = by_name[rnd.choices(names, weights)[0]]
+        started = time.perf_counter()
+        try:
+            response = await client.get(make_path(rnd), headers=auth if needs_auth else None)
+            ok = response.status_code < 500 and response.status_code != 429
+        except httpx.HTTPError:
+            ok = False
+        samples[name].append((time.perf_counter() - started, ok))
+
+
+async def run(options: dict) -> dict:
+    limits = httpx.Limits(max_connections=options["concurrency"], max_keepalive_connections=options["concurrency"])
+    async with httpx.AsyncClient(base_url=options["base_url"], limits=limits, timeout=30.0) as client:
+        max_job_id, max_profile_id = await discover(client)
+        auth = await login(client, options["email"], options["password"])
+        mix = [m for m in scenarios(max_job_id, max_profile_id) if auth or not m[2]]
+        samples = {m[0]: [] for m in mix}
+        rnd = random.Random(options["seed"])
+        started = time.monotonic()
+        deadline = started + options["duration"]
+        await asyncio.gather(*(
+            worker(client, random.Random(rnd.random()), mix, auth, deadline, samples)
+            for _ in range(options["concurrency"])
+        ))
+        elapsed = time.monotonic() - started
+
+    report = {"duration_s": round(elapsed, 1), "concurrency": options["concurrency"], "endpoints": {}}
+    for name, values in samples.items():
+        latencies = sorted(v[0] * 1000 for v in values)
+        report["endpoints"][name] = {
+            "requests": len(values),
+            "errors": sum(1 for v in values if not v[1]),
+            "rps": round(len(values) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p95_ms": round(percentile(latencies, 0.95), 1),
+            "p99_ms": round(percentile(latencies, 0.99), 1),
+        }
+    total = sum(e["requests"] for e in report["endpoints"].values())
+    report["total_rps"] = round(total / elapsed, 1)
+    return report
+
+
+def print_report(report: dict):
+    print(f"{'scénario':<22}{'req':>8}{'err':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for name, e in sorted(report["endpoints"].items()):
+        print(f"{name:<22}{e['requests']:>8}{e['errors']:>6}{e['rps']:>9}"
+              f"{e['p50_ms']:>9}{e['p95_ms']:>9}{e['p99_ms']:>9}")
+    print(f"total : {report['total_rps']} req/s sur {report['duration_s']} s, concurrence {report['concurrency']}")
+
+
+def compare(old_path: str, new_path: str) -> int:
+    old = json.loads(Path(old_path).read_text())["endpoints"]
+    new = json.loads(Path(new_path).read_text())["endpoints"]
+    print(f"{'scénario':<22}{'rps':>18}{'p95 ms':>18}{'p99 ms':>18}")
+    for name in sorted(set(old) | set(new)):
+        a, b = old.get(name, {}), new.get(name, {})
+        cells = []
+        for key in ("rps", "p95_ms", "p99_ms"):
+            before, after = a.get(key), b.get(key)
+            delta = f" ({(after - before) / before:+.0%})" if before and after is not None else ""
+            cells.append(f"{before}→{after}{delta}")
+        print(f"{name:<22}" + "".join(f"{c:>18}" for c in cells))
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    if argv[:1] == ["--compare"] and len(argv) == 3:
+        return compare(argv[1], argv[2])
+    options = parse_args(argv)
+    report = asyncio.run(run(options))
+    print_report(report)
+    if options["out"]:
+        out = Path(options["out"])
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
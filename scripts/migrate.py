@@ -0,0 +1,129 @@
+"""Migrations versionnées du schéma (data/migrations/NNNN_nom.sql).
+
+    python scripts/migrate.py            # applique les migrations en attente
+    python scripts/migrate.py status     # liste appliquées / en attente
+    python scripts/migrate.py --dry-run  # affiche ce qui serait exécuté
+
+Même configuration que l'API (DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME, .env).
+Chaque migration appliquée est enregistrée dans schema_migrations avec sa somme SHA-256 ;
+une migration déjà appliquée puis modifiée fait échouer le runner.
+"""
+import hashlib
+import os
+import re
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+import mysql.connector
+from mysql.connector import Error
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "data" / "migrations"
+FILENAME = re.compile(r"^(\d{4})_(\w+)\.sql$")
+# objet déjà présent (base créée avec un jobboard_mysql.sql récent) : migration considérée appliquée
+ALREADY_APPLIED_ERRNOS = {1050, 1060, 1061, 1826}  # table, colonne, index, contrainte
+LOCK_WAIT_TIMEOUT = int(os.getenv("MIGRATION_LOCK_WAIT_TIMEOUT", "5"))
+
+
+def connect():
+    load_dotenv()
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST", "127.0.0.1"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASS"),
+        database=os.getenv("DB_NAME", "jobboard"),
+        charset="utf8mb4",
+        autocommit=True,
+    )
+
+
+def load_migrations() -> list[tuple[int, str, str, str]]:
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = FILENAME.match(path.name)
+        if not match:
+            raise SystemExit(f"Nom de migration invalide : {path.name}")
+        sql = path.read_text(encoding="utf-8")
+        migrations.append((int(match.group(1)), match.group(2), sql, hashlib.sha256(sql.encode()).hexdigest()))
+    return migrations
+
+
+def split_statements(sql: str) -> list[str]:
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in re.split(r";\s*$", "\n".join(lines), flags=re.M) if stmt.strip()]
+
+
+def applied_versions(cur) -> dict[int, str]:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          version INT PRIMARY KEY,
+          name VARCHAR(255) NOT NULL,
+          checksum CHAR(64) NOT NULL,
+          applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB
+        """
+    )
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cur.fetchall())
+
+
+def main(argv: list[str]) -> int:
+    command = next((a for a in argv if not a.startswith("-")), "up")
+    dry_run = "--dry-run" in argv
+    migrations = load_migrations()
+
+    conn = connect()
+    cur = conn.cursor()
+    # un seul runner à la fois, et jamais d'attente longue derrière un verrou de métadonnées
+    cur.execute("SELECT GET_LOCK('jobboard_schema_migrations', 10)")
+    if cur.fetchone()[0] != 1:
+        print("Une autre migration est en cours.", file=sys.stderr)
+        return 1
+    cur.execute("SET SESSION lock_wait_timeout = %s", (LOCK_WAIT_TIMEOUT,))
+
+    try:
+        applied = applied_versions(cur)
+        for version, name, _, checksum in migrations:
+            if version in applied and applied[version] != checksum:
+                print(f"{version:04d}_{name} a été modifiée après application.", file=sys.stderr)
+                return 1
+
+        pending = [m for m in migrations if m[0] not in applied]
+        if command == "status":
+            for version, name, _, _ in migrations:
+                state = "appliquée" if version in applied else "en attente"
+                print(f"{version:04d}_{name}: {state}")
+            return 0
+
+        for version, name, sql, checksum in pending:
+            print(f"-> {version:04d}_{name}")
+            for statement in split_statements(sql):
+                if dry_run:
+                    print(statement + ";\n")
+                    continue
+                try:
+                    cur.execute(statement)
+                except Error as e:
+                    if e.errno in ALREADY_APPLIED_ERRNOS:
+                        print(f"   déjà présent ({e.msg})")
+                        continue
+                    raise
+            if not dry_run:
+                cur.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (version, name, checksum),
+                )
+        if not pending:
+            print("Schéma à jour.")
+        return 0
+    finally:
+        cur.execute("SELECT RELEASE_LOCK('jobboard_schema_migrations')")
+        cur.fetchall()
+        cur.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
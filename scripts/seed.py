@@ -0,0 +1,218 @@
+"""Générateur de données de volume pour les tests de charge (reproductible).
+
+    python scripts/seed.py                       # échelle 1 : 1M offres, 500k profils, 5M candidatures
+    python scripts/seed.py --scale 0.01          # 1 % du volume (10k offres...)
+    python scripts/seed.py --jobs 200000 --seed 7
+
+Même configuration que l'API (DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME, .env), sur une
+base migrée (python scripts/migrate.py). Les lignes sont ajoutées après les données existantes,
+avec des identifiants explicites : la même graine produit toujours le même jeu de données
+(à lancer une fois, sur la base de démo : les e-mails générés sont uniques).
+Tous les comptes créés ont le mot de passe « loadtest » ; les recruteurs sont
+recruiter<N>@seed.test (N à partir de 1), les candidats candidate<N>@seed.test.
+
+Les index dérivés sont à reconstruire ensuite (la table application_counts l'est ici) :
+POST /api/admin/search/reindex, /api/admin/facets/rebuild, /api/admin/profiles/terms/rebuild,
+/api/admin/matches/rebuild.
+"""
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from passlib.hash import pbkdf2_sha256
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from migrate import connect  # noqa: E402
+
+BASE_VOLUMES = {"companies": 20_000, "recruiters": 20_000, "jobs": 1_000_000,
+                "profiles": 500_000, "applications": 5_000_000}
+BATCH = 5000
+SEED_PASSWORD = "loadtest"
+START = datetime(2024, 1, 1)  # fixe : dates identiques d'une exécution à l'autre
+HISTORY = 730 * 86400  # secondes
+
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Bordeaux", "Lille", "Rennes",
+          "Strasbourg", "Montpellier", "Nice", "Grenoble", "Dijon", "Angers", "Brest", "Tours"]
+CITY_WEIGHTS = [30, 12, 8, 8, 7, 7, 6, 5, 4, 4, 3, 3, 1, 1, 1, 1]
+SKILLS = ["JS", "TS", "React", "Vue", "Angular", "Node", "Python", "Django", "FastAPI", "Java",
+          "Spring", "Kotlin", "Go", "Rust", "PHP", "Laravel", "SQL", "PostgreSQL", "MySQL", "Docker",
+          "K8s", "AWS", "Azure", "Linux", "Ansible", "Terraform", "pandas", "scikit", "PowerBI",
+          "Figma", "CSS", "HTML", "C#", ".NET", "Swift", "Flutter", "SIEM", "EDR"]
+LANGUAGES = ["FR", "EN", "ES", "DE", "IT", "PT", "AR", "ZH"]
+DIPLOMAS = ["BTS SIO", "Licence Info", "Master Info", "Ingé Info", "Master Data", "M2 IA",
+            "M2 Sécu", "M1 HCI", "Bootcamp", "DUT Info"]
+TITLES = ["Développeur Frontend", "Développeur Backend", "Développeur Fullstack", "Tech Lead",
+          "Data Analyst", "Data Scientist", "Ingénieur DevOps", "Analyste SOC", "UX Designer",
+          "Développeur Mobile", "Architecte Cloud", "Ingénieur QA", "Administrateur Système"]
+FIRST_NAMES = ["Alice", "Bob", "Chloé", "David", "Emma", "Farid", "Gabriel", "Hugo", "Inès",
+               "Jules", "Karim", "Léa", "Manon", "Nathan", "Océane", "Paul", "Sarah", "Yanis"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand",
+              "Leroy", "Moreau", "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "Roux"]
+CONTRACTS = ["CDI", "CDD", "Freelance", "Stage", "Alternance"]
+WORK_MODES = ["Sur site", "Hybride", "Télétravail"]
+STATUSES = ["new", "review", "interview", "offer", "hired", "rejected"]
+STATUS_WEIGHTS = [50, 20, 10, 3, 2, 15]
+
+
+def volumes(argv: list[str]) -> tuple[dict, int]:
+    scale, seed, overrides = 1.0, 42, {}
+    args = iter(argv)
+    for arg in args:
+        if arg == "--scale":
+            scale = float(next(args))
+        elif arg == "--seed":
+            seed = int(next(args))
+        elif arg.startswith("--") and arg[2:] in BASE_VOLUMES:
+            overrides[arg[2:]] = int(next(args))
+        else:
+            raise SystemExit(__doc__)
+    counts = {name: max(1, int(n * scale)) for name, n in BASE_VOLUMES.items()}
+    counts.update(overrides)
+    return counts, seed
+
+
+def next_id(cur, table: str) -> int:
+    cur.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+    return cur.fetchone()[0]
+
+
+def insert(conn, sql: str, rows, label: str, total: int):
+    """INSERT multi-lignes par paquets de BATCH, un commit par paquet."""
+    cur = conn.cursor()
+    batch, done, started = [], 0, time.monotonic()
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH:
+            cur.executemany(sql, batch)
+            conn.commit()
+            done += len(batch)
+            batch = []
+            print(f"\r{label}: {done}/{total} ({done / (time.monotonic() - started):.0f}/s)", end="")
+    if batch:
+        cur.executemany(sql, batch)
+        conn.commit()
+        done += len(batch)
+    print(f"\r{label}: {done}/{total} en {time.monotonic() - started:.0f}s")
+    cur.close()
+
+
+def moment(rnd: random.Random, after: int = 0) -> datetime:
+    return START + timedelta(seconds=rnd.randrange(after, HISTORY))
+
+
+def main(argv: list[str]) -> int:
+    counts, seed = volumes(argv)
+    rnd = random.Random(seed)
+    password_hash = pbkdf2_sha256.hash(SEED_PASSWORD)
+
+    conn = connect()
+    conn.autocommit = False
+    cur = conn.cursor()
+    cur.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+    first = {t: next_id(cur, t) for t in ("users", "companies", "jobs", "profiles", "applications")}
+    cur.close()
+
+    recruiter_ids = range(first["users"], first["users"] + counts["recruiters"])
+    candidate_ids = range(recruiter_ids.stop, recruiter_ids.stop + counts["profiles"])
+    company_ids = range(first["companies"], first["companies"] + counts["companies"])
+    job_ids = range(first["jobs"], first["jobs"] + counts["jobs"])
+
+    users = (
+        (uid, f"recruiter{uid - recruiter_ids.start + 1}@seed.test", password_hash, "recruiter", moment(rnd))
+        for uid in recruiter_ids
+    )
+    insert(conn, "INSERT INTO users (id, email, password_hash, role, created_at) VALUES (%s,%s,%s,%s,%s)",
+           users, "users (recruteurs)", len(recruiter_ids))
+    users = (
+        (uid, f"candidate{uid - candidate_ids.start + 1}@seed.test", password_hash, "user", moment(rnd))
+        for uid in candidate_ids
+    )
+    insert(conn, "INSERT INTO users (id, email, password_hash, role, created_at) VALUES (%s,%s,%s,%s,%s)",
+           users, "users (candidats)", len(candidate_ids))
+
+    companies = (
+        (cid, f"Entreprise {cid}", rnd.choices(CITIES, CITY_WEIGHTS)[0], rnd.choice(["Tech", "Conseil", "Santé",
+         "Finance", "Industrie", "Retail"]), f"Description de l'entreprise {cid}.", f"https://example.com/{cid}",
+         moment(rnd))
+        for cid in company_ids
+    )
+    insert(conn, "INSERT INTO companies (id, name, hq_city, sector, description, website, created_at) "
+           "VALUES (%s,%s,%s,%s,%s,%s,%s)", companies, "companies", len(company_ids))
+
+    # 30 % des offres vont aux premières entreprises (loi de puissance) : quelques gros recruteurs
+    job_offsets = array("l")  # secondes depuis START, pour dater les candidatures après l'offre
+
+    def jobs():
+        for jid in job_ids:
+            title = rnd.choice(TITLES)
+            skills = rnd.sample(SKILLS, rnd.randint(2, 5))
+            salary = rnd.randrange(28, 80) * 1000
+            offset = rnd.randrange(HISTORY)
+            job_offsets.append(offset)
+            if rnd.random() < 0.3:
+                company = company_ids[min(len(company_ids), int(rnd.paretovariate(1.2))) - 1]
+            else:
+                company = rnd.choice(company_ids)
+            yield (
+                jid, company, title, f"{title} — {', '.join(skills)}",
+                f"Nous recherchons un(e) {title} maîtrisant {', '.join(skills)}.",
+                rnd.choices(CITIES, CITY_WEIGHTS)[0], f"{rnd.randint(0, 8)} ans d'expérience",
+                rnd.choice(CONTRACTS), rnd.choice(WORK_MODES), salary, salary + rnd.randrange(0, 15) * 1000,
+                "EUR", ",".join(skills), f"seed-{jid}", rnd.choice(recruiter_ids),
+                START + timedelta(seconds=offset),
+            )
+
+    insert(conn, "INSERT INTO jobs (id, company_id, title, short_desc, full_desc, location, profile_sought, "
+           "contract_type, work_mode, salary_min, salary_max, currency, tags, external_ref, created_by, created_at) "
+           "VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)", jobs(), "jobs", len(job_ids))
+
+    def profiles():
+        for offset, uid in enumerate(candidate_ids):
+            created = moment(rnd)
+            yield (
+                first["profiles"] + offset, uid, rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES),
+                datetime(rnd.randint(1970, 2004), rnd.randint(1, 12), rnd.randint(1, 28)).date(),
+                rnd.choices(CITIES, CITY_WEIGHTS)[0], rnd.choice(DIPLOMAS),
+                f"{rnd.randint(0, 15)} ans {rnd.choice(['dev', 'lead', 'data', 'support', 'ops'])}",
+                ", ".join(rnd.sample(SKILLS, rnd.randint(2, 6))),
+                ",".join(["FR"] + rnd.sample(LANGUAGES[1:], rnd.randint(0, 2))),
+                rnd.choice(TITLES), created, created,
+            )
+
+    insert(conn, "INSERT INTO profiles (id, user_id, first_name, last_name, date_birth, city, diplomas, "
+           "experiences, skills, languages, job_target, created_at, updated_at) "
+           "VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)", profiles(), "profiles", len(candidate_ids))
+
+    # candidatures concentrées sur les offres populaires (loi de puissance sur le rang de l'offre)
+    def applications():
+        for aid in range(first["applications"], first["applications"] + counts["applications"]):
+            if rnd.random() < 0.4:
+                index = len(job_ids) - min(len(job_ids), int(rnd.paretovariate(0.8)))
+            else:
+                index = rnd.randrange(len(job_ids))
+            jid = job_ids[index]
+            uid = rnd.choice(candidate_ids)
+            yield (
+                aid, jid, uid, rnd.choice(["Motivé(e) par le poste.", "Disponible rapidement.", None]),
+                rnd.choices(STATUSES, STATUS_WEIGHTS)[0], moment(rnd, job_offsets[index]),
+            )
+
+    insert(conn, "INSERT INTO applications (id, job_id, user_id, message, status, created_at) "
+           "VALUES (%s,%s,%s,%s,%s,%s)", applications(), "applications", counts["applications"])
+
+    cur = conn.cursor()
+    cur.execute("DELETE FROM application_counts")
+    cur.execute("INSERT INTO application_counts (job_id, status, n) "
+                "SELECT job_id, status, COUNT(*) FROM applications GROUP BY job_id, status")
+    conn.commit()
+    cur.close()
+    conn.close()
+    print("Terminé. Reconstruire ensuite les index : search/reindex, facets/rebuild, profiles/terms/rebuild, matches/rebuild.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))